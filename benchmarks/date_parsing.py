@@ -0,0 +1,99 @@
+"""Measure how long it takes to sort TODO items by their due date strings.
+
+Run from the root of the repository:
+
+    python benchmarks/date_parsing.py [SIZE]
+
+The items are sorted with `strptime`, with the fast parser of `parse_date`
+without its cache, and with `parse_date` itself, cold and warm.
+The cache is cleared before every cold run and filled before every warm one.
+The items only have a few hundred distinct dates between them, so even a cold
+run parses each date once and finds it in the cache after that.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import random
+import sys
+import time
+from typing import Callable, Optional
+
+from textual_todo.store import DATE_FORMAT, parse_date
+
+SIZE = 10_000
+REPEATS = 5
+
+Parser = Callable[[str], Optional[dt.date]]
+
+
+def make_dates(size: int) -> list[str]:
+    """Make `size` due date strings, some of them empty, as the app stores them."""
+    rng = random.Random(size)
+    today = dt.date.today()
+    dates = []
+    for _ in range(size):
+        if rng.random() < 0.1:
+            dates.append("")
+        else:
+            days = dt.timedelta(days=rng.randint(-30, 365))
+            dates.append((today + days).strftime(DATE_FORMAT))
+    return dates
+
+
+def parse_with_strptime(value: str) -> dt.date | None:
+    """How dates were parsed before `parse_date` got a fast path and a cache."""
+    try:
+        return dt.datetime.strptime(value, DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def time_sort(
+    dates: list[str], parse: Parser, setup: Callable[[], object] | None = None
+) -> float:
+    """Time sorting the dates, undated last, and return the best of a few runs.
+
+    Args:
+        dates: The date strings to sort.
+        parse: Parses each date string.
+        setup: Called before each run, outside of the time measured.
+    """
+
+    def key(value: str) -> tuple[bool, dt.date]:
+        date = parse(value)
+        return (True, dt.date.min) if date is None else (False, date)
+
+    best = float("inf")
+    for _ in range(REPEATS):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        sorted(dates, key=key)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def warm_up(dates: list[str]) -> None:
+    """Fill the cache of `parse_date` with the dates."""
+    for value in dates:
+        parse_date(value)
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    dates = make_dates(size)
+    timings = [
+        ("strptime", time_sort(dates, parse_with_strptime)),
+        ("fast, uncached", time_sort(dates, parse_date.__wrapped__)),
+        ("parse_date, cold", time_sort(dates, parse_date, parse_date.cache_clear)),
+        ("parse_date, warm", time_sort(dates, parse_date, lambda: warm_up(dates))),
+    ]
+    baseline = timings[0][1]
+    print(f"Sorting {size} items by due date:")
+    for name, elapsed in timings:
+        print(f"  {name:<18} {elapsed * 1000:8.2f}ms  {baseline / elapsed:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure how long the TODO app takes to load `items.json` files of various sizes.
+
+Run from the root of the repository:
+
+    python benchmarks/load_time.py [SIZE ...]
+
+Each size is timed from the moment the app starts until the first items are
+shown and until all the items are loaded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from textual_todo.todo import DATA_FILE, TODOApp
+
+SIZES = [1_000, 10_000, 50_000]
+
+
+def write_items(path: str, size: int) -> None:
+    """Write a file with `size` TODO items with random due dates."""
+    rng = random.Random(size)
+    today = dt.date.today()
+    items = []
+    for idx in range(size):
+        if rng.random() < 0.1:
+            date = ""
+        else:
+            days = dt.timedelta(days=rng.randint(-30, 365))
+            date = (today + days).strftime("%d-%m-%Y")
+        items.append({"description": f"Task #{idx}", "date": date})
+
+    with open(path, "w") as f:
+        json.dump(items, f)
+
+
+async def time_load() -> tuple[float, float]:
+    """Time how long the app takes to load the data file in the current directory.
+
+    Returns:
+        The seconds until the first items are shown and until all are loaded.
+    """
+    app = TODOApp()
+    start = time.perf_counter()
+    async with app.run_test(size=(80, 40)) as pilot:
+        while not app._open_lists or not app._todo_container.store:
+            await asyncio.sleep(0.001)
+        await pilot.pause()
+        first = time.perf_counter() - start
+        await app._current.loader
+        await pilot.pause()
+        return first, time.perf_counter() - start
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        for size in sizes:
+            write_items(DATA_FILE, size)
+            first, elapsed = asyncio.run(time_load())
+            print(f"{size:>7} items: first {first:8.3f}s, all {elapsed:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
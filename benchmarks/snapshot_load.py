@@ -0,0 +1,78 @@
+"""Compare loading the TODO items from the JSON file and from its binary snapshot.
+
+Run from the root of the repository:
+
+    python benchmarks/snapshot_load.py [SIZE ...]
+
+For each size, the items are read by the storage alone, and the app is timed
+from start until all the items are loaded, first with no snapshot, so the JSON
+file is parsed, and then with the snapshot the app wrote when it closed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from load_time import time_load, write_items
+from textual_todo.snapshotfile import snapshot_path
+from textual_todo.storage import JsonStorage
+from textual_todo.store import TodoStore
+from textual_todo.todo import DATA_FILE
+
+SIZES = [1_000, 10_000, 50_000]
+REPEATS = 5
+
+
+def time_read() -> float:
+    """Time reading all the items into a store, the best of a few runs."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        store = TodoStore()
+        for records, _ in JsonStorage(DATA_FILE).read_chunks():
+            store.extend(records)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def remove_snapshot() -> None:
+    try:
+        os.remove(snapshot_path(DATA_FILE))
+    except FileNotFoundError:
+        pass
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        for size in sizes:
+            write_items(DATA_FILE, size)
+            remove_snapshot()
+            json_read = time_read()
+            _, json_load = asyncio.run(time_load())
+            # The app wrote the snapshot when it closed.
+            assert os.path.exists(snapshot_path(DATA_FILE))
+            snapshot_read = time_read()
+            _, snapshot_load = asyncio.run(time_load())
+            remove_snapshot()
+
+            print(f"{size:>7} items:")
+            print(
+                f"  read   json {json_read * 1000:9.2f}ms  "
+                f"snapshot {snapshot_read * 1000:9.2f}ms  "
+                f"{json_read / snapshot_read:5.1f}x"
+            )
+            print(
+                f"  app    json {json_load * 1000:9.2f}ms  "
+                f"snapshot {snapshot_load * 1000:9.2f}ms  "
+                f"{json_load / snapshot_load:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Benchmark the TODO app headlessly on lists of various sizes.
+
+Run from the root of the repository:
+
+    python benchmarks/suite.py [--sizes 100 1000 ...] [--output results.json]
+        [--baseline old.json] [--threshold 0.25]
+
+For each size, a fresh process generates an `items.json` file and drives the
+app with `App.run_test`, measuring:
+
+- `startup_first_paint`: seconds until the first items are shown;
+- `startup_full_load`: seconds until all items are loaded;
+- `startup_style_updates`: how many times items changed their due date class
+  while loading, which must not be more than once per item;
+- `new_todo`: seconds to add a new item and reveal it;
+- `due_date_change`: seconds to change the due date of an item and re-sort it;
+- `collapse_all` and `expand_all`: seconds to collapse and expand all items;
+- `bulk_reschedule`: seconds to select all items and shift their due dates by
+  a day, in a single bulk action;
+- `save`: seconds to write all items to disk;
+- `peak_memory`: peak resident memory of the process, in bytes.
+
+The results are written as JSON so that they can be compared across commits.
+With `--baseline`, the run fails if any metric is worse than in the baseline by
+more than the threshold, a fraction of the baseline value.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+from load_time import write_items
+from textual_todo.bulkbar import BulkBar
+from textual_todo.editabletext import SharedEditor
+from textual_todo.todo import DATA_FILE, TODOApp
+from textual_todo.todoitem import TodoItem
+
+SIZES = [100, 1_000, 10_000, 50_000]
+THRESHOLD = 0.25
+"""Fraction by which a metric may be worse than the baseline before failing."""
+SCREEN_SIZE = (80, 40)
+NEW_DUE_DATE = "01-01-2099"
+
+Results = Dict[str, Dict[str, float]]
+
+
+def peak_memory() -> int:
+    """Get the peak resident memory of this process, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def measure() -> dict[str, float]:
+    """Measure the app on the data file in the current directory."""
+    metrics: dict[str, float] = {}
+    app = TODOApp()
+    start = time.perf_counter()
+    async with app.run_test(size=SCREEN_SIZE) as pilot:
+        container = app._todo_container
+        while not container.store:
+            await asyncio.sleep(0.001)
+        await pilot.pause()
+        metrics["startup_first_paint"] = time.perf_counter() - start
+        await app._current.loader
+        await pilot.pause()
+        metrics["startup_full_load"] = time.perf_counter() - start
+        style_updates = TodoItem.style_updates
+        assert style_updates <= len(
+            container.store
+        ), f"{style_updates} style updates loading {len(container.store)} items"
+        metrics["startup_style_updates"] = style_updates
+
+        start = time.perf_counter()
+        await app.action_new_todo()
+        await pilot.pause()
+        metrics["new_todo"] = time.perf_counter() - start
+        app.set_focus(None)
+
+        # Change the date of an item on screen, which moves it towards the end.
+        view = container.content_region
+        item = next(
+            item for item in app.query(TodoItem) if view.contains_region(item.region)
+        )
+        item.expand_description()
+        await pilot.pause()
+        picker = item._date_picker
+        start = time.perf_counter()
+        picker.switch_to_editing_mode()
+        app.query_one(SharedEditor).value = NEW_DUE_DATE
+        picker.switch_to_display_mode()
+        await pilot.pause()
+        metrics["due_date_change"] = time.perf_counter() - start
+
+        for action in ["collapse_all", "expand_all"]:
+            start = time.perf_counter()
+            await app.run_action(action)
+            await pilot.pause()
+            metrics[action] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await app.run_action("select_all")
+        await app.on_bulk_bar_action(BulkBar.Action(BulkBar.SHIFT_DATE, days=1))
+        await pilot.pause()
+        metrics["bulk_reschedule"] = time.perf_counter() - start
+        await app.run_action("clear_selection")
+
+        # Time persisting a single change, without waiting for any debouncing.
+        start = time.perf_counter()
+        app._current.storage.description_changed(item.record)
+        await app._current.storage.flush()
+        metrics["save"] = time.perf_counter() - start
+
+    metrics["peak_memory"] = peak_memory()
+    return metrics
+
+
+def run_size(size: int) -> dict[str, float]:
+    """Measure the app on a list of the given size, in a fresh process.
+
+    Each size gets its own process so that the peak memory of one size is not
+    carried over to the next.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        write_items(os.path.join(tmp, DATA_FILE), size)
+        process = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--measure"],
+            cwd=tmp,
+            check=True,
+            stdout=subprocess.PIPE,
+        )
+    return json.loads(process.stdout)
+
+
+def compare(results: Results, baseline: Results, threshold: float) -> list[str]:
+    """Find the metrics that got worse than the baseline by more than the threshold.
+
+    Returns:
+        A description of each regression.
+    """
+    regressions = []
+    for size, metrics in results.items():
+        for name, value in metrics.items():
+            old = baseline.get(size, {}).get(name)
+            if old and value > old * (1 + threshold):
+                regressions.append(
+                    f"{size} items, {name}: {value:.4g} vs {old:.4g} "
+                    f"(+{value / old - 1:.0%})"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--output", help="File to write the results to, as JSON.")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare to.")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        # Run by `run_size` in the directory of the data file.
+        print(json.dumps(asyncio.run(measure())))
+        return
+
+    results: Results = {}
+    for size in args.sizes:
+        results[str(size)] = metrics = run_size(size)
+        print(f"{size:>7} items:")
+        for name, value in metrics.items():
+            print(f"    {name:<20} {value:12.4f}")
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
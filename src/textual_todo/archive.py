@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import threading
+from typing import Any, Iterable, Iterator
+
+from .store import TodoRecord, format_date, parse_date
+
+
+SEGMENT_SIZE = 1000
+"""Entries the open segment of an archive holds before it is compressed."""
+OPEN_SEGMENT = "open.jsonl"
+"""Name of the segment that entries are appended to."""
+SEGMENT_SUFFIX = ".jsonl.gz"
+"""Suffix of the names of the compressed segments."""
+
+
+class ArchivedItem:
+    """A TODO item that was completed and archived."""
+
+    __slots__ = ("id", "description", "due_date", "done_date")
+
+    id: int
+    """Identifier of the item in the archive."""
+    description: str
+    """The description of the TODO item."""
+    due_date: dt.date | None
+    """Date the item was due by, or None if it had none."""
+    done_date: dt.date | None
+    """Date the item was completed, or None if not known."""
+
+    def __init__(
+        self,
+        id: int,
+        description: str,
+        due_date: dt.date | None,
+        done_date: dt.date | None,
+    ) -> None:
+        self.id = id
+        self.description = description
+        self.due_date = due_date
+        self.done_date = done_date
+
+    def to_record(self) -> TodoRecord:
+        """Create a new record, to be added back to a list, with the same data."""
+        return TodoRecord(self.description, self.due_date)
+
+
+class Archive:
+    """Append-only history of the completed TODO items of a list.
+
+    The archive is a directory of segments, kept apart from the list so that
+    loading and saving the list never touch it.
+    Entries are appended, as JSON lines, to the open segment.
+    Once it holds `segment_size` entries, it is compressed into a numbered segment
+    that is never written again, and a new open segment is started.
+    Restoring an item appends an entry that hides it, since segments are never
+    rewritten, and undoing the restore appends one that shows it again.
+
+    Nothing is read until it is needed and reading goes from the newest segment
+    to the oldest, so the most recent items can be shown without reading all.
+    All methods block and may be called from any thread.
+    """
+
+    directory: str
+    """The directory the segments are kept in."""
+    segment_size: int
+    """Entries the open segment holds before it is compressed."""
+
+    def __init__(self, directory: str, segment_size: int = SEGMENT_SIZE) -> None:
+        self.directory = directory
+        self.segment_size = segment_size
+        self._lock = threading.Lock()
+        self._open_entries: int | None = None
+        self._next_id: int | None = None
+        self._restored: set[int] = set()
+
+    @property
+    def _open_path(self) -> str:
+        return os.path.join(self.directory, OPEN_SEGMENT)
+
+    def _segment_names(self) -> list[str]:
+        """Names of the compressed segments, from the oldest to the newest."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if name.endswith(SEGMENT_SUFFIX))
+
+    def _read_open_segment(self) -> list[str]:
+        try:
+            with open(self._open_path, "r") as f:
+                return f.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+    def _read_segment(self, name: str) -> list[str]:
+        # Only imported once a compressed segment is needed.
+        import gzip
+
+        with gzip.open(os.path.join(self.directory, name), "rt") as f:
+            return f.read().splitlines()
+
+    def _segments(self) -> Iterator[list[str]]:
+        """The lines of each segment, from the newest segment to the oldest."""
+        with self._lock:
+            lines = self._read_open_segment()
+            names = self._segment_names()
+        yield lines
+        for name in reversed(names):
+            yield self._read_segment(name)
+
+    def _ensure_state(self) -> None:
+        """Find the size of the open segment and the next id, if not known yet."""
+        if self._open_entries is not None and self._next_id is not None:
+            return
+        lines = self._read_open_segment()
+        self._open_entries = len(lines)
+        self._next_id = 0
+        names = self._segment_names()
+        # The newest entry with an id is in the open segment, unless that holds
+        # only restorations, or in the newest compressed segment.
+        for segment in [lines] + [self._read_segment(name) for name in names[-1:]]:
+            ids = [entry["id"] for entry in map(json.loads, segment) if "id" in entry]
+            if ids:
+                self._next_id = max(ids) + 1
+                break
+
+    def _append(self, entries: list[dict[str, Any]]) -> None:
+        """Append entries to the open segment, compressing it if full."""
+        self._ensure_state()
+        assert self._open_entries is not None
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._open_path, "a") as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        self._open_entries += len(entries)
+        if self._open_entries >= self.segment_size:
+            self._seal()
+
+    def _seal(self) -> None:
+        """Compress the open segment into a new segment and start a new one."""
+        import gzip
+
+        names = self._segment_names()
+        number = int(names[-1][: -len(SEGMENT_SUFFIX)]) + 1 if names else 0
+        path = os.path.join(self.directory, f"{number:06d}{SEGMENT_SUFFIX}")
+        with open(self._open_path, "rb") as f:
+            data = f.read()
+        temp_path = path + ".tmp"
+        with gzip.open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        # Entries that are in both segments after a crash at this point are read
+        # once, as they keep their ids.
+        os.remove(self._open_path)
+        self._open_entries = 0
+
+    def add(
+        self, records: Iterable[TodoRecord], done: dt.date | None = None
+    ) -> list[ArchivedItem]:
+        """Archive completed records.
+
+        Args:
+            records: The records to archive.
+            done: The date the records were completed. Defaults to today.
+
+        Returns:
+            The archived items, one per record.
+        """
+        done_date = dt.date.today() if done is None else done
+        with self._lock:
+            self._ensure_state()
+            assert self._next_id is not None
+            items = []
+            for record in records:
+                items.append(
+                    ArchivedItem(
+                        self._next_id, record.description, record.due_date, done_date
+                    )
+                )
+                self._next_id += 1
+            if items:
+                self._append(
+                    [
+                        {
+                            "id": item.id,
+                            "description": item.description,
+                            "date": format_date(item.due_date),
+                            "done": format_date(done_date),
+                        }
+                        for item in items
+                    ]
+                )
+            return items
+
+    def restore(self, item: ArchivedItem) -> TodoRecord:
+        """Take an item out of the archive.
+
+        Returns:
+            A new record with the data of the item, to be added back to the list.
+        """
+        with self._lock:
+            self._append([{"restored": item.id}])
+            self._restored.add(item.id)
+        return item.to_record()
+
+    def restore_many(self, items: Iterable[ArchivedItem]) -> list[TodoRecord]:
+        """Take many items out of the archive at once, with a single write.
+
+        Returns:
+            A new record for each item, in the same order.
+        """
+        items = list(items)
+        if items:
+            with self._lock:
+                self._append([{"restored": item.id} for item in items])
+                self._restored.update(item.id for item in items)
+        return [item.to_record() for item in items]
+
+    def unrestore_many(self, items: Iterable[ArchivedItem]) -> None:
+        """Put items that were restored back in the archive, as they were."""
+        items = list(items)
+        if items:
+            with self._lock:
+                self._append([{"unrestored": item.id} for item in items])
+                self._restored.difference_update(item.id for item in items)
+
+    def is_restored(self, item: ArchivedItem) -> bool:
+        """Tell whether an item was restored by this archive and not put back.
+
+        Items listed by `items` or returned by `add` are not restored until they
+        are restored through this archive.
+        """
+        with self._lock:
+            return item.id in self._restored
+
+    def items(self) -> Iterator[ArchivedItem]:
+        """Iterate over the archived items, from the most recently archived.
+
+        Segments are read one at a time, as the iteration gets to them.
+        """
+        seen: set[int] = set()
+        settled: set[int] = set()
+        for lines in self._segments():
+            for line in reversed(lines):
+                entry = json.loads(line)
+                # Restorations, and their undoing, come after the entry they
+                # apply to, so they are read before it, the newest first.
+                if "restored" in entry:
+                    if entry["restored"] not in settled:
+                        settled.add(entry["restored"])
+                        seen.add(entry["restored"])
+                    continue
+                if "unrestored" in entry:
+                    settled.add(entry["unrestored"])
+                    continue
+                if entry["id"] in seen:
+                    continue
+                seen.add(entry["id"])
+                yield ArchivedItem(
+                    entry["id"],
+                    entry["description"],
+                    parse_date(entry["date"]),
+                    parse_date(entry["done"]),
+                )
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+from itertools import islice
+from typing import Iterator
+
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.message import Message
+from textual.screen import Screen
+from textual.widgets import DataTable, Footer, Static
+
+from .archive import Archive, ArchivedItem
+from .store import format_date
+
+
+class ArchiveScreen(Screen):
+    """Screen with the completed TODO items of a list, most recently archived first.
+
+    Items are read a page at a time, in a thread, starting when the screen is
+    shown and then whenever the cursor gets near the last item read.
+    """
+
+    DEFAULT_CSS = """
+    ArchiveScreen .archivescreen--title {
+        height: 1;
+        padding: 0 1;
+        background: $panel;
+    }
+
+    ArchiveScreen DataTable {
+        height: 1fr;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "close", "Back"),
+        Binding("r", "restore", "Restore"),
+    ]
+
+    PAGE_SIZE = 100
+    """How many items are read at a time."""
+    PREFETCH = 10
+    """How close to the last row the cursor gets before the next page is read."""
+
+    class Restore(Message):
+        """Posted when the user asks to restore an item to the list."""
+
+        item: ArchivedItem
+
+        def __init__(self, item: ArchivedItem) -> None:
+            self.item = item
+            super().__init__()
+
+    _title: str
+    """What the screen shows above the items."""
+    _items: Iterator[ArchivedItem]
+    """The items not read yet."""
+    _shown: list[ArchivedItem]
+    """The items read so far, in the order of their rows."""
+    _restored: set[int]
+    """The ids of the items restored."""
+    _page_loader: asyncio.Future[None] | None = None
+    """Reads the next page of items, if one is being read."""
+    _exhausted: bool = False
+    """Whether all the items were read."""
+    _table: DataTable
+    """Shows the items read so far."""
+
+    def __init__(self, archive: Archive, title: str = "Archive") -> None:
+        self._title = title
+        self._items = archive.items()
+        self._shown = []
+        self._restored = set()
+        super().__init__()
+
+    def compose(self) -> ComposeResult:
+        yield Static(self._title, classes="archivescreen--title")
+        self._table = DataTable(show_row_labels=False)
+        self._table.cursor_type = "row"
+        self._table.add_column("Done", width=10, key="done")
+        self._table.add_column("Due", width=10, key="due")
+        self._table.add_column("Description", key="description")
+        yield self._table
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self._table.focus()
+        self._load_next_page()
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        if event.cursor_row >= self._table.row_count - self.PREFETCH:
+            self._load_next_page()
+
+    def _load_next_page(self) -> None:
+        """Start reading the next page of items, unless one is being read."""
+        if self._exhausted or self._page_loader is not None:
+            return
+        self._page_loader = asyncio.ensure_future(self._load_page())
+
+    async def _load_page(self) -> None:
+        """Read the next page of items and add a row for each."""
+        page = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: list(islice(self._items, self.PAGE_SIZE))
+        )
+        self._exhausted = len(page) < self.PAGE_SIZE
+        self._shown.extend(page)
+        for item in page:
+            self._table.add_row(
+                format_date(item.done_date),
+                format_date(item.due_date),
+                item.description,
+                key=str(item.id),
+            )
+        self._page_loader = None
+        if not self._exhausted and (
+            self._table.cursor_row >= self._table.row_count - self.PREFETCH
+        ):
+            self._load_next_page()
+
+    def action_restore(self) -> None:
+        """Restore the item under the cursor, unless it was restored already."""
+        if not self._shown:
+            return
+        item = self._shown[self._table.cursor_row]
+        if item.id in self._restored:
+            return
+        self._restored.add(item.id)
+        self._table.update_cell(str(item.id), "done", "restored")
+        self.post_message(self.Restore(item))
+
+    def action_close(self) -> None:
+        self.app.pop_screen()
+
+    def on_unmount(self) -> None:
+        if self._page_loader is not None:
+            self._page_loader.cancel()
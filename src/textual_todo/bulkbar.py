@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import datetime as dt
+import re
+
+from textual.message import Message
+from textual.widgets import Input
+
+from .store import parse_date
+
+SHIFT_PATTERN = re.compile(r"[+-]\d+")
+"""Matches a number of days to shift the due dates by, with its sign."""
+
+
+class BulkBar(Input):
+    """Input, docked at the top, to apply an action to all the selected TODO items.
+
+    The action is typed in: `done` to check the items off, `delete` to remove
+    them without archiving them, `clear` to clear their due dates, a number of
+    days to shift their due dates by, like `+3` or `-1`, or a date to set.
+    The bar is hidden until it is opened and clears itself when it is closed.
+    """
+
+    DEFAULT_CSS = """
+    BulkBar {
+        dock: top;
+        display: none;
+    }
+
+    BulkBar.bulkbar--open {
+        display: block;
+    }
+    """
+
+    BINDINGS = [("escape", "close", "Close")]
+
+    DONE = "done"
+    """Check the items off, moving them to the archive."""
+    DELETE = "delete"
+    """Remove the items from the list without archiving them."""
+    CLEAR_DATE = "clear"
+    """Clear the due dates of the items."""
+    SHIFT_DATE = "shift"
+    """Move the due dates of the items that have one by a number of days."""
+    SET_DATE = "set"
+    """Set the due dates of all the items to the same date."""
+
+    class Action(Message):
+        """Posted when an action is submitted for the selected TODO items."""
+
+        kind: str
+        """What to do, one of the action constants of `BulkBar`."""
+        days: int
+        """How many days to shift the due dates by, for `SHIFT_DATE`."""
+        date: dt.date | None
+        """The due date to set, for `SET_DATE`."""
+
+        def __init__(
+            self, kind: str, days: int = 0, date: dt.date | None = None
+        ) -> None:
+            self.kind = kind
+            self.days = days
+            self.date = date
+            super().__init__()
+
+    @staticmethod
+    def parse(text: str) -> BulkBar.Action | None:
+        """Make the action that some text stands for, or None if it is not valid."""
+        text = text.strip().lower()
+        if text in (BulkBar.DONE, BulkBar.DELETE, BulkBar.CLEAR_DATE):
+            return BulkBar.Action(text)
+        if SHIFT_PATTERN.fullmatch(text):
+            return BulkBar.Action(BulkBar.SHIFT_DATE, days=int(text))
+        date = parse_date(text)
+        if date is not None:
+            return BulkBar.Action(BulkBar.SET_DATE, date=date)
+        return None
+
+    @property
+    def is_open(self) -> bool:
+        """Is the bulk bar shown?"""
+        return self.has_class("bulkbar--open")
+
+    def open(self, count: int) -> None:
+        """Show the bulk bar and focus it.
+
+        Args:
+            count: How many TODO items are selected.
+        """
+        self.placeholder = (
+            f"{count} selected: done, delete, clear, +N or -N days, or a date"
+        )
+        self.add_class("bulkbar--open")
+        self.focus()
+
+    def action_close(self) -> None:
+        """Clear the action and hide the bulk bar."""
+        self.value = ""
+        self.remove_class("bulkbar--open")
+        self.screen.set_focus(None)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Post the action that was typed in, if it is valid, and close."""
+        event.stop()
+        action = self.parse(event.value)
+        if action is None:
+            self.app.bell()
+            return
+        self.action_close()
+        self.post_message(action)
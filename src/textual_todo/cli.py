@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import sys
+from typing import IO, TYPE_CHECKING, Callable, Sequence
+
+from .jsonfile import read_json, write_json_atomic
+from .lists import DEFAULT_LIST, archive_path, database_path, list_path
+from .store import TodoRecord, TodoStore, format_date, parse_date
+
+if TYPE_CHECKING:
+    from .storage import Storage
+
+
+Command = Callable[[argparse.Namespace, str], None]
+"""Runs a subcommand on a list, given its name."""
+STORAGES = ("json", "journal", "sqlite")
+"""The kinds of storage the app can keep the lists in, the first by default."""
+
+
+def storage_factory(kind: str) -> Callable[[str], Storage]:
+    """Get the function that creates the storage of a list, for a kind of storage.
+
+    Args:
+        kind: One of `STORAGES`.
+    """
+    # The storages are only imported to run the app, like Textual.
+    from .sqlitestorage import SqliteStorage
+    from .storage import JournalStorage, JsonStorage
+
+    if kind == "journal":
+        return lambda name: JournalStorage(list_path(name))
+    if kind == "sqlite":
+        return lambda name: SqliteStorage(database_path(name), list_path(name))
+    return lambda name: JsonStorage(list_path(name))
+
+
+def due_date(value: str) -> dt.date:
+    """Parse a due date given on the command line."""
+    date = parse_date(value)
+    if date is None:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}, expected dd-mm-yyyy")
+    return date
+
+
+def load(name: str) -> TodoStore:
+    """Read the TODO items of a list, which has none if its file does not exist."""
+    return TodoStore.from_data(read_json(list_path(name)))
+
+
+def save(name: str, store: TodoStore) -> None:
+    """Write all the TODO items of a list in one go."""
+    write_json_atomic(list_path(name), store.to_data())
+
+
+def format_record(record: TodoRecord) -> str:
+    """Format a record as a line of the output of `list`."""
+    return f"{record.id:>5}  {format_date(record.due_date):<10}  {record.description}"
+
+
+def read_records(f: IO[str]) -> list[TodoRecord]:
+    """Read the records to import from a file.
+
+    The file is either a JSON array, in the format of the data files, or text
+    with an item per line: a description optionally followed by a tab and the
+    due date.
+
+    Raises:
+        ValueError: If the file has an invalid date or is not valid JSON.
+    """
+    text = f.read()
+    if text.lstrip().startswith("["):
+        return [
+            TodoRecord(item["description"], parse_date(item.get("date", "")))
+            for item in json.loads(text)
+        ]
+
+    records = []
+    for number, line in enumerate(text.splitlines(), 1):
+        description, _, date = line.partition("\t")
+        date = date.strip()
+        if not description.strip():
+            continue
+        due = parse_date(date) if date else None
+        if date and due is None:
+            raise ValueError(f"line {number}: invalid date {date!r}")
+        records.append(TodoRecord(description, due))
+    return records
+
+
+def command_add(args: argparse.Namespace, name: str) -> None:
+    """Add an item and print its id."""
+    store = load(name)
+    record = TodoRecord(args.description, args.due)
+    store.add(record)
+    save(name, store)
+    print(record.id)
+
+
+def command_list(args: argparse.Namespace, name: str) -> None:
+    """Print the items, in due date order."""
+    store = load(name)
+    records: Sequence[TodoRecord] = store
+    if args.due_before is not None:
+        # Items with no due date come last, so they are left out too.
+        records = store[: store.bisect_date(args.due_before)]
+    sys.stdout.writelines(format_record(record) + "\n" for record in records)
+
+
+def command_done(args: argparse.Namespace, name: str) -> None:
+    """Archive the items with the given ids, or none if any id is unknown."""
+    from .archive import Archive
+
+    store = load(name)
+    records = {record_id: store.get(record_id) for record_id in args.ids}
+    unknown = [str(id_) for id_, record in records.items() if record is None]
+    if unknown:
+        sys.exit(f"todo: no item with id {', '.join(unknown)}")
+    done = [record for record in records.values() if record is not None]
+    for record in done:
+        store.remove(record)
+    save(name, store)
+    Archive(archive_path(name)).add(done)
+
+
+def command_import(args: argparse.Namespace, name: str) -> None:
+    """Add all the items of a file with a single write and print how many."""
+    try:
+        if args.file == "-":
+            records = read_records(sys.stdin)
+        else:
+            with open(args.file, "r") as f:
+                records = read_records(f)
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        sys.exit(f"todo: cannot import {args.file}: {error}")
+    store = load(name)
+    store.extend(records)
+    save(name, store)
+    print(len(records))
+
+
+COMMANDS: dict[str, Command] = {
+    "add": command_add,
+    "list": command_list,
+    "done": command_done,
+    "import": command_import,
+}
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """Create the parser of the command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="todo",
+        description="A simple TODO app. Run without a command to open the app.",
+    )
+    parser.add_argument(
+        "-l",
+        "--list",
+        dest="lists",
+        action="append",
+        metavar="NAME",
+        help=(
+            f"name of a list, kept in NAME.json (default: {DEFAULT_LIST}); "
+            "give several to open the app with a tab per list"
+        ),
+    )
+    parser.add_argument(
+        "--storage",
+        choices=STORAGES,
+        default=STORAGES[0],
+        help=(
+            "how the app keeps the lists (default: %(default)s): json rewrites "
+            "NAME.json on every change, journal appends the changes to a journal "
+            "next to it, and sqlite keeps them in NAME.db, imported from "
+            "NAME.json the first time; the commands only work on json lists"
+        ),
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="time the hot paths of the app"
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    add = commands.add_parser("add", help="add an item")
+    add.add_argument("description")
+    add.add_argument("-d", "--due", type=due_date, help="due date, dd-mm-yyyy")
+
+    list_ = commands.add_parser("list", help="list the items by due date")
+    list_.add_argument(
+        "--due-before",
+        type=due_date,
+        metavar="DATE",
+        help="only list the items due before the date, dd-mm-yyyy",
+    )
+
+    done = commands.add_parser("done", help="archive items by id")
+    done.add_argument("ids", type=int, nargs="+", metavar="ID")
+
+    import_ = commands.add_parser(
+        "import",
+        help="add many items from a file",
+        description=(
+            "Add the items of a JSON file, in the format of the lists, or of a "
+            "text file with an item per line: a description, optionally followed "
+            "by a tab and the due date."
+        ),
+    )
+    import_.add_argument("file", help="the file to import, or - for stdin")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run a command on a list, or the app if no command is given."""
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    lists = args.lists or [DEFAULT_LIST]
+
+    if args.command is None:
+        # Textual is slow to import, so it is only imported to run the app and
+        # the commands that work on the files directly start fast.
+        from .todo import TODOApp
+
+        TODOApp(
+            lists=lists,
+            storage=storage_factory(args.storage),
+            profile=args.profile or None,
+        ).run()
+        return
+
+    if args.storage != STORAGES[0]:
+        parser.error(f"the {args.command} command works on json lists only")
+    if len(lists) > 1:
+        parser.error(f"the {args.command} command works on a single list")
+    try:
+        COMMANDS[args.command](args, lists[0])
+    except BrokenPipeError:
+        # The output was piped into a command that stopped reading, like `head`.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import datetime as dt
 
-from textual.app import ComposeResult
 from textual.message import Message
 
 from .editabletext import EditableText
+from .store import parse_date
 
 
 class DatePicker(EditableText):
@@ -38,14 +38,12 @@ class DatePicker(EditableText):
             self.date_picker = date_picker
             self.date = date
 
-    def compose(self) -> ComposeResult:
-        super_compose = list(super().compose())
-        self._input.placeholder = "dd-mm-yy"
-        yield from super_compose
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, placeholder="dd-mm-yy", **kwargs)
 
     def switch_to_display_mode(self) -> None:
         """Switch to display mode only if the date is empty or valid."""
-        if self._input.value and self.date is None:
+        if self.text and self.date is None:
             self.app.bell()
             return
         return super().switch_to_display_mode()
@@ -64,7 +62,4 @@ class DatePicker(EditableText):
     @property
     def date(self) -> dt.date | None:
         """The date picked or None if not available."""
-        try:
-            return dt.datetime.strptime(self._input.value, "%d-%m-%Y").date()
-        except ValueError:
-            return None
+        return parse_date(self.text)
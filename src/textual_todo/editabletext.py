@@ -1,10 +1,148 @@
 from __future__ import annotations
 
 from textual.app import App, ComposeResult
+from textual.binding import Binding
+from textual.css.query import NoMatches
+from textual.errors import NoWidget
+from textual.geometry import Region
 from textual.message import Message
+from textual.screen import Screen
 from textual.widgets import Button, Input, Label, Static
 
 
+class SharedEditor(Input):
+    """The single input that all `EditableText` widgets of a screen edit with.
+
+    Only one field can be edited at a time, so instead of composing an `Input`
+    per field, fields borrow this editor, which is placed over their label.
+    It lives on the `editor` layer, which the app must declare on its screens
+    above the others, and is placed over the label again whenever the field is
+    told to `follow`, which the containers of fields do as they scroll or lay
+    the fields out.
+    """
+
+    DEFAULT_CSS = """
+    SharedEditor {
+        layer: editor;
+        dock: top;
+        height: 3;
+        display: none;
+    }
+    """
+
+    BINDINGS = [Binding("escape", "cancel", "Cancel", show=False)]
+
+    owner: EditableText | None = None
+    """The field the editor is lent to, if any."""
+    _original_value: str = ""
+    """The value of the field before it was edited."""
+    _placement: Region | None = None
+    """Where the editor was last placed, or None if it is hidden."""
+    _following: int = 0
+    """How many more refreshes the editor is to be placed over the label after."""
+
+    @classmethod
+    def for_screen(cls, screen: Screen) -> SharedEditor:
+        """Get the editor of a screen, mounting one if it has none yet."""
+        try:
+            return screen.query_one(cls)
+        except NoMatches:
+            editor = cls()
+            screen.mount(editor)
+            return editor
+
+    def lend(self, owner: EditableText) -> bool:
+        """Start editing a field, which stops editing any other field.
+
+        Args:
+            owner: The field to edit.
+
+        Returns:
+            Whether the editor was lent, which it is not if the field being
+            edited refuses to stop, like a date picker with an invalid date.
+            That field is then left as it is, to be corrected.
+        """
+        previous = self.owner
+        if previous is not None and previous is not owner:
+            previous.switch_to_display_mode()
+            if previous.is_editing:
+                self.focus()
+                return False
+
+        self.owner = owner
+        self._original_value = owner.value
+        self.value = owner.value
+        self.placeholder = owner.placeholder
+        self.cursor_position = len(self.value)
+        # Placed once refreshed, as the editor or the label may not be laid out yet.
+        self.follow_owner()
+        self.focus()
+        return True
+
+    def give_back(self, owner: EditableText) -> None:
+        """Stop editing the given field, if the editor is lent to it."""
+        if self.owner is not owner:
+            return
+        self.owner = None
+        if self.has_focus:
+            self.screen.set_focus(None)
+        self._placement = None
+        self.display = False
+
+    def follow_owner(self) -> None:
+        """Place the editor over the label of its owner after the next refreshes.
+
+        Called whenever the label may have moved.
+        The label is laid out again in the next refresh, or in the one after if
+        it was scrolled, as the screen only hears of a scroll once the container
+        that scrolled is idle, so the editor is placed after both.
+        """
+        if not self._following:
+            self.call_after_refresh(self._follow)
+        self._following = 2
+
+    def _follow(self) -> None:
+        self._following -= 1
+        if self._following:
+            self.call_after_refresh(self._follow)
+        self._place()
+
+    def _place(self) -> None:
+        """Place the editor over the label of its owner, or hide it if not visible.
+
+        An input cannot be cropped, so the editor is hidden while the label is
+        partly scrolled out of view.
+        """
+        if self.owner is None:
+            return
+        try:
+            geometry = self.screen.find_widget(self.owner._label)
+        except NoWidget:
+            placement = None
+        else:
+            region = geometry.region
+            visible = region and geometry.visible_region == region
+            placement = region if visible else None
+        if placement == self._placement:
+            return
+
+        self._placement = placement
+        self.display = placement is not None
+        if placement is not None:
+            self.styles.offset = placement.offset
+            self.styles.width = placement.width
+
+    async def action_submit(self) -> None:
+        if self.owner is not None:
+            self.owner.switch_to_display_mode()
+
+    def action_cancel(self) -> None:
+        """Stop editing and restore the value from before editing."""
+        if self.owner is not None:
+            self.value = self._original_value
+            self.owner.switch_to_display_mode()
+
+
 class EditableText(Static):
     """Custom widget to show (editable) static text."""
 
@@ -15,11 +153,6 @@ class EditableText(Static):
         height: 3;
     }
 
-    .editabletext--input {
-        width: 1fr;
-        height: 3;
-    }
-
     .editabletext--label {
         width: 1fr;
         height: 3;
@@ -30,28 +163,17 @@ class EditableText(Static):
         min-width: 0;
         width: 4;
     }
-
-    .editabletext--confirm {
-        min-width: 0;
-        width: 4;
-    }
-
-    EditableText .ethidden {
-        display: none;
-    }
     """
 
-    _confirm_button: Button
-    """The button to confirm changes to the text."""
     _edit_button: Button
-    """The button to start editing the text."""
-    _input: Input
-    """The field that allows editing text."""
+    """The button to start and to confirm editing the text."""
     _label: Label
     """The label that displays the text."""
+    _editor: SharedEditor | None = None
+    """The shared editor, while the text is being edited."""
 
-    _initial_value: str = ""
-    """The initial value to initialise the instance with."""
+    placeholder: str
+    """Text shown in the editor while it is empty."""
 
     class Display(Message):
         """The user switched to display mode."""
@@ -73,31 +195,43 @@ class EditableText(Static):
             self.editable_text = editable_text
             super().__init__()
 
-    def __init__(self, value: str = "", *args, **kwargs) -> None:
-        self._initial_value = value
+    def __init__(
+        self,
+        value: str = "",
+        *args,
+        placeholder: str = "Type something...",
+        **kwargs,
+    ) -> None:
+        """Initialise the widget.
+
+        The sub widgets are created right away, so the value can be changed
+        before the widget is mounted.
+
+        Args:
+            value: The text to show.
+            placeholder: Text shown in the editor while it is empty.
+        """
         super().__init__(*args, **kwargs)
-
-    def compose(self) -> ComposeResult:
-        self._input = Input(
-            value=self._initial_value,
-            placeholder="Type something...",
-            classes="editabletext--input ethidden",
-        )
-        self._label = Label(self._initial_value, classes="editabletext--label")
+        self.placeholder = placeholder
+        self._label = Label(value, classes="editabletext--label")
         self._edit_button = Button("📝", classes="editabletext--edit")
-        self._confirm_button = Button(
-            "✅", classes="editabletext--confirm ethidden", disabled=True
-        )
 
-        yield self._input
+    def compose(self) -> ComposeResult:
         yield self._label
         yield self._edit_button
-        yield self._confirm_button
+
+    def on_unmount(self) -> None:
+        self._stop_editing()
 
     @property
     def is_editing(self) -> bool:
         """Is the text being edited?"""
-        return not self._input.has_class("ethidden")
+        return self._editor is not None
+
+    def follow(self) -> None:
+        """Keep the editor over the label, if editing, as the label may have moved."""
+        if self._editor is not None:
+            self._editor.follow_owner()
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         event.stop()
@@ -106,40 +240,58 @@ class EditableText(Static):
         else:
             self.switch_to_editing_mode()
 
-    def switch_to_editing_mode(self) -> None:
-        if self.is_editing:
-            return
+    @property
+    def value(self) -> str:
+        """The text being displayed."""
+        return str(self._label.renderable)
 
-        self._input.value = str(self._label.renderable)
+    @value.setter
+    def value(self, value: str) -> None:
+        self._label.update(value)
 
-        self._label.add_class("ethidden")
-        self._input.remove_class("ethidden")
+    @property
+    def text(self) -> str:
+        """The text in the editor while editing, or the text being displayed."""
+        return self.value if self._editor is None else self._editor.value
 
-        self._edit_button.disabled = True
-        self._edit_button.add_class("ethidden")
-        self._confirm_button.disabled = False
-        self._confirm_button.remove_class("ethidden")
+    def switch_to_editing_mode(self) -> None:
+        if self.is_editing:
+            return
 
+        editor = SharedEditor.for_screen(self.screen)
+        if not editor.lend(self):
+            return
+        self._editor = editor
+        self._edit_button.label = "✅"
         self.post_message(self.Edit(self))
 
     def switch_to_display_mode(self) -> None:
         if not self.is_editing:
             return
 
-        self._label.renderable = self._input.value
-
-        self._input.add_class("ethidden")
-        self._label.remove_class("ethidden")
+        self._label.update(self.text)
+        self._stop_editing()
+        self.post_message(self.Display(self))
 
-        self._confirm_button.disabled = True
-        self._confirm_button.add_class("ethidden")
-        self._edit_button.disabled = False
-        self._edit_button.remove_class("ethidden")
+    def _stop_editing(self) -> None:
+        """Give the editor back, leaving the text being displayed as it is.
 
-        self.post_message(self.Display(self))
+        Unlike the `switch_to_*` methods, this posts no messages.
+        """
+        if self._editor is None:
+            return
+        editor, self._editor = self._editor, None
+        editor.give_back(self)
+        self._edit_button.label = "📝"
 
 
 class EditableTextApp(App[None]):
+    CSS = """
+    Screen {
+        layers: default editor;
+    }
+    """
+
     def compose(self) -> ComposeResult:
         yield EditableText()
 
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from typing import TYPE_CHECKING, Callable, Hashable
+from weakref import WeakKeyDictionary, ref
+
+from textual.app import App
+
+from .instrumentation import timed
+
+if TYPE_CHECKING:
+    from textual.timer import Timer
+
+
+class ExpiryScheduler:
+    """Runs callbacks once their delay is over, with a single timer for all of them.
+
+    Each callback is scheduled under a key, and a key has at most one callback
+    pending: scheduling another replaces it, so an expiry never runs for a
+    status message that was already replaced.
+    Deadlines are rounded up to whole ticks, so expiries scheduled close together
+    run together, in a single batch of updates.
+    """
+
+    TICK = 0.05
+    """Seconds that deadlines are rounded up to a multiple of."""
+
+    _instances: WeakKeyDictionary[App, ExpiryScheduler] = WeakKeyDictionary()
+    """The scheduler of each app."""
+
+    _app: ref[App]
+    """The app the timer runs in and whose updates are batched.
+
+    Held weakly, so that the scheduler does not keep the app alive.
+    """
+    _pending: dict[Hashable, tuple[float, int, Callable[[], None]]]
+    """The deadline, sequence number, and callback of the expiry of each key."""
+    _heap: list[tuple[float, int, Hashable]]
+    """Deadlines in a heap, along with entries that were replaced or cancelled."""
+    _timer: Timer | None = None
+    """Fires at the earliest deadline, if any expiry is pending."""
+    _timer_deadline: float = math.inf
+    """When the timer fires."""
+
+    def __init__(self, app: App) -> None:
+        self._app = ref(app)
+        self._pending = {}
+        self._heap = []
+        self._seq = 0
+
+    @classmethod
+    def for_app(cls, app: App) -> ExpiryScheduler:
+        """Get the scheduler of an app, creating it if it has none yet."""
+        scheduler = cls._instances.get(app)
+        if scheduler is None:
+            scheduler = cls._instances[app] = cls(app)
+        return scheduler
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def schedule(
+        self, key: Hashable, delay: float, callback: Callable[[], None]
+    ) -> None:
+        """Run a callback after a delay, replacing the one pending for the key.
+
+        Args:
+            key: What the callback is for, like the widget it updates.
+            delay: Seconds to wait before running the callback.
+            callback: The function to run.
+        """
+        deadline = math.ceil((time.monotonic() + delay) / self.TICK) * self.TICK
+        self._seq += 1
+        self._pending[key] = (deadline, self._seq, callback)
+        heapq.heappush(self._heap, (deadline, self._seq, key))
+        if len(self._heap) > 2 * len(self._pending) + 64:
+            # Entries that were replaced are dropped once they get to the top,
+            # but frequent replacements can make them pile up in the meantime.
+            self._heap = [
+                (deadline, seq, key)
+                for key, (deadline, seq, _) in self._pending.items()
+            ]
+            heapq.heapify(self._heap)
+        if deadline < self._timer_deadline:
+            self._set_timer(deadline)
+
+    def cancel(self, key: Hashable) -> None:
+        """Forget the callback pending for a key, if there is one."""
+        # The entry in the heap is skipped when it gets to the top.
+        self._pending.pop(key, None)
+
+    def _set_timer(self, deadline: float) -> None:
+        app = self._app()
+        if app is None:
+            return
+        if self._timer is not None:
+            self._timer.stop()
+        self._timer_deadline = deadline
+        self._timer = app.set_timer(max(0.0, deadline - time.monotonic()), self._expire)
+
+    @timed
+    def _expire(self) -> None:
+        """Run all the callbacks whose deadline has passed, in a single batch."""
+        self._timer = None
+        self._timer_deadline = math.inf
+        now = time.monotonic()
+        heap, pending = self._heap, self._pending
+        due = []
+        while heap and heap[0][0] <= now:
+            _, seq, key = heapq.heappop(heap)
+            entry = pending.get(key)
+            if entry is not None and entry[1] == seq:
+                del pending[key]
+                due.append(entry[2])
+        app = self._app()
+        if due and app is not None:
+            with app.batch_update():
+                for callback in due:
+                    callback()
+
+        while heap:
+            deadline, seq, key = heap[0]
+            entry = pending.get(key)
+            if entry is not None and entry[1] == seq:
+                self._set_timer(deadline)
+                break
+            heapq.heappop(heap)
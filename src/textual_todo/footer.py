@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from rich.console import RenderableType
+from rich.text import Text
+from textual.reactive import reactive
+from textual.widgets import Footer
+
+
+class TodoFooter(Footer):
+    """Footer that shows the key bindings and how far loading has got."""
+
+    progress: reactive[float | None] = reactive(None)
+    """Fraction of the TODO items loaded so far, or None if not loading."""
+
+    def render(self) -> RenderableType:
+        text = super().render()
+        if self.progress is None or not isinstance(text, Text):
+            return text
+        text = text.copy()
+        text.append(f" Loading {self.progress:.0%} ")
+        return text
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from inspect import isawaitable, iscoroutinefunction
+from typing import Any, Callable, Deque, TypeVar
+
+
+PROFILE_ENV = "TODO_PROFILE"
+"""Environment variable that turns the instrumentation on when set."""
+PROFILE_OUTPUT_ENV = "TODO_PROFILE_OUTPUT"
+"""Environment variable with the file to dump the statistics to on exit."""
+DEFAULT_OUTPUT = "todo-profile.json"
+"""File the statistics are dumped to on exit if no other file is given."""
+MAX_SAMPLES = 1000
+"""How many of the most recent durations of each operation are kept."""
+
+FunctionType = TypeVar("FunctionType", bound=Callable[..., Any])
+
+
+class Timing:
+    """Number of calls and recent durations of a single operation."""
+
+    __slots__ = ("calls", "total", "samples")
+
+    calls: int
+    """How many times the operation ran."""
+    total: float
+    """Seconds spent in the operation, over all calls."""
+    samples: Deque[float]
+    """The durations of the most recent calls, in seconds."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def record(self, duration: float) -> None:
+        """Record a call that took the given number of seconds."""
+        self.calls += 1
+        self.total += duration
+        self.samples.append(duration)
+
+    def percentile(self, fraction: float) -> float:
+        """Get a percentile of the recent durations, in seconds.
+
+        Args:
+            fraction: The percentile, as a fraction between 0 and 1.
+        """
+        if not self.samples:
+            return 0.0
+        samples = sorted(self.samples)
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def to_data(self) -> dict[str, float]:
+        """Summarise the timing, with durations in milliseconds."""
+        return {
+            "calls": self.calls,
+            "total_ms": self.total * 1000,
+            "p50_ms": self.percentile(0.5) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+        }
+
+
+class Profiler:
+    """Times the hot paths of the app, if enabled.
+
+    Functions decorated with `timed` check whether the profiler is enabled on
+    every call, so the instrumentation costs next to nothing when it is off.
+    Timings may be recorded from any thread.
+    """
+
+    enabled: bool
+    """Whether calls are being timed."""
+    timings: dict[str, Timing]
+    """The timings of each operation, by name."""
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration: float) -> None:
+        """Record a call to an operation that took the given number of seconds."""
+        with self._lock:
+            timing = self.timings.get(name)
+            if timing is None:
+                timing = self.timings[name] = Timing()
+            timing.record(duration)
+
+    def timed(self, function: FunctionType) -> FunctionType:
+        """Decorate a function, or coroutine function, to time its calls.
+
+        The calls are recorded under the qualified name of the function.
+        Calls that return an awaitable, like the `AwaitMount` of a mount, are
+        timed until it is done, whether or not the caller awaits it, so that
+        the time spent mounting widgets counts too.
+        """
+        name = function.__qualname__
+
+        if iscoroutinefunction(function):
+
+            @wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return await function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not self.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            result = None
+            try:
+                result = function(*args, **kwargs)
+                return result
+            finally:
+                if isawaitable(result):
+                    asyncio.ensure_future(result).add_done_callback(
+                        lambda _: self.record(name, time.perf_counter() - start)
+                    )
+                else:
+                    self.record(name, time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """Summarise all timings, slowest operations first."""
+        with self._lock:
+            data = {name: timing.to_data() for name, timing in self.timings.items()}
+        return dict(sorted(data.items(), key=lambda item: -item[1]["total_ms"]))
+
+    def dump(self, path: str) -> None:
+        """Write the summary of all timings to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+profiler = Profiler(enabled=bool(os.environ.get(PROFILE_ENV)))
+"""The profiler of the app, on if the `TODO_PROFILE` environment variable is set."""
+timed = profiler.timed
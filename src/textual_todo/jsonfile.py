@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+from typing import IO, Any, Iterator
+
+from .store import TodoData
+
+
+def write_json_atomic(path: str, data: Any) -> os.stat_result:
+    """Write data as JSON, replacing the file only once the write is complete.
+
+    The data is written to a temporary file in the same directory, which is then
+    renamed over the destination, so a crash can never leave a truncated file.
+    The file keeps the permissions of the file it replaces or, if it is new, gets
+    the ones `open` would give it.
+
+    Returns:
+        The status of the file written, which renaming does not change.
+    """
+    # Imported here, as it is slow to import and reading needs no temporary files.
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        os.chmod(temp_path, _file_mode(path))
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+            status = os.fstat(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return status
+
+
+def _file_mode(path: str) -> int:
+    """The permissions for a file written to path, which mkstemp makes private."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        # The umask can only be read by setting it, so it is set back right away.
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def read_json(path: str) -> TodoData:
+    """Read the JSON representation of the TODO items, if the file exists."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def _skip_separators(text: str, position: int) -> int:
+    """Skip the whitespace and commas between the elements of a JSON array."""
+    while position < len(text) and text[position] in " \t\r\n,":
+        position += 1
+    return position
+
+
+def iter_json_array(
+    f: IO[str], block_size: int = 64 * 1024
+) -> Iterator[tuple[Any, int]]:
+    """Parse a JSON array incrementally, reading the file a block at a time.
+
+    Yields:
+        Each element of the array along with how many characters of the file
+            were read to parse it.
+    """
+    decoder = json.JSONDecoder()
+    buffer = f.read(block_size)
+    consumed = 0
+    position = _skip_separators(buffer, 0)
+    if buffer[position : position + 1] != "[":
+        raise ValueError("Expected a JSON array.")
+    position += 1
+
+    while True:
+        position = _skip_separators(buffer, position)
+        if buffer[position : position + 1] == "]":
+            return
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # The element is cut short by the end of the buffer, so read more.
+            block = f.read(block_size)
+            if not block:
+                raise
+            consumed += position
+            buffer = buffer[position:] + block
+            position = 0
+            continue
+        yield item, consumed + position
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Only needed for the annotations, so that the command line interface can
+    # import the names of the lists without importing Textual or what only the
+    # app keeps for an open list.
+    import asyncio
+
+    from .archive import Archive
+    from .search import SearchIndex
+    from .storage import Storage
+    from .todolist import TodoList
+    from .undo import UndoLog
+
+
+DEFAULT_LIST = "items"
+"""Name of the list the app shows if it is not given any."""
+MAX_OPEN_LISTS = 3
+"""How many lists are kept open, the least recently shown being closed first."""
+
+
+def list_path(name: str) -> str:
+    """Get the file a list is kept in, relative to the current directory."""
+    return f"{name}.json"
+
+
+def database_path(name: str) -> str:
+    """Get the SQLite database a list is kept in, when kept in one."""
+    return f"{name}.db"
+
+
+def archive_path(name: str) -> str:
+    """Get the directory the completed items of a list are archived in."""
+    return f"{name}.archive"
+
+
+class OpenList:
+    """A TODO list that was opened, with all that the app keeps for it while open.
+
+    Lists are opened the first time they are shown: their widgets are mounted
+    and their items are read.
+    Once closed, the list is dropped with its widgets, items, and search index.
+    """
+
+    name: str
+    """The name of the list."""
+    storage: Storage
+    """Keeps the TODO items of the list between sessions."""
+    container: TodoList
+    """Container for the TODO items of the list."""
+    search_index: SearchIndex
+    """Finds the TODO items of the list by the words in their descriptions."""
+    archive: Archive
+    """Keeps the completed TODO items of the list, apart from the others."""
+    undo_log: UndoLog
+    """The changes made to the list, to undo and redo them."""
+    loader: asyncio.Future[None] | None = None
+    """Loads the TODO items in the background."""
+    progress: float | None = None
+    """Fraction of the TODO items loaded so far, or None if not loading."""
+    waiting: bool = False
+    """Whether the loader waits for the TODO items still unread to be scrolled to."""
+
+    def __init__(
+        self,
+        name: str,
+        storage: Storage,
+        container: TodoList,
+        undo_log: UndoLog | None = None,
+    ) -> None:
+        from .archive import Archive
+        from .search import SearchIndex
+        from .undo import UndoLog
+
+        self.name = name
+        self.storage = storage
+        self.container = container
+        self.search_index = SearchIndex()
+        self.archive = Archive(archive_path(name))
+        self.undo_log = UndoLog() if undo_log is None else undo_log
+
+    @property
+    def loading(self) -> bool:
+        """Are the TODO items being loaded, rather than waiting to be scrolled to?"""
+        return self.loader is not None and not self.loader.done() and not self.waiting
+
+    async def close(self) -> None:
+        """Stop loading and save all changes.
+
+        The container of the list is left for the caller to remove.
+        """
+        if self.loader is not None:
+            self.loader.cancel()
+        await self.storage.close()
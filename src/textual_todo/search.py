@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+from .store import TodoRecord
+
+
+MAX_PREFIX_LENGTH = 16
+"""Words are indexed by their prefixes up to this length."""
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> set[str]:
+    """Split text into the lowercase words it is searched by."""
+    return set(_WORD.findall(text.lower()))
+
+
+def _prefixes(words: Iterable[str]) -> set[str]:
+    """All the indexed prefixes of the given words."""
+    return {
+        word[:length]
+        for word in words
+        for length in range(1, min(len(word), MAX_PREFIX_LENGTH) + 1)
+    }
+
+
+class SearchIndex:
+    """Inverted index from word prefixes to the records whose descriptions have
+    words starting with them.
+
+    Looking up a search term is a dictionary lookup, so the cost of a search
+    depends on how many records match, not on how many records there are.
+    The index is kept up to date record by record, as descriptions change.
+    """
+
+    _records_by_prefix: dict[str, set[TodoRecord]]
+    """The records that have a word with each prefix."""
+    _words_of: dict[TodoRecord, set[str]]
+    """The words each record was indexed with."""
+
+    def __init__(self, records: Iterable[TodoRecord] = ()) -> None:
+        self._records_by_prefix = {}
+        self._words_of = {}
+        for record in records:
+            self.add(record)
+
+    def __len__(self) -> int:
+        return len(self._words_of)
+
+    def add(self, record: TodoRecord) -> None:
+        """Index a record by the words in its description."""
+        words = self._words_of[record] = tokenize(record.description)
+        for prefix in _prefixes(words):
+            self._records_by_prefix.setdefault(prefix, set()).add(record)
+
+    def remove(self, record: TodoRecord) -> None:
+        """Stop indexing a record."""
+        words = self._words_of.pop(record, set())
+        self._unindex(record, _prefixes(words))
+
+    def update(self, record: TodoRecord) -> None:
+        """Reindex a record whose description changed.
+
+        Only the prefixes that the record gained or lost are touched.
+        """
+        old_words = self._words_of.get(record, set())
+        new_words = self._words_of[record] = tokenize(record.description)
+        if old_words == new_words:
+            return
+        old_prefixes, new_prefixes = _prefixes(old_words), _prefixes(new_words)
+        self._unindex(record, old_prefixes - new_prefixes)
+        for prefix in new_prefixes - old_prefixes:
+            self._records_by_prefix.setdefault(prefix, set()).add(record)
+
+    def _unindex(self, record: TodoRecord, prefixes: Iterable[str]) -> None:
+        for prefix in prefixes:
+            records = self._records_by_prefix[prefix]
+            records.discard(record)
+            if not records:
+                del self._records_by_prefix[prefix]
+
+    def search(self, query: str) -> set[TodoRecord] | None:
+        """Find the records that have a word starting with each word of the query.
+
+        Args:
+            query: The text to search for.
+
+        Returns:
+            The matching records, or None if the query has no words, in which case
+                every record matches.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+
+        candidates = [
+            self._records_by_prefix.get(term[:MAX_PREFIX_LENGTH], set())
+            for term in terms
+        ]
+        # Intersecting the smallest sets first keeps the work to a minimum.
+        candidates.sort(key=len)
+        matches = set(candidates[0])
+        for records in candidates[1:]:
+            matches &= records
+
+        long_terms = [term for term in terms if len(term) > MAX_PREFIX_LENGTH]
+        if long_terms:
+            matches = {
+                record
+                for record in matches
+                if all(
+                    any(word.startswith(term) for word in self._words_of[record])
+                    for term in long_terms
+                )
+            }
+        return matches
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from textual.binding import Binding
+from textual.widgets import Input
+
+
+class SearchBar(Input):
+    """Input, docked at the top, that the TODO items are filtered by.
+
+    The bar is hidden until it is opened and clears itself when it is closed.
+    `ctrl+a` selects all the items that match, as it does elsewhere in the app,
+    rather than moving to the start of the input, which `home` still does.
+    """
+
+    DEFAULT_CSS = """
+    SearchBar {
+        dock: top;
+        display: none;
+    }
+
+    SearchBar.searchbar--open {
+        display: block;
+    }
+    """
+
+    BINDINGS = [
+        ("escape", "close", "Close search"),
+        Binding("ctrl+a", "app.select_all", "Select all", show=False),
+    ]
+
+    @property
+    def is_open(self) -> bool:
+        """Is the search bar shown?"""
+        return self.has_class("searchbar--open")
+
+    def open(self) -> None:
+        """Show the search bar and focus it."""
+        self.add_class("searchbar--open")
+        self.focus()
+
+    def action_close(self) -> None:
+        """Clear the search and hide the search bar."""
+        self.value = ""
+        self.remove_class("searchbar--open")
+        self.screen.set_focus(None)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator
+
+from .store import RecordSnapshot, TodoRecord
+
+
+MAGIC = b"TODOSNAP"
+"""The first bytes of every snapshot file."""
+VERSION = 1
+"""Version of the format, bumped whenever it changes."""
+HEADER = struct.Struct("<8sHqq16sI")
+"""Magic, version, modification time and size of the source file, digest of the
+source file, and number of records."""
+NO_ID = -1
+"""Stands in for the id of a record that has none."""
+NO_DATE = 0
+"""Stands in for the ordinal of the due date of a record that has none."""
+
+
+def snapshot_path(path: str) -> str:
+    """Get the path of the binary snapshot of a JSON file."""
+    return path + ".snapshot"
+
+
+def file_digest(path: str) -> tuple[bytes, os.stat_result]:
+    """Hash the contents of a file.
+
+    Returns:
+        The digest of the contents and the status of the file that was hashed.
+    """
+    with open(path, "rb") as f:
+        status = os.fstat(f.fileno())
+        digest = hashlib.blake2b(f.read(), digest_size=16).digest()
+    return digest, status
+
+
+def _to_bytes(values: array[int]) -> bytes:
+    """Get the bytes of an array of numbers, in little-endian order."""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data: bytes) -> array[int]:
+    """Create an array of numbers from bytes in little-endian order."""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def write_store_snapshot(
+    path: str,
+    snapshot: Iterable[RecordSnapshot],
+    source_digest: bytes,
+    source_status: os.stat_result,
+) -> None:
+    """Write a snapshot of a store, valid for as long as its source is unchanged.
+
+    The records are written in the order given, which should be due date order,
+    with the dates as ordinals, so they can be read back without parsing or
+    sorting anything.
+    The descriptions are written one after the other, with their lengths in
+    characters, so they are decoded in one go.
+    The file is written to a temporary file and then renamed over the old one.
+
+    Args:
+        path: The path to write the snapshot to.
+        snapshot: The records to write.
+        source_digest: The digest of the JSON file with the same records, see
+            `file_digest`.
+        source_status: The status of the JSON file when it was hashed.
+    """
+    ids, ordinals, lengths = array("q"), array("i"), array("I")
+    descriptions = []
+    for id_, description, due_date in snapshot:
+        ids.append(NO_ID if id_ is None else id_)
+        ordinals.append(NO_DATE if due_date is None else due_date.toordinal())
+        lengths.append(len(description))
+        descriptions.append(description)
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        source_status.st_mtime_ns,
+        source_status.st_size,
+        source_digest,
+        len(ids),
+    )
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(_to_bytes(ids))
+        f.write(_to_bytes(ordinals))
+        f.write(_to_bytes(lengths))
+        f.write("".join(descriptions).encode("utf-8"))
+    os.replace(temp_path, path)
+
+
+def read_store_snapshot(
+    path: str, source_path: str
+) -> tuple[Iterator[TodoRecord], int, os.stat_result] | None:
+    """Read a snapshot of a store, if it is still valid for its source.
+
+    A snapshot is valid if the source file has the modification time, size, and
+    contents it had when the snapshot was written.
+
+    Args:
+        path: The path of the snapshot.
+        source_path: The path of the JSON file the snapshot was written for.
+
+    Returns:
+        The records, in the order they were written, how many there are, and
+        the status of the source file, or None if the snapshot is missing,
+        stale, or invalid.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        status = os.stat(source_path)
+    except FileNotFoundError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, mtime_ns, size, digest, count = HEADER.unpack_from(data)
+    if (
+        magic != MAGIC
+        or version != VERSION
+        or (mtime_ns, size) != (status.st_mtime_ns, status.st_size)
+    ):
+        return None
+    # The modification time may not change if the file is rewritten quickly,
+    # so the contents are checked too, which is much cheaper than parsing them.
+    source_digest, status = file_digest(source_path)
+    if source_digest != digest:
+        return None
+
+    start = HEADER.size
+    columns = []
+    for typecode in ("q", "i", "I"):
+        end = start + array(typecode).itemsize * count
+        columns.append(_from_bytes(typecode, data[start:end]))
+        start = end
+    ids, ordinals, lengths = columns
+    try:
+        descriptions = data[start:].decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    if len(lengths) != count or sum(lengths) != len(descriptions):
+        return None
+    return _records(ids, ordinals, lengths, descriptions), count, status
+
+
+def _records(
+    ids: array[int], ordinals: array[int], lengths: array[int], descriptions: str
+) -> Iterator[TodoRecord]:
+    """Create the records of a snapshot from its columns."""
+    # Many items are due on the same dates, so each date is only created once.
+    dates: dict[int, dt.date | None] = {NO_DATE: None}
+    start = 0
+    for id_, ordinal, length in zip(ids, ordinals, lengths):
+        end = start + length
+        date = dates.get(ordinal)
+        if date is None and ordinal != NO_DATE:
+            date = dates[ordinal] = dt.date.fromordinal(ordinal)
+        yield TodoRecord(
+            descriptions[start:end], date, id=None if id_ == NO_ID else id_
+        )
+        start = end
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import os
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from .instrumentation import timed
+from .jsonfile import read_json
+from .storage import Chunk, Storage, chunk_sizes
+from .store import TodoRecord, TodoStore
+
+
+ResultType = TypeVar("ResultType")
+Row = Tuple[int, str, Optional[str]]
+"""A row of the items table: id, description, and due date in ISO format."""
+WindowKey = Tuple[Optional[dt.date], int]
+"""The due date and id of the last record of a window, as it was read."""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    due_date TEXT
+);
+CREATE INDEX IF NOT EXISTS items_by_due_date ON items (due_date IS NULL, due_date, id);
+"""
+ORDER_BY = "ORDER BY due_date IS NULL, due_date, id"
+"""Orders rows like `DueDateIndex` orders records, and is served by the index."""
+# The page queries spell out the terms of the index so that it serves their order.
+DATED_PAGE = """
+SELECT * FROM items WHERE due_date IS NULL = 0 AND (due_date, id) > (?, ?)
+ORDER BY due_date, id LIMIT ?
+"""
+"""Reads the page of items with a due date that follows a due date and id."""
+UNDATED_PAGE = """
+SELECT * FROM items WHERE due_date IS NULL = 1 AND due_date IS NULL AND id > ?
+ORDER BY due_date, id LIMIT ?
+"""
+"""Reads the page of items without a due date that follows an id."""
+FIRST_DATE = ""
+"""Sorts before every due date in ISO format."""
+FIRST_ID = -(2**63)
+"""The smallest integer SQLite stores, so it sorts before every id."""
+SCHEMA_VERSION = 1
+"""Stored as the database's `user_version` once it is set up."""
+
+
+def _to_row(record: TodoRecord) -> Row:
+    assert record.id is not None
+    due_date = None if record.due_date is None else record.due_date.isoformat()
+    return (record.id, record.description, due_date)
+
+
+def _to_record(row: Row) -> TodoRecord:
+    id_, description, due_date = row
+    date = None if due_date is None else dt.date.fromisoformat(due_date)
+    return TodoRecord(description, date, id=id_)
+
+
+def window_key(record: TodoRecord) -> WindowKey:
+    """Get the key to read the window that follows a record with `read_window`.
+
+    The key is taken when the record is read, as its due date may change later.
+    """
+    assert record.id is not None
+    return (record.due_date, record.id)
+
+
+class SqliteStorage(Storage):
+    """Keeps the TODO items in a SQLite database, with one row per item.
+
+    Every change updates, inserts, or deletes a single row, and rows are read a
+    page at a time, in due date order, seeking to each page with an index on the
+    due date.
+    A virtual list can read only the rows of its window with `read_window`, so
+    the rows below it are not read until they are scrolled to.
+    The database runs in WAL mode and is only ever used from a dedicated thread,
+    so no query blocks the event loop.
+    """
+
+    path: str
+    """The path to the database."""
+    migrate_from: str | None
+    """JSON file to import the items from when the database is first created."""
+
+    def __init__(self, path: str, migrate_from: str | None = None) -> None:
+        """Initialise the storage.
+
+        Args:
+            path: The path to the database.
+            migrate_from: JSON file to import the TODO items from, if the database
+                has never been set up before.
+        """
+        super().__init__()
+        self.path = path
+        self.migrate_from = migrate_from
+        self._connection: sqlite3.Connection | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def _submit(
+        self, function: Callable[..., ResultType], *args: Any
+    ) -> Future[ResultType]:
+        """Run a function in the database thread."""
+        return self._executor.submit(function, *args)
+
+    async def _run(self, function: Callable[..., ResultType], *args: Any) -> ResultType:
+        """Run a function in the database thread and wait for its result."""
+        return await asyncio.wrap_future(self._submit(function, *args))
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection to the database, setting it up if needed."""
+        if self._connection is not None:
+            return self._connection
+
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+        if version < SCHEMA_VERSION:
+            with connection:
+                connection.executescript(SCHEMA)
+                if self.migrate_from is not None and os.path.exists(self.migrate_from):
+                    store = TodoStore.from_data(read_json(self.migrate_from))
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO items VALUES (?, ?, ?)",
+                        map(_to_row, store),
+                    )
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._connection = connection
+        return connection
+
+    def read(self) -> TodoStore:
+        return self._submit(self._read).result()
+
+    def _read(self) -> TodoStore:
+        return TodoStore(map(_to_record, self._select_all()))
+
+    def read_chunks(self) -> Iterator[Chunk]:
+        total = self._submit(self._count).result()
+        read = 0
+        last: Row | None = None
+        for size in chunk_sizes():
+            rows = self._submit(self._read_page, last, size).result()
+            if not rows:
+                break
+            read += len(rows)
+            last = rows[-1]
+            yield [_to_record(row) for row in rows], min(1.0, read / max(1, total))
+
+    async def read_window(self, after: WindowKey | None, size: int) -> list[TodoRecord]:
+        """Read a window of items, in due date order, straight from the database.
+
+        Args:
+            after: The key of the last record of the previous window, from
+                `window_key`, or None to read the first window.
+            size: How many items to read, at most.
+        """
+        row: Row | None = None
+        if after is not None:
+            due_date, id_ = after
+            row = (id_, "", None if due_date is None else due_date.isoformat())
+        rows = await self._run(self._read_page, row, size)
+        return [_to_record(row) for row in rows]
+
+    async def count(self) -> int:
+        """Count the items in the database."""
+        return await self._run(self._count)
+
+    def _select_all(self) -> sqlite3.Cursor:
+        return self._connect().execute(f"SELECT * FROM items {ORDER_BY}")
+
+    def _read_page(self, after: Row | None, size: int) -> list[Row]:
+        """Read the rows that come after a row, in due date order.
+
+        The index seeks straight to the row, so each page is read in a short query
+        of its own whatever its position, and rows written in between pages are
+        neither skipped nor read twice.
+
+        Args:
+            after: The last row of the previous page, or None for the first page.
+            size: How many rows to read, at most.
+        """
+        connection = self._connect()
+        rows: list[Row] = []
+        if after is None or after[2] is not None:
+            key = (FIRST_DATE, FIRST_ID) if after is None else (after[2], after[0])
+            rows = connection.execute(DATED_PAGE, (*key, size)).fetchall()
+        if len(rows) < size:
+            last_id = FIRST_ID if after is None or after[2] is not None else after[0]
+            rows += connection.execute(
+                UNDATED_PAGE, (last_id, size - len(rows))
+            ).fetchall()
+        return rows
+
+    def _count(self) -> int:
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM items").fetchone()
+        return count
+
+    @timed
+    def _execute(self, sql: str, parameters: Iterable[Any]) -> None:
+        connection = self._connect()
+        with connection:
+            connection.execute(sql, tuple(parameters))
+
+    @timed
+    def _execute_many(self, sql: str, rows: list[tuple[Any, ...]]) -> None:
+        """Run a statement for many rows in a single transaction."""
+        connection = self._connect()
+        with connection:
+            connection.executemany(sql, rows)
+
+    def record_added(self, record: TodoRecord) -> None:
+        self._submit(
+            self._execute, "INSERT INTO items VALUES (?, ?, ?)", _to_row(record)
+        )
+
+    def description_changed(self, record: TodoRecord) -> None:
+        self._submit(
+            self._execute,
+            "UPDATE items SET description = ? WHERE id = ?",
+            (record.description, record.id),
+        )
+
+    def due_date_changed(self, record: TodoRecord) -> None:
+        _, _, due_date = _to_row(record)
+        self._submit(
+            self._execute,
+            "UPDATE items SET due_date = ? WHERE id = ?",
+            (due_date, record.id),
+        )
+
+    def record_removed(self, record: TodoRecord) -> None:
+        self._submit(self._execute, "DELETE FROM items WHERE id = ?", (record.id,))
+
+    def records_added(self, records: Iterable[TodoRecord]) -> None:
+        self._submit(
+            self._execute_many,
+            "INSERT INTO items VALUES (?, ?, ?)",
+            [_to_row(record) for record in records],
+        )
+
+    def due_dates_changed(self, records: Iterable[TodoRecord]) -> None:
+        rows = [_to_row(record) for record in records]
+        self._submit(
+            self._execute_many,
+            "UPDATE items SET due_date = ? WHERE id = ?",
+            [(due_date, id_) for id_, _, due_date in rows],
+        )
+
+    def records_removed(self, records: Iterable[TodoRecord]) -> None:
+        self._submit(
+            self._execute_many,
+            "DELETE FROM items WHERE id = ?",
+            [(record.id,) for record in records],
+        )
+
+    async def flush(self) -> None:
+        # Changes are committed one by one, in order, so waiting for the thread
+        # to get through its queue is enough.
+        await self._run(lambda: None)
+
+    async def close(self) -> None:
+        await self._run(self._close)
+        self._executor.shutdown()
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
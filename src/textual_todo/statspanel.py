@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from rich.table import Table
+from textual.widgets import Static
+
+from .instrumentation import profiler
+
+
+class StatsPanel(Static):
+    """Panel, docked to the right, with the timings recorded by the profiler.
+
+    The panel is hidden until it is toggled on and refreshes itself while shown.
+    """
+
+    DEFAULT_CSS = """
+    StatsPanel {
+        dock: right;
+        width: 64;
+        height: 100%;
+        background: $panel;
+        padding: 0 1;
+        display: none;
+    }
+
+    StatsPanel.statspanel--open {
+        display: block;
+    }
+    """
+
+    REFRESH_INTERVAL = 1.0
+    """Seconds between refreshes of the panel while it is shown."""
+
+    @property
+    def is_open(self) -> bool:
+        """Is the panel shown?"""
+        return self.has_class("statspanel--open")
+
+    def on_mount(self) -> None:
+        self.set_interval(self.REFRESH_INTERVAL, self.update_stats)
+
+    def toggle(self) -> None:
+        """Show the panel if it is hidden and hide it otherwise."""
+        self.toggle_class("statspanel--open")
+        self.update_stats()
+
+    def update_stats(self) -> None:
+        """Show the latest timings, if the panel is shown."""
+        if not self.is_open:
+            return
+
+        table = Table("Operation", "Calls", "p50 ms", "p99 ms", box=None, expand=True)
+        for name, timing in profiler.report().items():
+            table.add_row(
+                name,
+                str(timing["calls"]),
+                f"{timing['p50_ms']:.2f}",
+                f"{timing['p99_ms']:.2f}",
+            )
+        self.update(table)
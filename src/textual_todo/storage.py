@@ -0,0 +1,690 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    TypeVar,
+)
+
+from . import jsonfile
+from .instrumentation import timed
+from .jsonfile import iter_json_array, read_json
+from .snapshotfile import (
+    file_digest,
+    read_store_snapshot,
+    snapshot_path,
+    write_store_snapshot,
+)
+from .store import (
+    RecordSnapshot,
+    SnapshotDiff,
+    TodoRecord,
+    TodoStore,
+    data_to_snapshot,
+    format_date,
+    is_sorted_snapshot,
+    parse_date,
+    snapshot_to_data,
+    sort_snapshot,
+)
+
+
+SAVE_DELAY = 0.5
+"""Seconds to wait for more changes before saving the TODO items to disk."""
+COMPACT_THRESHOLD = 1024 * 1024
+"""Journal size, in bytes, past which the journal is compacted into a snapshot."""
+FIRST_CHUNK_SIZE = 64
+"""Records in the first chunk of a progressive load, enough to fill a screen."""
+MAX_CHUNK_SIZE = 4096
+"""Chunks of a progressive load double in size until they reach this many records."""
+
+SnapshotType = TypeVar("SnapshotType")
+ItemType = TypeVar("ItemType")
+Chunk = Tuple[List[TodoRecord], float]
+"""Records read in one go and the fraction of all the data read so far."""
+FileStamp = Tuple[int, int, int]
+"""The inode, modification time, and size of a file, which change when it does."""
+
+# Timed here rather than where it is defined, so that scripts that only read and
+# write the JSON files do not import the instrumentation.
+write_json_atomic = timed(jsonfile.write_json_atomic)
+
+
+def write_snapshot(path: str, snapshot: list[RecordSnapshot]) -> os.stat_result:
+    """Serialize a snapshot of a store and write it atomically to a JSON file.
+
+    Returns:
+        The status of the file written.
+    """
+    return write_json_atomic(path, snapshot_to_data(snapshot))
+
+
+def file_stamp(status: os.stat_result) -> FileStamp:
+    """Get what tells a file apart from other versions of it from its status."""
+    return status.st_ino, status.st_mtime_ns, status.st_size
+
+
+class DebouncedWriter(Generic[SnapshotType]):
+    """Merge bursts of save requests into a single write, done off the event loop.
+
+    Every call to `schedule` restarts a timer.
+    When the timer fires, the data is snapshotted on the event loop, which must be
+    cheap, and then written in a thread.
+    Writes never overlap: changes made while a write is in flight are written
+    as soon as it finishes.
+    """
+
+    delay: float
+    """Seconds to wait after the last request before writing."""
+
+    def __init__(
+        self,
+        snapshot: Callable[[], SnapshotType],
+        write: Callable[[SnapshotType], None],
+        delay: float = 0.5,
+    ) -> None:
+        """Initialise the writer.
+
+        Args:
+            snapshot: Called on the event loop to copy the data to write.
+            write: Called in a thread to write a snapshot.
+            delay: Seconds to wait after the last request before writing.
+        """
+        self._snapshot = snapshot
+        self._write = write
+        self.delay = delay
+        self._dirty = False
+        self._held = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._writing: asyncio.Future[None] | None = None
+
+    @property
+    def pending(self) -> bool:
+        """Are there changes that have not been written yet?"""
+        return self._dirty or (self._writing is not None and not self._writing.done())
+
+    def schedule(self, delay: float | None = None) -> None:
+        """Request a write, after the delay has passed with no further requests.
+
+        Args:
+            delay: Seconds to wait instead of `delay`, like 0 to write right away.
+        """
+        self._dirty = True
+        if self._timer is not None:
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(
+            self.delay if delay is None else delay, self._start_writing
+        )
+
+    def hold(self) -> None:
+        """Stop writing until `release` is called as many times as `hold` was.
+
+        Requests made in the meantime are remembered, but nothing is written, not
+        even by `flush`.
+        """
+        self._held += 1
+
+    def release(self) -> None:
+        """Undo a call to `hold`, writing pending changes if there are no holds left."""
+        self._held -= 1
+        if not self._held and self._dirty:
+            self.schedule()
+
+    async def flush(self) -> None:
+        """Write any pending changes right away and wait for all writes to finish."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._writing is not None and not self._writing.done():
+            await self._writing
+        if self._dirty and not self._held:
+            await self._write_while_dirty()
+
+    def _start_writing(self) -> None:
+        self._timer = None
+        if self._held:
+            return
+        if self._writing is None or self._writing.done():
+            self._writing = asyncio.ensure_future(self._write_while_dirty())
+
+    async def _write_while_dirty(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._dirty:
+            self._dirty = False
+            snapshot = self._snapshot()
+            await loop.run_in_executor(None, self._write, snapshot)
+
+
+def chunk_sizes() -> Iterator[int]:
+    """Sizes of the chunks of a progressive load, small at first so that the first
+    screen shows up quickly and then bigger to keep the overhead low."""
+    size = FIRST_CHUNK_SIZE
+    while True:
+        yield size
+        size = min(2 * size, MAX_CHUNK_SIZE)
+
+
+def chunked(items: Iterable[ItemType]) -> Iterator[list[ItemType]]:
+    """Split items into lists with the sizes given by `chunk_sizes`."""
+    iterator = iter(items)
+    for size in chunk_sizes():
+        chunk = [item for _, item in zip(range(size), iterator)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def counted_chunks(records: Iterable[TodoRecord], count: int) -> Iterator[Chunk]:
+    """Split records, of which there are `count`, into chunks for a progressive load."""
+    read = 0
+    for chunk in chunked(records):
+        read += len(chunk)
+        yield chunk, min(1.0, read / max(1, count))
+
+
+class Storage(ABC):
+    """Keeps the TODO items between sessions.
+
+    The app loads its store with `load` and then tells the storage about every
+    change it makes to the store, so that each kind of storage can persist the
+    changes in the way that suits it best.
+    Each kind of storage must implement `read` and the methods that persist a
+    single change; the others have defaults built on those.
+    """
+
+    store: TodoStore
+    """The store that was loaded and whose changes are being persisted."""
+    loaded: bool
+    """Whether all the TODO items have been loaded into the store."""
+
+    def __init__(self) -> None:
+        self.store = TodoStore()
+        self.loaded = False
+
+    @abstractmethod
+    def read(self) -> TodoStore:
+        """Read all the TODO items into a new store. Blocks."""
+
+    def read_chunks(self) -> Iterator[Chunk]:
+        """Read the TODO items a chunk at a time. Blocks.
+
+        Storages that can parse their data incrementally override this, so that
+        the first items can be shown before the rest is read.
+        """
+        yield list(self.read()), 1.0
+
+    def load(self) -> TodoStore:
+        """Load the TODO items. Blocks, so consider calling it in a thread."""
+        self.store = self.read()
+        self.loaded = True
+        return self.store
+
+    async def load_chunks(self) -> AsyncIterator[Chunk]:
+        """Read the TODO items a chunk at a time, in a thread.
+
+        The next chunk is read while the caller handles the current one.
+        The records are not added to `store`; that is up to the caller, which
+        must add every chunk before asking for the next one.
+        """
+        loop = asyncio.get_running_loop()
+        chunks = self.read_chunks()
+        next_chunk: asyncio.Future[Chunk | None]
+        next_chunk = loop.run_in_executor(None, next, chunks, None)
+        while True:
+            chunk = await next_chunk
+            if chunk is None:
+                break
+            next_chunk = loop.run_in_executor(None, next, chunks, None)
+            yield chunk
+        self.loaded = True
+
+    @abstractmethod
+    def record_added(self, record: TodoRecord) -> None:
+        """Persist a record that was added to the store."""
+
+    @abstractmethod
+    def description_changed(self, record: TodoRecord) -> None:
+        """Persist the new description of a record."""
+
+    @abstractmethod
+    def due_date_changed(self, record: TodoRecord) -> None:
+        """Persist the new due date of a record."""
+
+    @abstractmethod
+    def record_removed(self, record: TodoRecord) -> None:
+        """Persist the removal of a record from the store."""
+
+    def records_added(self, records: Iterable[TodoRecord]) -> None:
+        """Persist many records that were added to the store at once.
+
+        Storages that can save many changes together override this and the
+        other batch methods, which otherwise persist the records one by one.
+        """
+        for record in records:
+            self.record_added(record)
+
+    def due_dates_changed(self, records: Iterable[TodoRecord]) -> None:
+        """Persist the new due dates of many records at once."""
+        for record in records:
+            self.due_date_changed(record)
+
+    def records_removed(self, records: Iterable[TodoRecord]) -> None:
+        """Persist the removal of many records from the store at once."""
+        for record in records:
+            self.record_removed(record)
+
+    @asynccontextmanager
+    async def external_changes(self) -> AsyncIterator[SnapshotDiff | None]:
+        """Find the changes other processes made to the TODO items.
+
+        Nothing is saved until the block exits, so that the changes can be applied
+        to `store` before it is saved over them.
+        Storages that other processes do not change, or that cannot tell what
+        they changed, find none.
+
+        Yields:
+            What changed since the items were last read or saved, or None if
+            nothing did.
+        """
+        yield None
+
+    async def flush(self) -> None:
+        """Wait until all changes so far are on disk."""
+
+    async def close(self) -> None:
+        """Flush all changes and release any resources held."""
+        await self.flush()
+
+
+class JsonStorage(Storage):
+    """Keeps the TODO items in a JSON file that is rewritten after every change.
+
+    Bursts of changes are merged into a single write, see `DebouncedWriter`.
+
+    Other processes may rewrite the file too.
+    The storage remembers what it last read from or wrote to the file, so it can
+    tell what they changed from the items alone, by id, and only needs to look
+    at the status of the file to know whether to read it again.
+    """
+
+    path: str
+    """The path to the JSON file."""
+
+    def __init__(self, path: str, delay: float = SAVE_DELAY) -> None:
+        """Initialise the storage.
+
+        Args:
+            path: The path to the JSON file.
+            delay: Seconds to wait for more changes before saving.
+        """
+        super().__init__()
+        self.path = path
+        self._writer = DebouncedWriter(
+            lambda: self.store.snapshot(), self._write, delay
+        )
+        self._lock = threading.Lock()
+        self._synced: list[RecordSnapshot] = []
+        self._stamp: FileStamp | None = None
+        self._synced_ids = True
+        self._loaded_sorted = True
+
+    def read(self) -> TodoStore:
+        try:
+            f = open(self.path, "r")
+        except FileNotFoundError:
+            return TodoStore()
+        with f:
+            stamp = file_stamp(os.fstat(f.fileno()))
+            data = json.load(f)
+        with self._lock:
+            self._set_synced(data_to_snapshot(data), stamp)
+        return TodoStore.from_data(data)
+
+    def read_chunks(self) -> Iterator[Chunk]:
+        # The snapshot written on close has the records in order, with their dates
+        # parsed, so it is read instead of the file unless the file changed since.
+        snapshot = read_store_snapshot(snapshot_path(self.path), self.path)
+        if snapshot is not None:
+            records, count, status = snapshot
+            yield from self._remember_synced(counted_chunks(records, count), status)
+            return
+        try:
+            f = open(self.path, "r")
+        except FileNotFoundError:
+            return
+        with f:
+            status = os.fstat(f.fileno())
+            yield from self._remember_synced(
+                self._parse_chunks(f, status.st_size), status
+            )
+
+    def _parse_chunks(self, f: IO[str], size: int) -> Iterator[Chunk]:
+        """Parse the JSON file a chunk at a time."""
+        for chunk in chunked(iter_json_array(f)):
+            records = [
+                TodoRecord(
+                    item["description"], parse_date(item["date"]), id=item.get("id")
+                )
+                for item, _ in chunk
+            ]
+            _, consumed = chunk[-1]
+            yield records, min(1.0, consumed / max(1, size))
+
+    def _remember_synced(
+        self, chunks: Iterable[Chunk], status: os.stat_result
+    ) -> Iterator[Chunk]:
+        """Pass on the chunks read from the file, remembering what the file had."""
+        synced: list[RecordSnapshot] = []
+        for records, progress in chunks:
+            # Copied before the caller gets to change the records.
+            synced.extend(
+                (record.id, record.description, record.due_date) for record in records
+            )
+            yield records, progress
+        with self._lock:
+            self._set_synced(synced, file_stamp(status))
+            self._loaded_sorted = is_sorted_snapshot(synced)
+
+    def _write(self, snapshot: list[RecordSnapshot]) -> None:
+        with self._lock:
+            status = write_snapshot(self.path, snapshot)
+            self._set_synced(snapshot, file_stamp(status))
+
+    def _set_synced(self, snapshot: list[RecordSnapshot], stamp: FileStamp) -> None:
+        """Remember what the file has, as of the given stamp. Needs the lock."""
+        self._synced, self._stamp = snapshot, stamp
+        self._synced_ids = all(id_ is not None for id_, _, _ in snapshot)
+
+    @asynccontextmanager
+    async def external_changes(self) -> AsyncIterator[SnapshotDiff | None]:
+        self._writer.hold()
+        try:
+            loop = asyncio.get_running_loop()
+            yield await loop.run_in_executor(None, self._read_changes)
+        finally:
+            self._writer.release()
+
+    @timed
+    def _read_changes(self) -> SnapshotDiff | None:
+        """Read the file again if another process replaced it. Blocks.
+
+        Returns:
+            What changed since the file was last read or written, if anything.
+        """
+        with self._lock:
+            try:
+                f = open(self.path, "r")
+            except FileNotFoundError:
+                return None
+            with f:
+                stamp = file_stamp(os.fstat(f.fileno()))
+                if stamp == self._stamp:
+                    return None
+                try:
+                    snapshot = data_to_snapshot(json.load(f))
+                except ValueError:
+                    # Caught halfway through a write that is not atomic, so the
+                    # file is read again on the next call.
+                    return None
+            if self._synced_ids:
+                diff = SnapshotDiff(self._synced, snapshot)
+            else:
+                # Items from a file written before items had ids cannot be told
+                # apart, until the ids given on load are saved, so all of them
+                # are read again.
+                diff = SnapshotDiff.reload_all(snapshot)
+            self._set_synced(snapshot, stamp)
+            return diff or None
+
+    async def load_chunks(self) -> AsyncIterator[Chunk]:
+        # Saving a store that is only partly loaded would lose the rest of the
+        # items, so changes made in the meantime are saved once loading is done.
+        self._writer.hold()
+        try:
+            async for chunk in super().load_chunks():
+                yield chunk
+        finally:
+            self._writer.release()
+        with self._lock:
+            needs_write = not self._synced_ids or not self._loaded_sorted
+        if needs_write:
+            # The file has items with no ids, which were given some on load, so
+            # the ids are saved right away, for changes other processes save to
+            # be matched by id rather than read again in full.
+            # The file is also saved right away if its items were out of order,
+            # as they are then shown in the order they are read and only settle
+            # as later chunks come in; once saved, they load in order.
+            self._writer.schedule(delay=0)
+
+    def record_added(self, record: TodoRecord) -> None:
+        self._writer.schedule()
+
+    def description_changed(self, record: TodoRecord) -> None:
+        self._writer.schedule()
+
+    def due_date_changed(self, record: TodoRecord) -> None:
+        self._writer.schedule()
+
+    def record_removed(self, record: TodoRecord) -> None:
+        self._writer.schedule()
+
+    def records_added(self, records: Iterable[TodoRecord]) -> None:
+        self._writer.schedule()
+
+    def due_dates_changed(self, records: Iterable[TodoRecord]) -> None:
+        self._writer.schedule()
+
+    def records_removed(self, records: Iterable[TodoRecord]) -> None:
+        self._writer.schedule()
+
+    async def flush(self) -> None:
+        await self._writer.flush()
+
+    async def close(self) -> None:
+        await super().close()
+        if self.loaded and not self._writer.pending:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._write_store_snapshot)
+
+    @timed
+    def _write_store_snapshot(self) -> None:
+        """Write a snapshot of the file, to be read instead of it on the next load.
+
+        Nothing is written if the file changed since it was last read or written,
+        as it is not known what it has then.
+        """
+        with self._lock:
+            try:
+                digest, status = file_digest(self.path)
+            except FileNotFoundError:
+                return
+            if file_stamp(status) == self._stamp:
+                # What was read from the file may not be in order, if another
+                # program wrote it.
+                write_store_snapshot(
+                    snapshot_path(self.path),
+                    sort_snapshot(self._synced),
+                    digest,
+                    status,
+                )
+
+
+class JournalStorage(Storage):
+    """Keeps the TODO items in a JSON snapshot plus an append-only journal.
+
+    Every change is appended to the journal as a single JSON line, so the cost of
+    a change does not depend on the number of items.
+    Loading replays the journal on top of the snapshot.
+    Once the journal grows past a threshold, it is compacted in the background:
+    a new snapshot is written and the journal starts over.
+
+    All file operations run in a single background thread, in the order they were
+    requested, so a compaction sees exactly the changes made before it.
+    """
+
+    path: str
+    """The path to the JSON snapshot."""
+    journal_path: str
+    """The path to the journal."""
+    compact_threshold: int
+    """Journal size, in bytes, past which the journal is compacted."""
+
+    def __init__(self, path: str, compact_threshold: int = COMPACT_THRESHOLD) -> None:
+        """Initialise the storage.
+
+        Args:
+            path: The path to the JSON snapshot.
+                The journal is kept next to it, with a `.journal` suffix.
+            compact_threshold: Journal size, in bytes, past which it is compacted.
+        """
+        super().__init__()
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_threshold = compact_threshold
+        self._journal: IO[str] | None = None
+        self._journal_size = 0
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def read(self) -> TodoStore:
+        store = TodoStore.from_data(read_json(self.path))
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A write was cut short, so nothing after it is reliable.
+                        break
+                    self._replay(store, entry)
+            self._journal_size = os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            pass
+        return store
+
+    @staticmethod
+    def _replay(store: TodoStore, entry: dict[str, Any]) -> None:
+        """Apply a journal entry to a store."""
+        op = entry["op"]
+        existing = store.get(entry["id"])
+        if op == "add" and existing is None:
+            record = TodoRecord(
+                entry["description"], parse_date(entry["date"]), id=entry["id"]
+            )
+            store.add(record)
+            return
+
+        # Entries may already be in the snapshot if the app stopped during a
+        # compaction, so replaying must be idempotent.
+        if existing is None:
+            return
+        if op == "add":
+            existing.description = entry["description"]
+            existing.due_date = parse_date(entry["date"])
+            store.update(existing)
+        elif op == "edit":
+            existing.description = entry["description"]
+        elif op == "date":
+            existing.due_date = parse_date(entry["date"])
+            store.update(existing)
+        elif op == "remove":
+            store.remove(existing)
+
+    @staticmethod
+    def _added_entry(record: TodoRecord) -> dict[str, Any]:
+        return {
+            "op": "add",
+            "id": record.id,
+            "description": record.description,
+            "date": format_date(record.due_date),
+        }
+
+    @staticmethod
+    def _date_entry(record: TodoRecord) -> dict[str, Any]:
+        return {"op": "date", "id": record.id, "date": format_date(record.due_date)}
+
+    def record_added(self, record: TodoRecord) -> None:
+        self._append(self._added_entry(record))
+
+    def description_changed(self, record: TodoRecord) -> None:
+        self._append({"op": "edit", "id": record.id, "description": record.description})
+
+    def due_date_changed(self, record: TodoRecord) -> None:
+        self._append(self._date_entry(record))
+
+    def record_removed(self, record: TodoRecord) -> None:
+        self._append({"op": "remove", "id": record.id})
+
+    def records_added(self, records: Iterable[TodoRecord]) -> None:
+        self._append(*map(self._added_entry, records))
+
+    def due_dates_changed(self, records: Iterable[TodoRecord]) -> None:
+        self._append(*map(self._date_entry, records))
+
+    def records_removed(self, records: Iterable[TodoRecord]) -> None:
+        self._append(*({"op": "remove", "id": record.id} for record in records))
+
+    def _append(self, *entries: dict[str, Any]) -> None:
+        """Append entries to the journal and compact it if it grew too much.
+
+        All the entries are written at once, with a single flush.
+        """
+        if not entries:
+            return
+        lines = "".join(json.dumps(entry) + "\n" for entry in entries)
+        self._executor.submit(self._write_lines, lines)
+        self._journal_size += len(lines.encode("utf-8"))
+        # A compaction must not write a snapshot of a store that is only partly
+        # loaded, so it waits for the next change after loading is done.
+        if self._journal_size > self.compact_threshold and self.loaded:
+            self._journal_size = 0
+            self._executor.submit(self._compact, self.store.snapshot())
+
+    @timed
+    def _write_lines(self, lines: str) -> None:
+        if self._journal is None:
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write(lines)
+        self._journal.flush()
+
+    @timed
+    def _compact(self, snapshot: list[RecordSnapshot]) -> None:
+        """Write a new snapshot and start the journal over."""
+        write_snapshot(self.path, snapshot)
+        assert self._journal is not None
+        self._journal.close()
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+
+    def _sync(self) -> None:
+        if self._journal is not None:
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+
+    async def flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._sync)
+
+    async def close(self) -> None:
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close_journal)
+        self._executor.shutdown()
+
+    def _close_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
@@ -0,0 +1,525 @@
+from __future__ import annotations
+
+import datetime as dt
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import count
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    overload,
+)
+
+
+DATE_FORMAT = "%d-%m-%Y"
+"""Format of the date strings the app reads, writes, and shows."""
+DATE_CACHE_SIZE = 4096
+"""How many date strings `parse_date` remembers the result for."""
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(value: str) -> dt.date | None:
+    """Parse a date string in the app's format.
+
+    Zero-padded dates, which is how the app writes them, are parsed by slicing
+    the string, which is much faster than `strptime`.
+    Results are cached, including None for empty or invalid strings.
+
+    Args:
+        value: The string to parse.
+
+    Returns:
+        The date represented by the string or None if it is not a valid date.
+    """
+    if (
+        len(value) == 10
+        and value[2] == value[5] == "-"
+        and value[:2].isdigit()
+        and value[3:5].isdigit()
+        and value[6:].isdigit()
+    ):
+        try:
+            return dt.date(int(value[6:]), int(value[3:5]), int(value[:2]))
+        except ValueError:
+            return None
+    try:
+        return dt.datetime.strptime(value, DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def format_date(date: dt.date | None) -> str:
+    """Format a date in the app's format, or return an empty string for no date."""
+    return "" if date is None else date.strftime(DATE_FORMAT)
+
+
+class TodoRecord:
+    """Compact data for a single TODO item, independent of any widget."""
+
+    __slots__ = ("id", "description", "due_date", "collapsed")
+
+    id: int | None
+    """Stable identifier of the item, assigned by the store it is added to."""
+    description: str
+    """The description of the TODO item."""
+    due_date: dt.date | None
+    """Date the item is due by, or None if not set."""
+    collapsed: bool
+    """Whether the TODO item is shown collapsed."""
+
+    def __init__(
+        self,
+        description: str = "",
+        due_date: dt.date | None = None,
+        collapsed: bool = False,
+        id: int | None = None,
+    ) -> None:
+        self.id = id
+        self.description = description
+        self.due_date = due_date
+        self.collapsed = collapsed
+
+    def __repr__(self) -> str:
+        return f"TodoRecord({self.description!r}, {self.due_date!r}, id={self.id!r})"
+
+
+SUBSET_SCAN_RATIO = 16
+"""Subsets at least this fraction of an index are picked out by scanning it."""
+
+SortKey = Tuple[bool, dt.date, int]
+"""Key that orders records by due date, with undated records last.
+
+The last element is an insertion sequence number that keeps ties stable.
+"""
+
+
+class DueDateIndex(Sequence[TodoRecord]):
+    """Records kept in due date order, with undated records last.
+
+    Positions are found by binary search over the sort keys, so looking up where
+    a record is, or where it should go, takes logarithmic time.
+    Records that are due on the same date keep the order they were added in.
+    """
+
+    _keys: list[SortKey]
+    """The sort keys of all records, in order."""
+    _records: list[TodoRecord]
+    """All records, in the same order as their keys."""
+    _key_of: dict[TodoRecord, SortKey]
+    """The key each record is currently stored under."""
+
+    def __init__(self, records: Iterable[TodoRecord] = ()) -> None:
+        self._seq = count()
+        self._key_of = {record: self._make_key(record) for record in records}
+        pairs = sorted(self._key_of.items(), key=lambda pair: pair[1])
+        self._records = [record for record, _ in pairs]
+        self._keys = [key for _, key in pairs]
+
+    def _make_key(self, record: TodoRecord, seq: int | None = None) -> SortKey:
+        date = record.due_date
+        if seq is None:
+            seq = next(self._seq)
+        if date is None:
+            return (True, dt.date.min, seq)
+        return (False, date, seq)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @overload
+    def __getitem__(self, index: int) -> TodoRecord:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[TodoRecord]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> TodoRecord | list[TodoRecord]:
+        return self._records[index]
+
+    def __iter__(self) -> Iterator[TodoRecord]:
+        return iter(self._records)
+
+    def __contains__(self, record: object) -> bool:
+        return record in self._key_of
+
+    def position(self, record: TodoRecord) -> int:
+        """Find the position of a record in the index."""
+        return bisect_left(self._keys, self._key_of[record])
+
+    def subset(self, records: AbstractSet[TodoRecord]) -> DueDateIndex:
+        """Create an index of some of the records, in the same order.
+
+        Large subsets are picked out by scanning the index, which is in order
+        already, and small ones are sorted by their keys, so the cost is never
+        much more than proportional to the size of the subset.
+        Both indexes draw sequence numbers from the same counter, so records
+        added to either later on still sort after the existing ones.
+        """
+        if len(records) * SUBSET_SCAN_RATIO >= len(self._records):
+            pairs = [
+                (record, key)
+                for record, key in zip(self._records, self._keys)
+                if record in records
+            ]
+        else:
+            key_of = self._key_of
+            pairs = sorted(
+                ((record, key_of[record]) for record in records),
+                key=lambda pair: pair[1],
+            )
+
+        index = DueDateIndex()
+        index._seq = self._seq
+        index._records = [record for record, _ in pairs]
+        index._keys = [key for _, key in pairs]
+        index._key_of = dict(pairs)
+        return index
+
+    def insert(self, record: TodoRecord) -> int:
+        """Add a record to the index.
+
+        Returns:
+            The position the record was inserted at.
+        """
+        key = self._key_of[record] = self._make_key(record)
+        position = bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._records.insert(position, record)
+        return position
+
+    def extend(self, records: Iterable[TodoRecord]) -> None:
+        """Add many records to the index at once.
+
+        This sorts the index once instead of inserting the records one by one,
+        which is much faster when there are many records to add.
+        Records that come in order and after all the others, as they do when
+        loading a list that was saved in order, are appended without sorting.
+        """
+        new_records = list(records)
+        new_keys = [self._make_key(record) for record in new_records]
+        self._key_of.update(zip(new_records, new_keys))
+        if (not self._keys or not new_keys or self._keys[-1] < new_keys[0]) and all(
+            key < next_key for key, next_key in zip(new_keys, new_keys[1:])
+        ):
+            self._records.extend(new_records)
+            self._keys.extend(new_keys)
+            return
+
+        pairs = list(zip(self._records, self._keys))
+        pairs.extend(zip(new_records, new_keys))
+        pairs.sort(key=lambda pair: pair[1])
+        self._records = [record for record, _ in pairs]
+        self._keys = [key for _, key in pairs]
+
+    def remove(self, record: TodoRecord) -> int:
+        """Remove a record from the index.
+
+        Returns:
+            The position the record was at.
+        """
+        position = self.position(record)
+        del self._keys[position]
+        del self._records[position]
+        del self._key_of[record]
+        return position
+
+    def update(self, record: TodoRecord) -> tuple[int, int]:
+        """Move a record whose due date changed to its new position.
+
+        The record keeps its insertion sequence number, so its order relative to
+        other records due on the same date does not depend on how often its date
+        was changed.
+
+        Returns:
+            The old and the new positions of the record.
+        """
+        old_key = self._key_of[record]
+        old_position = bisect_left(self._keys, old_key)
+        new_key = self._make_key(record, old_key[2])
+        if new_key == old_key:
+            return old_position, old_position
+
+        del self._keys[old_position]
+        del self._records[old_position]
+        self._key_of[record] = new_key
+        new_position = bisect_left(self._keys, new_key)
+        self._keys.insert(new_position, new_key)
+        self._records.insert(new_position, record)
+        return old_position, new_position
+
+    def remove_many(self, records: AbstractSet[TodoRecord]) -> None:
+        """Remove many records from the index at once, skipping any not in it.
+
+        The index is filtered in a single pass instead of removing the records
+        one by one, each of which would shift all the records after it.
+        """
+        key_of = self._key_of
+        for record in records:
+            key_of.pop(record, None)
+        pairs = [
+            (record, key)
+            for record, key in zip(self._records, self._keys)
+            if record in key_of
+        ]
+        self._records = [record for record, _ in pairs]
+        self._keys = [key for _, key in pairs]
+
+    def update_many(self, records: Iterable[TodoRecord]) -> None:
+        """Move many records whose due dates changed to their new positions at once.
+
+        Like with `update`, the records keep their insertion sequence numbers.
+        The index is sorted once, starting from its current order, which the
+        sort takes advantage of, instead of moving the records one by one.
+        Records not in the index are skipped.
+        """
+        key_of = self._key_of
+        for record in records:
+            key = key_of.get(record)
+            if key is not None:
+                key_of[record] = self._make_key(record, key[2])
+        pairs = [(record, key_of[record]) for record in self._records]
+        pairs.sort(key=lambda pair: pair[1])
+        self._records = [record for record, _ in pairs]
+        self._keys = [key for _, key in pairs]
+
+    def bisect_date(self, date: dt.date | None) -> int:
+        """Find the position of the first record due on or after the given date.
+
+        Args:
+            date: The date to look for, or None to find the first undated record.
+        """
+        if date is None:
+            return bisect_left(self._keys, (True, dt.date.min, -1))
+        return bisect_left(self._keys, (False, date, -1))
+
+
+TodoData = List[Dict[str, Any]]
+"""The JSON representation of a list of TODO items."""
+RecordSnapshot = Tuple[Optional[int], str, Optional[dt.date]]
+"""An immutable copy of the id, description, and due date of a record."""
+
+
+def snapshot_to_data(snapshot: Iterable[RecordSnapshot]) -> TodoData:
+    """Create the JSON representation of a snapshot of a store."""
+    return [
+        {"id": id_, "description": description, "date": format_date(due_date)}
+        for id_, description, due_date in snapshot
+    ]
+
+
+def data_to_snapshot(data: TodoData) -> list[RecordSnapshot]:
+    """Create a snapshot from the JSON representation of the items."""
+    return [
+        (item.get("id"), item["description"], parse_date(item["date"])) for item in data
+    ]
+
+
+def _snapshot_key(record: RecordSnapshot) -> tuple[bool, dt.date]:
+    return (record[2] is None, record[2] or dt.date.min)
+
+
+def sort_snapshot(snapshot: Iterable[RecordSnapshot]) -> list[RecordSnapshot]:
+    """Sort a snapshot in the order a store created from it keeps its records."""
+    return sorted(snapshot, key=_snapshot_key)
+
+
+def is_sorted_snapshot(snapshot: list[RecordSnapshot]) -> bool:
+    """Check whether a snapshot is in the order a store keeps its records in."""
+    keys = [_snapshot_key(record) for record in snapshot]
+    return all(key <= next_key for key, next_key in zip(keys, keys[1:]))
+
+
+class SnapshotDiff:
+    """What changed between two snapshots of a store, matching records by id.
+
+    Records with no id cannot be matched, so they are left out.
+    When the old snapshot has records with no id, use `reload_all` instead.
+    """
+
+    added: list[tuple[int, str, dt.date | None]]
+    """The records only in the new snapshot."""
+    removed: list[int]
+    """The ids of the records only in the old snapshot."""
+    changed: list[tuple[int, str, dt.date | None]]
+    """The new data of the records whose description or due date changed."""
+    reload: list[RecordSnapshot] | None = None
+    """The whole new snapshot, if the records must all be read again because
+    they cannot be matched, in which case nothing is added, removed, or changed."""
+
+    def __init__(
+        self, old: Iterable[RecordSnapshot], new: Iterable[RecordSnapshot]
+    ) -> None:
+        old_by_id: dict[int, RecordSnapshot] = {}
+        for snapshot in old:
+            if snapshot[0] is not None:
+                old_by_id[snapshot[0]] = snapshot
+        self.added = []
+        self.changed = []
+        for id_, description, due_date in new:
+            if id_ is None:
+                continue
+            old_snapshot = old_by_id.pop(id_, None)
+            if old_snapshot is None:
+                self.added.append((id_, description, due_date))
+            elif old_snapshot != (id_, description, due_date):
+                self.changed.append((id_, description, due_date))
+        self.removed = list(old_by_id)
+
+    @classmethod
+    def reload_all(cls, new: list[RecordSnapshot]) -> SnapshotDiff:
+        """Create a diff that replaces all the records with those of a snapshot."""
+        diff = cls((), ())
+        diff.reload = new
+        return diff
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.reload is not None or self.added or self.removed or self.changed
+        )
+
+
+class TodoStore(Sequence[TodoRecord]):
+    """All the TODO records of a list, in due date order.
+
+    The store is the source of truth for the data of the app: saving, sorting,
+    and querying work on the store alone and never look at the widgets.
+    Records that are edited in place must be passed to `update` if their due
+    date changed, so that they are moved to their new position.
+    """
+
+    _index: DueDateIndex
+    """The records, in due date order."""
+    _by_id: dict[int, TodoRecord]
+    """The records, by id."""
+    _next_id: int
+    """The id to give the next record that needs one."""
+
+    def __init__(self, records: Iterable[TodoRecord] = ()) -> None:
+        self._by_id = {}
+        self._next_id = 0
+        records = list(records)
+        for record in records:
+            self._assign_id(record)
+        self._index = DueDateIndex(records)
+
+    @classmethod
+    def from_data(cls, data: TodoData) -> TodoStore:
+        """Create a store from the JSON representation of the items."""
+        return cls(
+            TodoRecord(item["description"], parse_date(item["date"]), id=item.get("id"))
+            for item in data
+        )
+
+    def to_data(self) -> TodoData:
+        """Create the JSON representation of the items, in due date order."""
+        return snapshot_to_data(self.snapshot())
+
+    def snapshot(self) -> list[RecordSnapshot]:
+        """Copy the data of all records, in due date order.
+
+        This is cheaper than `to_data` and the result can be safely handed to
+        another thread while the store keeps changing.
+        """
+        return [
+            (record.id, record.description, record.due_date) for record in self._index
+        ]
+
+    def _assign_id(self, record: TodoRecord) -> None:
+        """Make sure the record has an id that no other record in the store has."""
+        if record.id is None or record.id in self._by_id:
+            record.id = self._next_id
+        self._next_id = max(self._next_id, record.id + 1)
+        self._by_id[record.id] = record
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @overload
+    def __getitem__(self, index: int) -> TodoRecord:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[TodoRecord]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> TodoRecord | list[TodoRecord]:
+        return self._index[index]
+
+    def __iter__(self) -> Iterator[TodoRecord]:
+        return iter(self._index)
+
+    def __contains__(self, record: object) -> bool:
+        return record in self._index
+
+    def get(self, record_id: int) -> TodoRecord | None:
+        """Get the record with the given id, if there is one."""
+        return self._by_id.get(record_id)
+
+    def position(self, record: TodoRecord) -> int:
+        """Find the position of a record in due date order."""
+        return self._index.position(record)
+
+    def bisect_date(self, date: dt.date | None) -> int:
+        """Find the position of the first record due on or after the given date."""
+        return self._index.bisect_date(date)
+
+    def subset(self, records: AbstractSet[TodoRecord]) -> DueDateIndex:
+        """Create an index of some records of the store, in the same order.
+
+        Records due on the same date keep the order they have in the store.
+        """
+        return self._index.subset(records)
+
+    def add(self, record: TodoRecord) -> int:
+        """Add a record to the store, giving it an id if needed.
+
+        Returns:
+            The position of the record in due date order.
+        """
+        self._assign_id(record)
+        return self._index.insert(record)
+
+    def extend(self, records: Iterable[TodoRecord]) -> None:
+        """Add many records to the store at once, giving them ids if needed."""
+        records = list(records)
+        for record in records:
+            self._assign_id(record)
+        self._index.extend(records)
+
+    def remove(self, record: TodoRecord) -> int:
+        """Remove a record from the store.
+
+        Returns:
+            The position the record was at.
+        """
+        assert record.id is not None
+        del self._by_id[record.id]
+        return self._index.remove(record)
+
+    def update(self, record: TodoRecord) -> tuple[int, int]:
+        """Move a record whose due date changed to its new position.
+
+        Returns:
+            The old and the new positions of the record.
+        """
+        return self._index.update(record)
+
+    def remove_many(self, records: AbstractSet[TodoRecord]) -> None:
+        """Remove many records from the store at once, in a single pass."""
+        for record in records:
+            if record in self._index:
+                assert record.id is not None
+                del self._by_id[record.id]
+        self._index.remove_many(records)
+
+    def update_many(self, records: Iterable[TodoRecord]) -> None:
+        """Move many records whose due dates changed, sorting the store once."""
+        self._index.update_many(records)
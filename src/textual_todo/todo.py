@@ -1,121 +1,855 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import datetime as dt
+import os
+from collections import OrderedDict
+from typing import AbstractSet, Callable, Sequence
 
+from rich.text import Text
 from textual.app import App, ComposeResult
-from textual.containers import Vertical
-from textual.widgets import Footer
-
-from .editabletext import EditableText
+from textual.binding import Binding
+from textual.widgets import ContentSwitcher, Input, Tab, Tabs
+
+from .archive import ArchivedItem
+from .archivescreen import ArchiveScreen
+from .bulkbar import BulkBar
+from .footer import TodoFooter
+from .instrumentation import (
+    DEFAULT_OUTPUT,
+    PROFILE_OUTPUT_ENV,
+    profiler,
+    timed,
+)
+from .lists import DEFAULT_LIST, MAX_OPEN_LISTS, OpenList, list_path
+from .search import tokenize
+from .searchbar import SearchBar
+from .statspanel import StatsPanel
+from .sqlitestorage import SqliteStorage, WindowKey, window_key
+from .storage import JsonStorage, Storage, chunk_sizes
+from .store import RecordSnapshot, SnapshotDiff, TodoRecord, TodoStore
 from .todoitem import TodoItem
+from .todolist import TodoList
+from .undo import MAX_BYTES, MAX_ENTRIES, Change, UndoLog
 
 
-DATA_FILE = "items.json"
+DATA_FILE = list_path(DEFAULT_LIST)
+SYNC_INTERVAL = 1.0
+"""Seconds between checks for changes that other processes saved to the lists."""
 
 
 class TODOApp(App[None]):
     """A simple and elegant TODO app built with Textual."""
 
+    CSS = """
+    Screen {
+        layers: default editor;
+    }
+    """
+
     BINDINGS = [
         ("n", "new_todo", "New"),
         ("c", "collapse_all", "Collapse all"),
         ("e", "expand_all", "Expand all"),
+        ("slash", "search", "Search"),
+        ("a", "archive", "Archive"),
+        ("u", "undo", "Undo"),
+        ("ctrl+r", "redo", "Redo"),
+        ("x", "toggle_selected", "Select"),
+        Binding("shift+down", "extend_selection(1)", "Select down", show=False),
+        Binding("shift+up", "extend_selection(-1)", "Select up", show=False),
+        Binding("ctrl+a", "select_all", "Select all", show=False),
+        Binding("escape", "clear_selection", "Clear selection", show=False),
+        ("b", "bulk", "Bulk"),
     ]
 
-    _todo_container: Vertical
-    """Container for all the TODO items that are due."""
+    _list_names: list[str]
+    """The names of all the lists, in the order of their tabs."""
+    _open_lists: OrderedDict[int, OpenList]
+    """The lists that are open, by index, from the least recently shown."""
+    _current: OpenList
+    """The list being shown."""
+    _current_index: int | None = None
+    """The index of the list being shown, or None before the first is shown."""
+    _make_storage: Callable[[str], Storage]
+    """Creates the storage of a list, given its name."""
+    _max_open_lists: int
+    """How many lists are kept open at most."""
+    _undo_entries: int
+    """How many changes to each list are remembered, to undo or redo."""
+    _undo_bytes: int
+    """Roughly how much memory the changes to each list may take."""
+    _virtual: bool
+    """Whether to virtualize the lists."""
+    _tabs: Tabs
+    """Tabs to switch between the lists, hidden if there is a single list."""
+    _switcher: ContentSwitcher
+    """Shows the container of the current list."""
+    _search_bar: SearchBar
+    """Input the TODO items are filtered by."""
+    _search_terms: set[str]
+    """The words of the search query the TODO items are filtered by."""
+    _bulk_bar: BulkBar
+    """Input to apply an action to all the selected TODO items."""
+    _footer: TodoFooter
+    """Shows the key bindings and the loading progress."""
+    _stats_panel: StatsPanel
+    """Shows the timings of the hot paths, when profiling."""
+    _today: dt.date
+    """The day the due status of the TODO items was last computed for."""
+    _syncing: asyncio.Future[None] | None = None
+    """Applies the changes other processes saved to the open lists, if any."""
+
+    def __init__(
+        self,
+        *args,
+        lists: Sequence[str] = (DEFAULT_LIST,),
+        virtual: bool = True,
+        storage: Storage | Callable[[str], Storage] | None = None,
+        max_open_lists: int = MAX_OPEN_LISTS,
+        undo_entries: int = MAX_ENTRIES,
+        undo_bytes: int = MAX_BYTES,
+        profile: bool | None = None,
+        **kwargs,
+    ) -> None:
+        """Initialise the app.
+
+        Args:
+            lists: The names of the lists to show, each in its own tab.
+            virtual: Whether to mount only the TODO items that are visible, which
+                is quicker than mounting all of them from a few dozen items on.
+            storage: Where to keep the TODO items: a storage, if there is a single
+                list, or a function that creates the storage of a list from its
+                name. Defaults to a JSON file per list in the current directory,
+                see `list_path`.
+            max_open_lists: How many lists are kept open at most. Opening another
+                list closes the one shown least recently.
+            undo_entries: How many changes to each list are remembered, to undo
+                or redo, counting those undone.
+            undo_bytes: Roughly how much memory, in bytes, the changes remembered
+                for each list may take.
+            profile: Whether to time the hot paths of the app, show the timings
+                in a panel, and dump them to a file on exit.
+                None profiles if the `TODO_PROFILE` environment variable is set.
+        """
+        if not lists:
+            raise ValueError("The app needs at least one list.")
+        self._list_names = list(lists)
+        if storage is None:
+            self._make_storage = lambda name: JsonStorage(list_path(name))
+        elif isinstance(storage, Storage):
+            if len(self._list_names) > 1:
+                raise ValueError("A single storage cannot keep several lists.")
+            only_storage = storage
+            self._make_storage = lambda name: only_storage
+        else:
+            self._make_storage = storage
+        self._open_lists = OrderedDict()
+        self._max_open_lists = max(1, max_open_lists)
+        self._undo_entries = undo_entries
+        self._undo_bytes = undo_bytes
+        self._virtual = virtual
+        self._search_terms = set()
+        if profile is not None:
+            profiler.enabled = profile
+        super().__init__(*args, **kwargs)
+        if profiler.enabled:
+            self.bind("f12", "toggle_stats", description="Stats")
 
     def compose(self) -> ComposeResult:
-        self._todo_container = Vertical(id="todo-container")
-        yield self._todo_container
-        yield Footer()
-
+        self._tabs = Tabs(
+            *[
+                Tab(Text(name), id=f"tab-{index}")
+                for index, name in enumerate(self._list_names)
+            ]
+        )
+        self._tabs.display = len(self._list_names) > 1
+        yield self._tabs
+        self._search_bar = SearchBar(placeholder="Search")
+        yield self._search_bar
+        self._bulk_bar = BulkBar()
+        yield self._bulk_bar
+        # The containers of the lists are mounted as the lists are opened.
+        self._switcher = ContentSwitcher()
+        yield self._switcher
+        self._footer = TodoFooter()
+        yield self._footer
+        self._stats_panel = StatsPanel()
+        yield self._stats_panel
+
+    @timed
     async def action_new_todo(self) -> None:
-        """Add a new TODO item to the list."""
-        new_todo = TodoItem()
-        await self._todo_container.mount(new_todo)
-        new_todo.scroll_visible()
+        """Add a new TODO item to the current list."""
+        current = self._current
+        record = TodoRecord()
+        await self._add_record(current, record)
+        new_todo = await current.container.reveal(record)
+        new_todo.start_editing()
         new_todo.set_status_message("Add description and due date.")
-        self._save_to_file()
+        current.undo_log.record(Change(Change.ADD, record))
 
+    @timed
     async def on_todo_item_done(self, event: TodoItem.Done) -> None:
-        """If an item is done, get rid of it.
+        """If an item is done, move it from the list to the archive of the list."""
+        current = self._current
+        record = event.todo_item.record
+        if record not in current.container.store:
+            # The switch was toggled again before the first message was handled.
+            return
+        await self._remove_record(current, record)
+        archived = await asyncio.get_running_loop().run_in_executor(
+            None, current.archive.add, [record]
+        )
+        current.undo_log.record(Change(Change.DONE, record, after=archived))
+
+    def action_archive(self) -> None:
+        """Show the completed items of the current list."""
+        self.push_screen(
+            ArchiveScreen(self._current.archive, f"Archive of {self._current.name}")
+        )
+
+    @timed
+    async def on_archive_screen_restore(self, event: ArchiveScreen.Restore) -> None:
+        """Put an item back in the current list, as it was before it was done."""
+        # The archive screen covers the tabs, so the list cannot change under it.
+        current = self._current
+        record = await asyncio.get_running_loop().run_in_executor(
+            None, current.archive.restore, event.item
+        )
+        await self._add_record(current, record)
+        current.undo_log.record(Change(Change.RESTORE, record, [event.item]))
+
+    @timed
+    async def on_todo_item_due_date_changed(
+        self, event: TodoItem.DueDateChanged
+    ) -> None:
+        record = event.todo_item.record
+        await self._sort_todo_item(event.todo_item)
+        self._current.storage.due_date_changed(record)
+        self._current.undo_log.record(
+            Change(Change.DUE_DATE, record, event.previous, record.due_date)
+        )
+
+    @timed
+    async def on_todo_item_due_date_cleared(
+        self, event: TodoItem.DueDateCleared
+    ) -> None:
+        record = event.todo_item.record
+        await self._sort_todo_item(event.todo_item)
+        self._current.storage.due_date_changed(record)
+        self._current.undo_log.record(
+            Change(Change.DUE_DATE, record, event.previous, None)
+        )
+
+    @timed
+    def on_todo_item_description_changed(
+        self, event: TodoItem.DescriptionChanged
+    ) -> None:
+        record = event.todo_item.record
+        self._current.search_index.update(record)
+        self._current.storage.description_changed(record)
+        self._current.undo_log.record(
+            Change(Change.DESCRIPTION, record, event.previous, record.description)
+        )
+
+    async def _load_all(self, open_list: OpenList) -> None:
+        """Wait until all the TODO items of a list are loaded, reading the rest.
+
+        Records can only be added or moved once all the records are loaded, for
+        their places by date, and new records need ids that no other has.
+        """
+        if open_list.loader is not None and not open_list.loader.done():
+            open_list.container.want_all()
+            await asyncio.shield(open_list.loader)
+
+    async def _add_record(self, open_list: OpenList, record: TodoRecord) -> None:
+        """Add a record to a list, in its place by date, and save it."""
+        await self._load_all(open_list)
+        await open_list.container.add(record)
+        open_list.search_index.add(record)
+        open_list.storage.record_added(record)
+
+    async def _add_records(
+        self, open_list: OpenList, records: list[TodoRecord]
+    ) -> None:
+        """Add many records to a list at once, sorting once and saving once."""
+        await self._load_all(open_list)
+        await open_list.container.add_many(records)
+        for record in records:
+            open_list.search_index.add(record)
+        open_list.storage.records_added(records)
+
+    async def _remove_record(self, open_list: OpenList, record: TodoRecord) -> None:
+        """Remove a record from a list and save the list without it."""
+        await open_list.container.remove_record(record)
+        open_list.search_index.remove(record)
+        open_list.storage.record_removed(record)
+
+    async def _remove_records(
+        self, open_list: OpenList, records: AbstractSet[TodoRecord]
+    ) -> None:
+        """Remove many records from a list at once and save the list once."""
+        await open_list.container.remove_records(records)
+        for record in records:
+            open_list.search_index.remove(record)
+        open_list.storage.records_removed(records)
+
+    async def _change_due_dates(
+        self, open_list: OpenList, records: list[TodoRecord]
+    ) -> None:
+        """Sort and save records whose due dates were changed, all at once.
+
+        The items showing the records are updated in the same batch as the sort,
+        so the list is laid out once.
+        """
+        await self._load_all(open_list)
+        container = open_list.container
+        with self.batch_update():
+            container.sort_records(records)
+            for record in records:
+                item = container.item_for(record)
+                if item is not None:
+                    item.show_due_date()
+        open_list.storage.due_dates_changed(records)
+
+    def _focused_record(self) -> TodoRecord | None:
+        """Get the record of the TODO item that has the focus, if any."""
+        focused = self.screen.focused
+        if focused is None:
+            return None
+        for node in (focused, *focused.ancestors):
+            if isinstance(node, TodoItem):
+                return node.record
+        return None
+
+    def action_toggle_selected(self) -> None:
+        """Select the focused TODO item for bulk actions, or deselect it."""
+        record = self._focused_record()
+        if record is None:
+            self.bell()
+        else:
+            self._todo_container.toggle_selected(record)
+
+    async def action_extend_selection(self, step: int) -> None:
+        """Extend the selection to the TODO item above or below its end."""
+        container = self._todo_container
+        record = container.extend_selection(step, self._focused_record())
+        if record is None:
+            self.bell()
+        else:
+            await container.reveal(record)
+
+    async def action_select_all(self) -> None:
+        """Select all the TODO items that match the search, if any."""
+        await self._load_all(self._current)
+        self._todo_container.select_all()
+
+    def action_clear_selection(self) -> None:
+        self._todo_container.clear_selection()
+
+    def action_bulk(self) -> None:
+        """Ask for an action to apply to all the selected TODO items."""
+        count = len(self._todo_container.selected)
+        if count:
+            self._bulk_bar.open(count)
+        else:
+            self.bell()
+
+    @timed
+    async def on_bulk_bar_action(self, event: BulkBar.Action) -> None:
+        """Apply an action to all the selected TODO items at once.
+
+        However many items are selected, the store is changed and sorted once, the
+        list is saved once, and the items are laid out once.
+        The action is undone and redone as a whole.
+        """
+        current = self._current
+        container = current.container
+        selected = container.selected
+        records = [record for record in container.store if record in selected]
+        if not records:
+            return
 
-        In a more conventional TODO app, completed items would likely be archived
-        instead of completely obliterated.
+        changes: list[Change] = []
+        if event.kind in (BulkBar.DONE, BulkBar.DELETE):
+            await self._remove_records(current, set(records))
+            if event.kind == BulkBar.DONE:
+                archived = await asyncio.get_running_loop().run_in_executor(
+                    None, current.archive.add, records
+                )
+                changes = [
+                    Change(Change.DONE, record, after=[item])
+                    for record, item in zip(records, archived)
+                ]
+            else:
+                changes = [Change(Change.DELETE, record) for record in records]
+        else:
+            dated = []
+            for record in records:
+                previous = date = record.due_date
+                if event.kind == BulkBar.SET_DATE:
+                    date = event.date
+                elif event.kind == BulkBar.CLEAR_DATE:
+                    date = None
+                elif previous is not None:
+                    date = previous + dt.timedelta(days=event.days)
+                if date == previous:
+                    continue
+                record.due_date = date
+                dated.append(record)
+                changes.append(Change(Change.DUE_DATE, record, previous, date))
+            if dated:
+                await self._change_due_dates(current, dated)
+        if changes:
+            current.undo_log.record(Change.batch(changes))
+
+    @timed
+    async def action_undo(self) -> None:
+        """Undo the last change made to the current list."""
+        change = self._current.undo_log.undo()
+        if change is None:
+            self.bell()
+        else:
+            await self._apply_change(self._current, change, undo=True)
+
+    @timed
+    async def action_redo(self) -> None:
+        """Redo the last change undone in the current list."""
+        change = self._current.undo_log.redo()
+        if change is None:
+            self.bell()
+        else:
+            await self._apply_change(self._current, change, undo=False)
+
+    async def _apply_change(
+        self, open_list: OpenList, change: Change, undo: bool
+    ) -> None:
+        """Undo or redo a change, going through the same paths as making it.
+
+        The records are moved to their places by date and the change is saved
+        like any other, so the list is never reloaded.
+        The changes of a batch are applied together, sorting and saving once.
         """
-        await event.todo_item.remove()
-        self._save_to_file()
+        changes = change.before if change.kind == Change.BATCH else [change]
+        container = open_list.container
+        store = container.store
+        loop = asyncio.get_running_loop()
+
+        # Undoing an addition or a restore, and redoing a completion or a
+        # deletion, take the record out, while the opposites put it back.
+        taken_out: list[Change] = []
+        put_back: list[Change] = []
+        edited: list[Change] = []
+        for sub in changes:
+            if sub.kind in (Change.DESCRIPTION, Change.DUE_DATE):
+                edited.append(sub)
+            elif undo == (sub.kind in (Change.ADD, Change.RESTORE)):
+                taken_out.append(sub)
+            else:
+                put_back.append(sub)
+
+        archive = open_list.archive
+        if taken_out:
+            # Records are matched by id, as the list may hold another copy of the
+            # record than the change, if it was put back some other way.
+            removed = {}
+            for sub in taken_out:
+                if sub.record.id is None:
+                    continue
+                found = store.get(sub.record.id)
+                if found is not None:
+                    removed[sub] = found
+            await self._remove_records(open_list, set(removed.values()))
+            # The archive entries a completion or a restore came from are shown
+            # in the archive again, rather than archiving the records anew.
+            archived = [
+                item
+                for sub in removed
+                for item in self._archived_items(sub)
+                if archive.is_restored(item)
+            ]
+            if archived:
+                await loop.run_in_executor(None, archive.unrestore_many, archived)
+
+        if put_back:
+            records = []
+            archived = []
+            for sub in put_back:
+                items = self._archived_items(sub)
+                if any(archive.is_restored(item) for item in items):
+                    # Already restored from the archive some other way.
+                    continue
+                if sub.record.id is not None and store.get(sub.record.id) is not None:
+                    continue
+                archived.extend(items)
+                records.append(sub.record)
+            if archived:
+                await loop.run_in_executor(None, archive.restore_many, archived)
+            if len(records) == 1:
+                await self._add_record(open_list, records[0])
+                await container.reveal(records[0])
+            elif records:
+                await self._add_records(open_list, records)
+
+        dated = []
+        for sub in edited:
+            record = sub.record
+            if record not in store:
+                # Another process removed the record in the meantime.
+                continue
+            value = sub.before if undo else sub.after
+            if sub.kind == Change.DESCRIPTION:
+                record.description = value
+                open_list.search_index.update(record)
+                open_list.storage.description_changed(record)
+                todo_item = container.item_for(record)
+                if todo_item is not None:
+                    todo_item.load_record(record)
+            else:
+                record.due_date = value
+                dated.append(record)
+        if dated:
+            await self._change_due_dates(open_list, dated)
+
+    @staticmethod
+    def _archived_items(change: Change) -> list[ArchivedItem]:
+        """Get the archive entries a completion or a restore moved a record to or from."""
+        if change.kind == Change.DONE:
+            return change.after
+        if change.kind == Change.RESTORE:
+            return change.before
+        return []
+
+    @timed
+    async def _sort_todo_item(self, item: TodoItem) -> None:
+        """Move the given TODO item to its place, by date."""
+        await self._load_all(self._current)
+        self._todo_container.sort_record(item.record)
+
+    @timed
+    def action_collapse_all(self) -> None:
+        self._todo_container.collapse_all()
 
-    def on_todo_item_due_date_changed(self, event: TodoItem.DueDateChanged) -> None:
-        self._sort_todo_item(event.todo_item)
-        self._save_to_file()
+    @timed
+    async def action_expand_all(self) -> None:
+        # The records still unread would be read collapsed.
+        await self._load_all(self._current)
+        self._todo_container.expand_all()
 
-    def on_todo_item_due_date_cleared(self, event: TodoItem.DueDateCleared) -> None:
-        self._sort_todo_item(event.todo_item)
-        self._save_to_file()
+    def action_search(self) -> None:
+        self._search_bar.open()
 
-    def _sort_todo_item(self, item: TodoItem) -> None:
-        """Sort the given TODO item in order, by date."""
+    def action_toggle_stats(self) -> None:
+        self._stats_panel.toggle()
 
-        if len(self._todo_container.children) == 1:
+    @timed
+    async def on_input_changed(self, event: Input.Changed) -> None:
+        """Narrow down the TODO items as the search query is typed."""
+        if event.input is not self._search_bar:
             return
-
-        date = item.due_date
-        for idx, todo in enumerate(self._todo_container.query(TodoItem)):
-            if todo is item:
+        # Keystrokes that do not change the words, like spaces, change nothing.
+        terms = tokenize(event.value)
+        if terms != self._search_terms:
+            self._search_terms = terms
+            if terms:
+                # The records still unread are searched as they are read.
+                self._current.container.want_all()
+            await self._apply_search(self._current)
+
+    async def _apply_search(self, open_list: OpenList) -> None:
+        """Show only the TODO items of a list that match the search query."""
+        container = open_list.container
+        matches = open_list.search_index.search(self._search_bar.value)
+        if matches is not None and len(matches) == len(container.store):
+            matches = None
+        if matches is not None or container.filtered:
+            await container.filter(matches)
+
+    def on_tabs_tab_activated(self, event: Tabs.TabActivated) -> None:
+        if event.tab is not None and event.tab.id is not None:
+            # Switching lists in the frame that handles the click on the tab
+            # leaves the compositor with stale regions, so it waits a frame.
+            index = int(event.tab.id[len("tab-") :])
+            self.call_after_refresh(self._show_list, index)
+
+    @timed
+    async def _show_list(self, index: int) -> None:
+        """Show a list, opening it if it is not open yet.
+
+        Opening a list mounts its container and starts loading its items.
+        Lists that were shown least recently are then closed if too many are open.
+
+        Args:
+            index: The index of the list, in the order of the tabs.
+        """
+        if index == self._current_index:
+            return
+        open_list = self._open_lists.get(index)
+        if open_list is None:
+            name = self._list_names[index]
+            container = TodoList(id=f"list-{index}")
+            open_list = OpenList(
+                name,
+                self._make_storage(name),
+                container,
+                UndoLog(self._undo_entries, self._undo_bytes),
+            )
+            self._open_lists[index] = open_list
+            await self._switcher.mount(container)
+        elif self._search_terms or open_list.container.filtered:
+            # The search query may have changed since the list was last shown,
+            # so the list is filtered before it is shown.
+            if self._search_terms:
+                open_list.container.want_all()
+            await self._apply_search(open_list)
+        self._open_lists.move_to_end(index)
+        self._current, self._current_index = open_list, index
+        self._switcher.current = open_list.container.id
+        self._tabs.active = f"tab-{index}"
+        self._footer.progress = open_list.progress
+
+        if open_list.loader is None:
+            storage = open_list.storage
+            if self._virtual and isinstance(storage, SqliteStorage):
+                loading = self._page_list(open_list, storage)
+            else:
+                loading = self._load_list(open_list)
+            open_list.loader = asyncio.ensure_future(loading)
+        await self._close_old_lists()
+
+    async def _close_old_lists(self) -> None:
+        """Close the lists shown least recently until at most `max_open_lists` are.
+
+        Lists that are still loading are closed later, once they are loaded.
+        """
+        if len(self._open_lists) > self._max_open_lists:
+            await self._wait_for_sync()
+        for index, open_list in list(self._open_lists.items()):
+            if len(self._open_lists) <= self._max_open_lists:
+                break
+            if index == self._current_index or open_list.loading:
                 continue
-            if todo.due_date is None or (date is not None and todo.due_date > date):
-                self._todo_container.move_child(item, before=idx)
-                return
+            del self._open_lists[index]
+            await open_list.close()
+            await open_list.container.remove()
 
-        end = len(self._todo_container.children) - 1
-        if self._todo_container.children[end] != item:
-            self._todo_container.move_child(item, after=end)
+    async def on_mount(self) -> None:
+        self._today = dt.date.today()
+        self._schedule_rollover()
+        self.set_interval(SYNC_INTERVAL, self._start_sync)
+        await self._show_list(0)
+
+    async def on_unmount(self) -> None:
+        await self._wait_for_sync()
+        for open_list in self._open_lists.values():
+            await open_list.close()
+        if profiler.enabled:
+            profiler.dump(os.environ.get(PROFILE_OUTPUT_ENV, DEFAULT_OUTPUT))
+
+    def _schedule_rollover(self) -> None:
+        """Set a timer for the next midnight, when the due status of items changes.
+
+        A single timer serves all TODO items, however many there are.
+        """
+        now = dt.datetime.now()
+        midnight = dt.datetime.combine(now.date() + dt.timedelta(days=1), dt.time())
+        self.set_timer((midnight - now).total_seconds(), self._roll_over)
+
+    def _roll_over(self) -> None:
+        """Restyle the TODO items whose due status changed with the day."""
+        today = dt.date.today()
+        # The timer may fire a little early, or late if the machine was asleep.
+        if today != self._today:
+            for open_list in self._open_lists.values():
+                open_list.container.roll_over(self._today, today)
+            self._today = today
+        self._schedule_rollover()
+
+    def _start_sync(self) -> None:
+        """Start looking for changes other processes saved, unless already looking."""
+        if self._syncing is None or self._syncing.done():
+            self._syncing = asyncio.ensure_future(self._sync_lists())
+
+    async def _wait_for_sync(self) -> None:
+        """Wait until the changes being applied, if any, are applied.
+
+        Lists must not be closed halfway through, as what they save would miss
+        the rest of the changes.
+        """
+        if self._syncing is not None:
+            await asyncio.shield(self._syncing)
 
-    def action_collapse_all(self) -> None:
-        for todo_item in self._todo_container.query(TodoItem):
-            todo_item.collapse_description()
+    async def _sync_lists(self) -> None:
+        """Apply the changes other processes saved to the lists that are loaded."""
+        for open_list in list(self._open_lists.values()):
+            if not open_list.storage.loaded:
+                continue
+            async with open_list.storage.external_changes() as diff:
+                if diff is not None:
+                    await self._apply_external_changes(open_list, diff)
 
-    def action_expand_all(self) -> None:
-        for todo_item in self._todo_container.query(TodoItem):
-            todo_item.expand_description()
+    @timed
+    async def _apply_external_changes(
+        self, open_list: OpenList, diff: SnapshotDiff
+    ) -> None:
+        """Bring a list up to date with the changes another process saved.
 
-    async def on_mount(self) -> None:
-        await self._read_from_file(DATA_FILE)
-
-    async def _read_from_file(self, path: str) -> None:
-        """Import TODO items from a JSON file."""
-        data: list[dict[str, str]]
-        try:
-            with open(path, "r") as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            data = []
-
-        for item in data:
-            new_todo = TodoItem(item["description"], item["date"])
-            await self._todo_container.mount(new_todo)
-            new_todo.update_style()
-            new_todo.reset_status()
-            self._sort_todo_item(new_todo)
-
-        self.action_collapse_all()
-
-    def _save_to_file(self) -> None:
-        data = [
-            {
-                "description": str(todo._description._label.renderable),
-                "date": str(todo._date_picker._label.renderable),
-            }
-            for todo in self._todo_container.query(TodoItem)
+        Only the TODO items that changed are mounted, removed, updated, or moved.
+        """
+        if diff.reload is not None:
+            await self._reload_list(open_list, diff.reload)
+            return
+        container, search_index = open_list.container, open_list.search_index
+        store = container.store
+        for id_ in diff.removed:
+            record = store.get(id_)
+            if record is not None:
+                await container.remove_record(record)
+                search_index.remove(record)
+
+        for id_, description, due_date in diff.changed:
+            record = store.get(id_)
+            if record is None:
+                continue
+            if description != record.description:
+                record.description = description
+                search_index.update(record)
+            if due_date != record.due_date:
+                record.due_date = due_date
+                container.sort_record(record)
+            item = container.item_for(record)
+            if item is not None:
+                item.load_record(record)
+
+        records = [
+            TodoRecord(description, due_date, collapsed=True, id=id_)
+            for id_, description, due_date in diff.added
         ]
-
-        with open(DATA_FILE, "w") as f:
-            json.dump(data, f)
-
-    def on_editable_text_display(self, event: EditableText.Display) -> None:
-        self._save_to_file()
+        if records:
+            await container.add_many(records)
+        for record, (id_, _, _) in zip(records, diff.added):
+            search_index.add(record)
+            if record.id != id_:
+                # Another process gave the id to an item added here and not saved
+                # yet, so the item it added gets a new id, to be saved.
+                open_list.storage.record_added(record)
+
+        if open_list is self._current and (self._search_terms or container.filtered):
+            await self._apply_search(open_list)
+
+    async def _reload_list(
+        self, open_list: OpenList, snapshot: list[RecordSnapshot]
+    ) -> None:
+        """Replace all the TODO items of a list with those of a snapshot.
+
+        Used when the items cannot be matched by id, so the changes that the
+        undo log remembers no longer apply either.
+        """
+        container, search_index = open_list.container, open_list.search_index
+        old = set(container.store)
+        await container.remove_records(old)
+        for record in old:
+            search_index.remove(record)
+        records = [
+            TodoRecord(description, due_date, collapsed=True, id=id_)
+            for id_, description, due_date in snapshot
+        ]
+        await container.add_many(records)
+        for record in records:
+            search_index.add(record)
+        if any(id_ is None for id_, _, _ in snapshot):
+            # The items were given ids, which are saved for the next sync.
+            open_list.storage.records_added(records)
+        open_list.undo_log.clear()
+        if open_list is self._current and (self._search_terms or container.filtered):
+            await self._apply_search(open_list)
+
+    @timed
+    async def _load_list(self, open_list: OpenList) -> None:
+        """Load the TODO items of a list from storage progressively.
+
+        The items are read in chunks, in a thread, and each chunk is shown as soon
+        as it is read, so the first items appear right away on large lists.
+        """
+        container = open_list.container
+        container.virtual = self._virtual
+        await container.load(open_list.storage.store)
+
+        async for records, progress in open_list.storage.load_chunks():
+            for record in records:
+                record.collapsed = True
+            await container.add_many(records)
+            for record in records:
+                open_list.search_index.add(record)
+            if open_list is self._current and (
+                self._search_terms or container.filtered
+            ):
+                await self._apply_search(open_list)
+            self._set_progress(open_list, progress)
+
+        self._set_progress(open_list, None)
+        await self._close_old_lists()
+
+    async def _page_list(self, open_list: OpenList, storage: SqliteStorage) -> None:
+        """Load the TODO items of a list from a database as the list is scrolled.
+
+        Each window of items is read straight from the database once the list is
+        scrolled down to it, so a long list opens with a single short query, and
+        the items below are only read when scrolled to or when all are needed.
+        """
+        container = open_list.container
+        container.virtual = True
+        await container.load(storage.store)
+        if self._search_terms:
+            container.want_all()
+        total = await storage.count()
+        container.unread = total
+        read = 0
+        after: WindowKey | None = None
+        for size in chunk_sizes():
+            self._set_progress(open_list, None)
+            open_list.waiting = True
+            try:
+                await container.wait_for_more()
+            finally:
+                open_list.waiting = False
+            self._set_progress(open_list, read / max(1, total))
+            records = await storage.read_window(after, size)
+            read += len(records)
+            if records:
+                after = window_key(records[-1])
+            for record in records:
+                record.collapsed = True
+            container.unread = 0 if len(records) < size else max(0, total - read)
+            await container.add_many(records)
+            for record in records:
+                open_list.search_index.add(record)
+            if open_list is self._current and (
+                self._search_terms or container.filtered
+            ):
+                await self._apply_search(open_list)
+            if len(records) < size:
+                break
+
+        storage.loaded = True
+        self._set_progress(open_list, None)
+        await self._close_old_lists()
+
+    def _set_progress(self, open_list: OpenList, progress: float | None) -> None:
+        """Keep track of how far a list has loaded, showing it if it is current."""
+        open_list.progress = progress
+        if open_list is self._current:
+            self._footer.progress = progress
+
+    @property
+    def _todo_container(self) -> TodoList:
+        """Container for the TODO items of the current list."""
+        return self._current.container
+
+    @property
+    def _store(self) -> TodoStore:
+        """The data of the TODO items of the current list."""
+        return self._current.container.store
 
 
 app = TODOApp()
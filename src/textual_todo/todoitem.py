@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import datetime as dt
+from typing import ClassVar
 
 from textual.app import ComposeResult
 from textual.containers import Horizontal
 from textual.message import Message
-from textual.widgets import Button, Input, Label, Static, Switch
+from textual.widgets import Button, Label, Static, Switch
 
 from .datepicker import DatePicker
 from .editabletext import EditableText
+from .expiry import ExpiryScheduler
+from .instrumentation import timed
+from .store import TodoRecord, format_date, parse_date
 
 
 class TodoItem(Static):
@@ -72,6 +76,19 @@ class TodoItem(Static):
         height: 100%;
     }
 
+    /* The due date is shown in the top row only while collapsed. */
+    .todoitem--date {
+        display: none;
+        width: auto;
+        height: 3;
+        content-align-vertical: middle;
+        padding: 0 1;
+    }
+
+    TodoItem.todoitem--collapsed .todoitem--date {
+        display: block;
+    }
+
     /* Restyle top row when collapsed and remove bottom row. */
     .todoitem--top-row .todoitem--collapsed {
         height: 3;
@@ -101,25 +118,50 @@ class TodoItem(Static):
     TodoItem.todoitem--due-in-time {
         border: heavy $accent;
     }
+
+    /* Items selected for bulk actions stand out by their background. */
+    TodoItem.todoitem--selected {
+        background: $secondary-darken-2;
+    }
     """
 
     class DueDateChanged(Message):
         """Posted when the due date changes."""
 
         todo_item: TodoItem
+        previous: dt.date | None
+        """The due date before the change."""
 
-        def __init__(self, todo_item: TodoItem, date: dt.date) -> None:
+        def __init__(
+            self, todo_item: TodoItem, date: dt.date, previous: dt.date | None
+        ) -> None:
             self.todo_item = todo_item
             self.date = date
+            self.previous = previous
             super().__init__()
 
     class DueDateCleared(Message):
         """Posted when the due date is reset."""
 
         todo_item: TodoItem
+        previous: dt.date
+        """The due date before it was cleared."""
 
-        def __init__(self, todo_item: TodoItem) -> None:
+        def __init__(self, todo_item: TodoItem, previous: dt.date) -> None:
+            self.todo_item = todo_item
+            self.previous = previous
+            super().__init__()
+
+    class DescriptionChanged(Message):
+        """Posted when the description changes."""
+
+        todo_item: TodoItem
+        previous: str
+        """The description before the change."""
+
+        def __init__(self, todo_item: TodoItem, previous: str) -> None:
             self.todo_item = todo_item
+            self.previous = previous
             super().__init__()
 
     class Done(Message):
@@ -131,12 +173,23 @@ class TodoItem(Static):
             self.todo_item = todo_item
             super().__init__()
 
+    class Toggled(Message):
+        """Posted when the user collapses or expands the TODO item."""
+
+        todo_item: TodoItem
+
+        def __init__(self, todo_item: TodoItem) -> None:
+            self.todo_item = todo_item
+            super().__init__()
+
     _show_more: Button
     """Sub widget to toggle the extra details about the TODO item."""
     _done: Switch
     """Sub widget to tick a TODO item as complete."""
     _description: EditableText
     """Sub widget holding the description of the TODO item."""
+    _date: Label
+    """Sub widget showing the due date while the item is collapsed."""
     _top_row: Horizontal
     """The top row of the widget."""
     _status: Label
@@ -145,38 +198,61 @@ class TodoItem(Static):
     """Sub widget labeling the date picker."""
     _date_picker: DatePicker
     """Sub widget to select due date."""
-    _bot_row: Horizontal
-    """The bottom row of the widget."""
-
-    _cached_date: None | dt.date = None
-    """The date in cache."""
-
-    _initial_description: str = ""
-    """The initial description to initialise the instance with."""
-    _initial_date: str = ""
-    """Date string to initialise the instance with."""
-
-    def __init__(self, description: str = "", date: str = "", *args, **kwargs) -> None:
-        self._initial_description = description
-        self._initial_date = date
+    _bot_row: Horizontal | None = None
+    """The bottom row of the widget, or None until the item is first expanded."""
+    _composed: bool = False
+    """Whether the sub widgets exist yet, which they may not when a virtual list
+    recycles the item right after mounting it."""
+
+    record: TodoRecord
+    """The data this widget is showing."""
+    _due_class: str | None = None
+    """The class for how soon the item is due, or None if it has no due date."""
+
+    style_updates: ClassVar[int] = 0
+    """How many times the class for how soon an item is due changed, over all
+    items, each change making Textual recompute the styles of the item."""
+
+    def __init__(
+        self,
+        description: str = "",
+        date: str = "",
+        *args,
+        record: TodoRecord | None = None,
+        **kwargs,
+    ) -> None:
+        if record is None:
+            record = TodoRecord(description, parse_date(date))
+        self.record = record
         super().__init__(*args, **kwargs)
 
     def compose(self) -> ComposeResult:
         self._show_more = Button("v", classes="todoitem--show-more")
         self._done = Switch(classes="todoitem--done")
         self._description = EditableText(
-            self._initial_description, classes="todoitem--description"
+            self.record.description, classes="todoitem--description"
         )
+        self._date = Label(format_date(self.record.due_date), classes="todoitem--date")
         self._top_row = Horizontal(
             self._show_more,
             self._done,
             self._description,
+            self._date,
             classes="todoitem--top-row",
         )
 
+        self._composed = True
+        yield self._top_row
+        # Most items start collapsed, so the bottom row is composed on demand.
+        if not self.record.collapsed:
+            yield self._make_bot_row()
+
+    def _make_bot_row(self) -> Horizontal:
+        """Create the bottom row, with the date picker, for the current record."""
+        due_date = self.record.due_date
         self._due_date_label = Label("Due date:", classes="todoitem--duedate")
         self._date_picker = DatePicker(
-            self._initial_date, classes="todoitem--datepicker"
+            format_date(due_date), classes="todoitem--datepicker"
         )
         self._status = Label("", classes="todoitem--status")
         self._bot_row = Horizontal(
@@ -185,26 +261,92 @@ class TodoItem(Static):
             self._date_picker,
             classes="todoitem--bot-row",
         )
-
-        yield self._top_row
-        yield self._bot_row
+        return self._bot_row
 
     def on_mount(self) -> None:
-        if not self._initial_description:
+        if self.record.collapsed:
+            self.collapse_description()
+        self.update_style()
+        self.reset_status()
+
+    def on_unmount(self) -> None:
+        ExpiryScheduler.for_app(self.app).cancel(self)
+
+    @timed
+    def load_record(self, record: TodoRecord) -> None:
+        """Reuse this widget to show another record.
+
+        Unlike user edits, loading a record posts no messages.
+
+        Args:
+            record: The record to show.
+        """
+        focused = self.screen.focused
+        if focused is not None and self in focused.ancestors:
+            self.screen.set_focus(None)
+
+        self.record = record
+        if not self._composed:
+            # The sub widgets are composed from the new record when they are made.
+            return
+        self._description.value = record.description
+        self._description._stop_editing()
+        self._date.update(format_date(record.due_date))
+        if self._bot_row is not None:
+            self._date_picker.value = format_date(record.due_date)
+            self._date_picker._stop_editing()
+        if record.collapsed:
+            self.collapse_description()
+        else:
+            self.expand_description()
+        self.update_style()
+        self.reset_status()
+
+    def show_due_date(self) -> None:
+        """Show the due date of the record after it was changed from outside.
+
+        Unlike `load_record`, nothing else about the item is reloaded.
+        """
+        if not self._composed:
+            return
+        date = format_date(self.record.due_date)
+        self._date.update(date)
+        if self._bot_row is not None:
+            self._date_picker.value = date
+            self._date_picker._stop_editing()
+        self.update_style()
+        self.reset_status()
+
+    @property
+    def is_editing(self) -> bool:
+        """Is the description or the due date being edited?"""
+        if not self._composed:
+            return False
+        if self._bot_row is not None and self._date_picker.is_editing:
+            return True
+        return self._description.is_editing
+
+    def follow_editor(self) -> None:
+        """Keep the editor over the field being edited, if any, as it may have moved."""
+        if not self._composed:
+            return
+        self._description.follow()
+        if self._bot_row is not None:
+            self._date_picker.follow()
+
+    def start_editing(self) -> None:
+        """Edit the description, or the due date if there is a description."""
+        if not self.record.description:
             self._description.switch_to_editing_mode()
-            self.query(Input).first().focus()
-        if self.due_date is None:
+        elif self._bot_row is not None and self.due_date is None:
             self._date_picker.switch_to_editing_mode()
-            if self._initial_description:
-                self.query(Input).last().focus()
 
     @property
     def due_date(self) -> dt.date | None:
         """Date the item is due by, or None if not set."""
-        if self._cached_date is None:
-            self._cached_date = self._date_picker.date
-        return self._cached_date
+        return self.record.due_date
 
+    @timed
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Toggle the collapsed state."""
         event.stop()
@@ -212,18 +354,45 @@ class TodoItem(Static):
             self.expand_description()
         else:
             self.collapse_description()
+        self.post_message(self.Toggled(self))
+
+    @timed
+    def collapse_description(self, layout: bool = True) -> None:
+        """Collapse this item if not yet collapsed.
 
-    def collapse_description(self) -> None:
-        """Collapse this item if not yet collapsed."""
+        Args:
+            layout: Whether to refresh the layout, which callers that change many
+                items at once do themselves.
+        """
+        self.record.collapsed = True
         self.add_class("todoitem--collapsed")
         self._show_more.label = ">"
-        self.refresh(layout=True)
+        if layout:
+            self.refresh(layout=True)
 
-    def expand_description(self) -> None:
-        """Expand this item if not yet expanded."""
+    @timed
+    def expand_description(self, layout: bool = True) -> None:
+        """Expand this item if not yet expanded.
+
+        Args:
+            layout: Whether to refresh the layout, which callers that change many
+                items at once do themselves.
+        """
+        self.record.collapsed = False
+        if self._bot_row is None:
+            self.mount(self._make_bot_row())
+            self.reset_status()
         self.remove_class("todoitem--collapsed")
         self._show_more.label = "v"
-        self.refresh(layout=True)
+        if layout:
+            self.refresh(layout=True)
+
+    def set_selected(self, selected: bool) -> None:
+        """Mark the item as selected for bulk actions, or not."""
+        if selected:
+            self.add_class("todoitem--selected")
+        else:
+            self.remove_class("todoitem--selected")
 
     @property
     def is_collapsed(self) -> bool:
@@ -238,14 +407,23 @@ class TodoItem(Static):
             duration: How many seconds to keep the status message for.
                 Setting this to None will keep it there until it is changed again.
         """
+        if self._bot_row is None:
+            return
         self._status.renderable = status
         self._status.refresh()
 
-        if duration is not None:
-            self.set_timer(duration, self.reset_status)
+        # A single scheduler keeps the expiries of all items, and a new message
+        # replaces the expiry of the previous one.
+        expiry = ExpiryScheduler.for_app(self.app)
+        if duration is None:
+            expiry.cancel(self)
+        else:
+            expiry.schedule(self, duration, self.reset_status)
 
     def reset_status(self) -> None:
         """Resets the status message to indicate time to deadline."""
+        if self._bot_row is None:
+            return
         self._status.renderable = ""
         today = dt.date.today()
         date = self.due_date
@@ -266,55 +444,81 @@ class TodoItem(Static):
         else:
             self.set_status_message(f"{abs(delta)} days late!")
 
+    @timed
     def on_date_picker_selected(self, event: DatePicker.Selected) -> None:
         """Colour the TODO item according to its deadline."""
         event.stop()
         date = event.date
-        if date == self._cached_date:
+        previous = self.record.due_date
+        if date == previous:
             return
 
-        self._cached_date = date
+        self.record.due_date = date
+        self._date.update(format_date(date))
         self.set_status_message("Date updated.", 1)
 
         self.update_style()
 
-        self.post_message(self.DueDateChanged(self, date))
+        self.post_message(self.DueDateChanged(self, date, previous))
 
+    @timed
     def on_date_picker_cleared(self, event: DatePicker.DateCleared) -> None:
         """Clear all styling from a TODO item with no due date."""
 
         event.stop()
-        if self._cached_date is None:
+        previous = self.record.due_date
+        if previous is None:
             return
 
-        self._cached_date = None
+        self.record.due_date = None
+        self._date.update("")
         self.set_status_message("Date cleared.", 1)
-        self.remove_class(
-            "todoitem--due-late",
-            "todoitem--due-today",
-            "todoitem--due-in-time",
-        )
+        self.update_style()
 
-        self.post_message(self.DueDateCleared(self))
+        self.post_message(self.DueDateCleared(self, previous))
+
+    @timed
+    def on_editable_text_display(self, event: EditableText.Display) -> None:
+        """Keep the record in sync with the description."""
+        event.stop()
+        description = self._description.value
+        previous = self.record.description
+        if description != previous:
+            self.record.description = description
+            self.post_message(self.DescriptionChanged(self, previous))
+        # Move on to the due date, as only one field can be edited at a time.
+        if self._bot_row is not None and self.due_date is None:
+            self._date_picker.switch_to_editing_mode()
 
     def on_switch_changed(self, event: Switch.Changed) -> None:
         """Emit event saying the TODO item was completed."""
         event.stop()
         self.post_message(self.Done(self))
 
+    @timed
     def update_style(self) -> None:
-        """Update the class associated with the TODO item."""
-        date = self._cached_date
+        """Update the class associated with the TODO item.
+
+        The class is only swapped if it changed, as every change of class makes
+        Textual recompute the styles of the item and all its sub widgets.
+        """
+        date = self.record.due_date
         if date is None:
+            due_class = None
+        else:
+            today = dt.date.today()
+            if date < today:
+                due_class = "todoitem--due-late"
+            elif date == today:
+                due_class = "todoitem--due-today"
+            else:
+                due_class = "todoitem--due-in-time"
+        if due_class == self._due_class:
             return
 
-        today = dt.date.today()
-        self.remove_class(
-            "todoitem--due-late", "todoitem--due-today", "todoitem--due-in-time"
-        )
-        if date < today:
-            self.add_class("todoitem--due-late")
-        elif date == today:
-            self.add_class("todoitem--due-today")
-        else:
-            self.add_class("todoitem--due-in-time")
+        if self._due_class is not None:
+            self.remove_class(self._due_class)
+        if due_class is not None:
+            self.add_class(due_class)
+        self._due_class = due_class
+        TodoItem.style_updates += 1
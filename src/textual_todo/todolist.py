@@ -0,0 +1,759 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import AbstractSet, Collection
+
+from textual.containers import Vertical
+from textual.widget import AwaitMount, Widget
+from textual.widgets import Static
+
+from .instrumentation import timed
+from .store import DueDateIndex, TodoRecord, TodoStore
+from .todoitem import TodoItem
+
+
+class TodoList(Vertical):
+    """Scrollable list of TODO items.
+
+    The list shows the records of a `TodoStore` and decides which records get a
+    `TodoItem` widget.
+    In virtual mode, only the records in the visible scroll window (plus a small
+    overscan) are mounted and widgets that scroll out of view are recycled.
+    Two spacers above and below the mounted items stand in for the records that
+    are not mounted, so that the scrollbar reflects the full list.
+    Their heights are estimated until the items are laid out, and then corrected
+    with the heights the items really have, since long descriptions wrap.
+    The list can be filtered to show only some of the records of the store.
+    The store may hold only the first records of a longer list, which are then
+    read as the list is scrolled down to them, see `wait_for_more`.
+    Records can be selected, one by one or by range, for bulk actions.
+    """
+
+    DEFAULT_CSS = """
+    TodoList .todolist--spacer {
+        height: 0;
+    }
+    """
+
+    COLLAPSED_HEIGHT = 5
+    """Estimated height of a collapsed TODO item."""
+    EXPANDED_HEIGHT = 8
+    """Estimated height of an expanded TODO item."""
+    OVERSCAN = 5
+    """How many records to mount above and below the visible window."""
+
+    _store: TodoStore
+    """All the records of the list, in display order."""
+    _shown: DueDateIndex | None = None
+    """The records that pass the filter, in display order, or None if unfiltered."""
+    _mounted: dict[TodoRecord, TodoItem]
+    """The records that are currently mounted and their widgets."""
+    _offsets: list[int] | None = None
+    """Cached vertical offsets of all records, plus the total height at the end."""
+    _heights: dict[TodoRecord, int]
+    """The heights the items of records had when they were last laid out."""
+    _measuring: bool = False
+    """Whether the heights of the mounted items are to be measured after refresh."""
+    _view: tuple[TodoRecord | None, int] | None = None
+    """Where to keep the view while heights are corrected: a record and how far
+    into it the view starts, until the view is put back there, or None and 0 for
+    the end of the list, until the view is scrolled."""
+    _revealed: TodoRecord | None = None
+    """The record last revealed, which is kept in view until the view is scrolled."""
+    _keeping_view: bool = False
+    """Whether the list itself is scrolling to keep the view."""
+    _virtual: bool
+    """Whether only the visible records are mounted."""
+    _selected: set[TodoRecord]
+    """The records that bulk actions apply to."""
+    _anchor: TodoRecord | None = None
+    """The record the range selection extends from, if any."""
+    _cursor: TodoRecord | None = None
+    """The record the range selection extends to, if any."""
+    _range_base: set[TodoRecord]
+    """The records that were selected before the range selection started."""
+    _unread: int = 0
+    """Roughly how many records follow those in the store and are still unread."""
+    _more_wanted: asyncio.Future[None] | None = None
+    """Set while waiting for more records to be wanted, and resolved once they are."""
+    _all_wanted: bool = False
+    """Whether all the records are wanted, whatever the window."""
+    _top_spacer: Static
+    """Spacer that stands in for the records above the mounted ones."""
+    _bottom_spacer: Static
+    """Spacer that stands in for the records below the mounted ones."""
+
+    def __init__(
+        self, *args, store: TodoStore | None = None, virtual: bool = False, **kwargs
+    ) -> None:
+        self._store = TodoStore() if store is None else store
+        self._mounted = {}
+        self._heights = {}
+        self._virtual = virtual
+        self._selected = set()
+        self._range_base = set()
+        self._top_spacer = Static(classes="todolist--spacer")
+        self._bottom_spacer = Static(classes="todolist--spacer")
+        super().__init__(self._top_spacer, self._bottom_spacer, *args, **kwargs)
+
+    @property
+    def store(self) -> TodoStore:
+        """All the records of the list, in display order."""
+        return self._store
+
+    @property
+    def _records(self) -> TodoStore | DueDateIndex:
+        """The records that are shown, in display order."""
+        return self._store if self._shown is None else self._shown
+
+    @property
+    def filtered(self) -> bool:
+        """Whether only some of the records are shown."""
+        return self._shown is not None
+
+    @property
+    def virtual(self) -> bool:
+        """Whether only the visible records are mounted."""
+        return self._virtual
+
+    @virtual.setter
+    def virtual(self, virtual: bool) -> None:
+        if virtual != self._virtual:
+            self._virtual = virtual
+            self._refresh_window()
+
+    @property
+    def unread(self) -> int:
+        """Roughly how many records follow those in the store and are still unread.
+
+        The bottom spacer stands in for them too, so that the scrollbar reflects
+        the full list.
+        """
+        return self._unread
+
+    @unread.setter
+    def unread(self, unread: int) -> None:
+        self._unread = unread
+
+    async def wait_for_more(self) -> None:
+        """Wait until the records that follow those in the store are wanted.
+
+        They are wanted once the window reaches the last record in the store, or
+        once `want_all` was called.
+        """
+        if self._all_wanted or self._window_at_end():
+            return
+        self._more_wanted = asyncio.get_running_loop().create_future()
+        try:
+            await self._more_wanted
+        finally:
+            self._more_wanted = None
+
+    def want_all(self) -> None:
+        """Want all the records that follow those in the store, whatever the window."""
+        self._all_wanted = True
+        self._resolve_more_wanted()
+
+    def _window_at_end(self) -> bool:
+        """Does the window reach the last record of the store?"""
+        return self._shown is None and self._window()[1] == len(self._store)
+
+    def _resolve_more_wanted(self) -> None:
+        if self._more_wanted is not None and not self._more_wanted.done():
+            self._more_wanted.set_result(None)
+
+    @property
+    def selected(self) -> AbstractSet[TodoRecord]:
+        """The records that bulk actions apply to, in no particular order."""
+        return self._selected
+
+    def item_for(self, record: TodoRecord) -> TodoItem | None:
+        """Get the widget showing the given record, if it is mounted."""
+        return self._mounted.get(record)
+
+    async def load(self, store: TodoStore) -> None:
+        """Replace the contents of the list with the records of the given store.
+
+        All the widgets that are needed are mounted in one go.
+        """
+        self._store = store
+        self._shown = None
+        self._heights.clear()
+        self._offsets = None
+        self._view = None
+        self._revealed = None
+        self._unread = 0
+        self._all_wanted = False
+        self.clear_selection()
+        await self._refresh_window()
+
+    @timed
+    def filter(self, records: AbstractSet[TodoRecord] | None) -> AwaitMount:
+        """Show only some of the records, or all of them.
+
+        Args:
+            records: The records to show, or None to show all.
+
+        Returns:
+            An awaitable that waits for the new widgets to be mounted.
+        """
+        self._shown = None if records is None else self._store.subset(records)
+        self._offsets = None
+        self.scroll_home(animate=False)
+        return self._refresh_window()
+
+    @timed
+    async def add(self, record: TodoRecord) -> None:
+        """Add a record to the list, in its place by date.
+
+        The record is shown even if the list is filtered.
+        """
+        position = self._store.add(record)
+        if self._shown is not None:
+            position = self._shown.insert(record)
+        if self._offsets is not None:
+            self._offsets.insert(position, self._offsets[position])
+            self._shift_offsets({position: self._estimated_height(record)})
+        if self._virtual:
+            await self._refresh_window()
+        else:
+            item = self._mounted[record] = TodoItem(record=record)
+            await self.mount(item, before=self._widget_after(position))
+
+    @timed
+    async def add_many(self, records: list[TodoRecord]) -> None:
+        """Add many records to the list at once, each in its place by date.
+
+        The records are not shown if the list is filtered.
+        """
+        self._store.extend(records)
+        self._offsets = None
+        await self._refresh_window()
+
+    @timed
+    async def remove_record(self, record: TodoRecord) -> None:
+        """Remove a record from the list, if it is still in it."""
+        if record not in self._store:
+            return
+        position: int | None = self._store.remove(record)
+        if self._shown is not None:
+            position = self._shown.remove(record) if record in self._shown else None
+        if self._offsets is not None and position is not None:
+            offsets = self._offsets
+            height = offsets[position + 1] - offsets[position]
+            del offsets[position + 1]
+            self._shift_offsets({position: -height})
+        self._selected.discard(record)
+        self._heights.pop(record, None)
+        item = self._mounted.pop(record, None)
+        if item is not None:
+            await item.remove()
+        if self._virtual:
+            await self._refresh_window()
+
+    @timed
+    async def remove_records(self, records: AbstractSet[TodoRecord]) -> None:
+        """Remove many records from the list at once.
+
+        The store is filtered in a single pass and the widgets are removed in a
+        single batch, so the list is laid out once however many records go.
+        """
+        if len(records) == 1:
+            await self.remove_record(next(iter(records)))
+            return
+        self._store.remove_many(records)
+        if self._shown is not None:
+            self._shown.remove_many(records)
+        self._selected -= records
+        for record in records:
+            self._heights.pop(record, None)
+        self._offsets = None
+        await self._refresh_window()
+
+    @timed
+    async def reveal(self, record: TodoRecord) -> TodoItem:
+        """Make sure the given record is mounted and scroll it into view.
+
+        Returns:
+            The widget showing the record.
+        """
+        if not self._virtual:
+            item = self._mounted[record]
+            item.scroll_visible()
+            return item
+
+        # The widget may have just been mounted or recycled and has no region yet,
+        # so the view is kept on the position the record will be laid out at, and
+        # every window is taken from there, until the view is scrolled.
+        self._view = None
+        self._revealed = record
+        await self._refresh_window()
+        self._keep_view()
+        return self._mounted[record]
+
+    @timed
+    def sort_record(self, record: TodoRecord) -> None:
+        """Move the given record to its place, by date."""
+        old_position, new_position = self._store.update(record)
+        if self._shown is not None:
+            if record not in self._shown:
+                return
+            old_position, new_position = self._shown.update(record)
+        if old_position == new_position:
+            return
+        if self._offsets is not None:
+            self._move_offsets(old_position, new_position)
+
+        item = self._mounted.get(record)
+        if self._virtual or item is None:
+            self._refresh_window()
+        else:
+            self.move_child(item, before=self._widget_after(new_position))
+            self._follow_editor()
+
+    @timed
+    def sort_records(self, records: Collection[TodoRecord]) -> None:
+        """Move many records whose due dates changed to their places, sorting once.
+
+        A single record is moved on its own, as with `sort_record`.
+        """
+        if len(records) <= 1:
+            for record in records:
+                self.sort_record(record)
+            return
+        self._store.update_many(records)
+        if self._shown is not None:
+            self._shown.update_many(records)
+        self._offsets = None
+        self._refresh_window()
+
+    def toggle_selected(self, record: TodoRecord) -> None:
+        """Select a record, or deselect it, and start a range selection from it."""
+        if record in self._selected:
+            self._selected.remove(record)
+        else:
+            self._selected.add(record)
+        self._anchor = self._cursor = record
+        self._range_base = set(self._selected)
+        self._update_selected_items()
+
+    def extend_selection(
+        self, step: int, start: TodoRecord | None = None
+    ) -> TodoRecord | None:
+        """Move the end of the range selection and select the records in the range.
+
+        Args:
+            step: How many records to move the end of the range by, down if
+                positive and up if negative.
+            start: The record to start a range from, if there is none yet.
+                Defaults to the first record shown.
+
+        Returns:
+            The record at the end of the range, or None if no record is shown.
+        """
+        records = self._records
+        if not records:
+            return None
+        anchor, cursor = self._anchor, self._cursor
+        if anchor is None or cursor is None or anchor not in records:
+            if start is None or start not in records:
+                start = records[0]
+            anchor = cursor = start
+            self._anchor = anchor
+            self._range_base = set(self._selected)
+        elif cursor not in records:
+            cursor = anchor
+        position = records.position(cursor) + step
+        position = min(max(position, 0), len(records) - 1)
+        self._cursor = records[position]
+        low, high = sorted((records.position(anchor), position))
+        self._selected = self._range_base.union(records[low : high + 1])
+        self._update_selected_items()
+        return self._cursor
+
+    def select_all(self) -> None:
+        """Select all the records shown, which are only some if the list is filtered."""
+        self._selected = set(self._records)
+        self._anchor = self._cursor = None
+        self._update_selected_items()
+
+    def clear_selection(self) -> None:
+        """Deselect all the records."""
+        self._selected = set()
+        self._anchor = self._cursor = None
+        self._update_selected_items()
+
+    def _update_selected_items(self) -> None:
+        """Mark the mounted items that are selected, in a single batch."""
+        if not self.is_attached:
+            return
+        with self.app.batch_update():
+            for record, item in self._mounted.items():
+                item.set_selected(record in self._selected)
+
+    @timed
+    def collapse_all(self) -> None:
+        """Collapse all items in the list."""
+        self._set_all_collapsed(True)
+
+    @timed
+    def expand_all(self) -> None:
+        """Expand all items in the list."""
+        self._set_all_collapsed(False)
+
+    def _set_all_collapsed(self, collapsed: bool) -> None:
+        """Collapse or expand all items in the list at once.
+
+        Items already in the target state are skipped and the others change in
+        a single batch, so the list is laid out once instead of once per item.
+
+        Args:
+            collapsed: Whether to collapse the items, or expand them.
+        """
+        for record in self._store:
+            record.collapsed = collapsed
+        with self.app.batch_update():
+            for item in self._mounted.values():
+                if item.is_collapsed == collapsed:
+                    continue
+                if collapsed:
+                    item.collapse_description(layout=False)
+                else:
+                    item.expand_description(layout=False)
+            self._heights.clear()
+            self._offsets = None
+            if self._virtual:
+                self._refresh_window()
+            self.refresh(layout=True)
+
+    @timed
+    def roll_over(self, old_today: dt.date, new_today: dt.date) -> None:
+        """Bring the due status of the mounted items up to date after a day change.
+
+        Only the items due between the two days, inclusive, change from due in
+        time to due today or from due today to late, so only those are restyled.
+        They are found by date in the store, without looking at any other item.
+        The status text of every mounted item counts the days to its due date,
+        so it is refreshed for all of them.
+
+        Args:
+            old_today: The day the items were styled for.
+            new_today: The day it is now.
+        """
+        first, last = sorted((old_today, new_today))
+        start = self._store.bisect_date(first)
+        end = self._store.bisect_date(last + dt.timedelta(days=1))
+        for record in self._store[start:end]:
+            item = self._mounted.get(record)
+            if item is not None:
+                item.update_style()
+        for item in self._mounted.values():
+            item.reset_status()
+
+    def on_todo_item_toggled(self, event: TodoItem.Toggled) -> None:
+        record = event.todo_item.record
+        self._heights.pop(record, None)
+        if self._offsets is not None and record in self._records:
+            position = self._records.position(record)
+            offsets = self._offsets
+            height = offsets[position + 1] - offsets[position]
+            self._shift_offsets({position: self._estimated_height(record) - height})
+        if self._virtual:
+            self._refresh_window()
+
+    def on_todo_item_description_changed(
+        self, event: TodoItem.DescriptionChanged
+    ) -> None:
+        # The message goes on to the app, which saves the change.
+        if self._virtual:
+            self._measure_after_refresh()
+
+    def on_resize(self) -> None:
+        # Descriptions wrap differently at another width.
+        self._heights.clear()
+        self._offsets = None
+        if self._virtual:
+            self._refresh_window()
+        self._follow_editor()
+
+    def _follow_editor(self) -> None:
+        """Keep the editor over the field being edited, which may have moved.
+
+        Called whenever the items scroll or are laid out again, rather than
+        checking where the field is on a timer.
+        """
+        for item in self._mounted.values():
+            if item.is_editing:
+                item.follow_editor()
+
+    def _measure_after_refresh(self) -> None:
+        """Measure the mounted items once they are laid out, if not already due to."""
+        if not self._measuring:
+            self._measuring = True
+            self.call_after_refresh(self._measure_items)
+
+    @timed
+    def _measure_items(self) -> None:
+        """Correct the offsets with the heights the mounted items really have.
+
+        The window is refreshed if any height differs from what the offsets
+        assumed, which then measures again, until the heights settle.
+        Meanwhile, the view is kept at the end if it was there, or else on the
+        record at its top, however the heights of the records above it change.
+        """
+        self._measuring = False
+        if not self._virtual or not self._records:
+            return
+        records = self._records
+        offsets = self._get_offsets()
+        changes: dict[int, int] = {}
+        for record, item in self._mounted.items():
+            # Textual only updates the size of the visible widgets, so the items
+            # are measured where they are laid out, as are the ones out of view.
+            height = item.virtual_region.height
+            if height and self._heights.get(record) != height:
+                self._heights[record] = height
+                position = records.position(record)
+                old_height = offsets[position + 1] - offsets[position]
+                if height != old_height:
+                    changes[position] = height - old_height
+        if not changes:
+            # The heights have settled, so the view is put where it is kept, in
+            # case a layout since moved it, which measures again if it moves.
+            self._keep_view()
+            return
+
+        if self._view is None and self._revealed is None:
+            scroll_y = round(self.scroll_y)
+            if 0 < scroll_y >= self.max_scroll_y:
+                self._view = (None, 0)
+            else:
+                top = min(bisect_right(offsets, scroll_y) - 1, len(records) - 1)
+                self._view = (records[top], scroll_y - offsets[top])
+        self._shift_offsets(changes)
+        self._refresh_window()
+
+    def _kept_y(self) -> int | None:
+        """Find where the view is kept, if it is kept anywhere.
+
+        A revealed record is kept in view with as little scrolling as possible.
+        """
+        records = self._records
+        offsets = self._get_offsets()
+        height = self.size.height
+        if self._revealed is not None and self._revealed in records:
+            index = records.position(self._revealed)
+            top, bottom = offsets[index], offsets[index + 1]
+            y = round(self.scroll_y)
+            if top < y or bottom - top > height:
+                return top
+            return max(y, bottom - height)
+        if self._view is None:
+            return None
+        record, into = self._view
+        if record is None:
+            return max(0, offsets[-1] - height)
+        if record not in records:
+            return None
+        return offsets[records.position(record)] + into
+
+    def _keep_view(self) -> None:
+        """Scroll to where the view is kept, if it is kept anywhere."""
+        if self._revealed is None and self._view == (None, 0):
+            y: int | None = self.max_scroll_y
+        else:
+            y = self._kept_y()
+            if self._revealed is None:
+                # A record is only kept at the top of the view until it is put back.
+                self._view = None
+        if y is None:
+            return
+        if y != round(self.scroll_y):
+            # Scrolled right away, as `scroll_to` waits for the next refresh, by
+            # which time the view may need to be somewhere else.
+            self._keeping_view = True
+            try:
+                self.scroll_target_y = self.scroll_y = y
+            finally:
+                self._keeping_view = False
+
+    def watch_virtual_size(self) -> None:
+        # A layout can come after the items are measured, changing where the end
+        # of the list is, so the view is kept once it is done.
+        if self._view is not None or self._revealed is not None:
+            self.call_later(self._keep_view)
+        self._follow_editor()
+
+    def watch_scroll_target_y(self) -> None:
+        # Scrolling sets the target, unlike the scroll being clamped to a list
+        # that got shorter for a moment, so only scrolling lets go of the view.
+        if not self._keeping_view:
+            self._view = None
+            self._revealed = None
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if self._virtual and round(old_value) != round(new_value):
+            self._refresh_window()
+        self._follow_editor()
+
+    def _get_offsets(self) -> list[int]:
+        """Get the vertical offsets of all records, computing them if needed."""
+        if self._offsets is None:
+            collapsed, expanded = self.COLLAPSED_HEIGHT, self.EXPANDED_HEIGHT
+            measured = self._heights
+            heights = (
+                measured.get(record) or (collapsed if record.collapsed else expanded)
+                for record in self._records
+            )
+            self._offsets = [0, *accumulate(heights)]
+        return self._offsets
+
+    def _estimated_height(self, record: TodoRecord) -> int:
+        """Get the height the item of a record had, or is estimated to have."""
+        height = self._heights.get(record)
+        if height:
+            return height
+        return self.COLLAPSED_HEIGHT if record.collapsed else self.EXPANDED_HEIGHT
+
+    def _shift_offsets(self, changes: dict[int, int]) -> None:
+        """Correct the cached offsets after some records changed height.
+
+        The offsets after the first record that changed are shifted in a single
+        pass, and those before it are left alone.
+
+        Args:
+            changes: How much taller each record got, by position.
+        """
+        offsets = self._offsets
+        if offsets is None:
+            return
+        positions = sorted(changes)
+        shift = 0
+        for position, end in zip(positions, positions[1:] + [len(offsets) - 1]):
+            shift += changes[position]
+            if shift:
+                offsets[position + 1 : end + 1] = [
+                    offset + shift for offset in offsets[position + 1 : end + 1]
+                ]
+
+    def _move_offsets(self, old_position: int, new_position: int) -> None:
+        """Correct the cached offsets after a record moved to another position.
+
+        Only the offsets of the records it moved past change.
+        """
+        offsets = self._offsets
+        if offsets is None:
+            return
+        height = offsets[old_position + 1] - offsets[old_position]
+        if new_position > old_position:
+            offsets[old_position + 1 : new_position + 1] = [
+                offset - height
+                for offset in offsets[old_position + 2 : new_position + 2]
+            ]
+        else:
+            offsets[new_position + 1 : old_position + 1] = [
+                offset + height for offset in offsets[new_position:old_position]
+            ]
+
+    def _widget_after(self, position: int) -> Widget:
+        """Get the widget that follows the record at the given position.
+
+        Only makes sense when the list is not virtual, so all records are mounted.
+        """
+        records = self._records
+        if position + 1 < len(records):
+            return self._mounted[records[position + 1]]
+        return self._bottom_spacer
+
+    def _window(self) -> tuple[int, int]:
+        """Compute the range of records that should be mounted.
+
+        The window is taken from where the view is kept, if it is kept anywhere,
+        as the list may not have scrolled there yet.
+
+        Returns:
+            The start (inclusive) and end (exclusive) indices of the window.
+        """
+        count = len(self._records)
+        if not self._virtual:
+            return 0, count
+
+        offsets = self._get_offsets()
+        height = self.size.height
+        top = self._kept_y()
+        if top is None:
+            top = round(self.scroll_y)
+        start = max(0, bisect_right(offsets, top) - 1 - self.OVERSCAN)
+        end = min(count, bisect_left(offsets, top + height) + self.OVERSCAN)
+        return start, end
+
+    @timed
+    def _refresh_window(self) -> AwaitMount:
+        """Mount, recycle, and unmount widgets to match the window of records.
+
+        Items that are being edited are never recycled: once out of the window,
+        they are hidden, keeping what was typed, until their records are back in
+        the window or they stop being edited.
+
+        Returns:
+            An awaitable that waits for the new widgets to be mounted.
+        """
+        start, end = self._window()
+        records = self._records[start:end]
+        wanted = set(records)
+        old_mounted = self._mounted
+        self._mounted = {}
+        spare = []
+        for record, old_item in old_mounted.items():
+            if record in wanted:
+                continue
+            if old_item.is_editing and record in self._records:
+                old_item.display = False
+                self._mounted[record] = old_item
+            else:
+                spare.append(old_item)
+        new_items: list[TodoItem] = []
+
+        with self.app.batch_update():
+            for record in records:
+                item = old_mounted.get(record)
+                if item is None and spare:
+                    item = spare.pop()
+                    item.load_record(record)
+                elif item is None:
+                    item = TodoItem(record=record)
+                    new_items.append(item)
+                elif not item.display:
+                    item.display = True
+                item.set_selected(record in self._selected)
+                self._mounted[record] = item
+            for item in spare:
+                item.remove()
+
+            await_mount = self.mount(*new_items, before=self._bottom_spacer)
+            # Hidden items end up after the shown ones, where they take no room.
+            for position, record in enumerate(records, 1):
+                item = self._mounted[record]
+                if self.children[position] is not item:
+                    self.move_child(item, before=position)
+
+            if self._virtual:
+                offsets = self._get_offsets()
+                unread_height = self._unread * self.COLLAPSED_HEIGHT
+                self._top_spacer.styles.height = offsets[start]
+                self._bottom_spacer.styles.height = (
+                    offsets[-1] - offsets[end] + unread_height
+                )
+                self._measure_after_refresh()
+                if self._shown is None and end == len(self._store):
+                    self._resolve_more_wanted()
+            else:
+                self._top_spacer.styles.height = 0
+                self._bottom_spacer.styles.height = 0
+            self._follow_editor()
+
+        return await_mount
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque
+
+from .store import TodoRecord
+
+
+MAX_ENTRIES = 200
+"""How many changes a list remembers, to undo or redo, by default."""
+MAX_BYTES = 1024 * 1024
+"""Roughly how much memory the changes of a list may take, by default."""
+ENTRY_OVERHEAD = 200
+"""Rough size of a change in memory, in bytes, not counting the text it holds."""
+BATCH_ITEM_OVERHEAD = 80
+"""Rough size of each change in a batch, which is only an object in a list."""
+
+
+class Change:
+    """A change made to a list, which can be undone and redone.
+
+    A change only keeps the record it applies to and what is needed to reverse
+    it, never a copy of the list.
+    """
+
+    __slots__ = ("kind", "record", "before", "after", "size")
+
+    ADD = "add"
+    """The record was added: `before` and `after` are unused."""
+    DONE = "done"
+    """The record was completed: `after` has the items it was archived as."""
+    RESTORE = "restore"
+    """The record was restored from the archive: `before` has the items it was
+    restored from."""
+    DELETE = "delete"
+    """The record was deleted without archiving it: `before` and `after` are unused."""
+    DESCRIPTION = "description"
+    """The description changed from `before` to `after`."""
+    DUE_DATE = "due_date"
+    """The due date changed from `before` to `after`, either of which may be None."""
+    BATCH = "batch"
+    """Many changes made at once, in `before`, undone and redone together.
+
+    `record` is the record of the first change.
+    """
+
+    kind: str
+    """What kind of change it is, one of the constants of this class."""
+    record: TodoRecord
+    """The record that changed."""
+    before: Any
+    """The value before the change, depending on the kind of change."""
+    after: Any
+    """The value after the change, depending on the kind of change."""
+    size: int
+    """Rough size of the change in memory, in bytes, when it was made."""
+
+    def __init__(
+        self, kind: str, record: TodoRecord, before: Any = None, after: Any = None
+    ) -> None:
+        self.kind = kind
+        self.record = record
+        self.before = before
+        self.after = after
+        self.size = ENTRY_OVERHEAD + len(record.description)
+        if kind == self.DESCRIPTION:
+            self.size += len(before) + len(after)
+
+    @classmethod
+    def batch(cls, changes: list[Change]) -> Change:
+        """Group changes made at once into a single change, to undo them together."""
+        change = cls(cls.BATCH, changes[0].record, changes)
+        change.size = ENTRY_OVERHEAD + sum(
+            sub.size - ENTRY_OVERHEAD + BATCH_ITEM_OVERHEAD for sub in changes
+        )
+        return change
+
+
+class UndoLog:
+    """The changes made to a list, to undo them, and those undone, to redo them.
+
+    The oldest changes are forgotten once there are more than `max_entries`, or
+    once they take more than about `max_bytes`.
+    Making a new change forgets all the changes that were undone.
+    """
+
+    max_entries: int
+    """How many changes are remembered at most, counting those undone."""
+    max_bytes: int
+    """Roughly how much memory the changes may take, counting those undone."""
+    _undo: Deque[Change]
+    """The changes that can be undone, the most recent last."""
+    _redo: Deque[Change]
+    """The changes that can be redone, the most recently undone last."""
+    _bytes: int
+    """Rough size in memory of all the changes remembered."""
+
+    def __init__(
+        self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._undo = deque()
+        self._redo = deque()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._undo) + len(self._redo)
+
+    @property
+    def bytes(self) -> int:
+        """Rough size in memory of all the changes remembered."""
+        return self._bytes
+
+    def clear(self) -> None:
+        """Forget all the changes, as when the list is read again from scratch."""
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+
+    def record(self, change: Change) -> None:
+        """Remember a change that was just made, forgetting those undone."""
+        for undone in self._redo:
+            self._bytes -= undone.size
+        self._redo.clear()
+        self._undo.append(change)
+        self._bytes += change.size
+        self._trim()
+
+    def undo(self) -> Change | None:
+        """Take the most recent change, to undo it, and keep it to be redone."""
+        if not self._undo:
+            return None
+        change = self._undo.pop()
+        self._redo.append(change)
+        return change
+
+    def redo(self) -> Change | None:
+        """Take the most recently undone change, to redo it, and keep it to undo."""
+        if not self._redo:
+            return None
+        change = self._redo.pop()
+        self._undo.append(change)
+        return change
+
+    def _trim(self) -> None:
+        """Forget the oldest changes, then the furthest undone, until within limits."""
+        while self._undo or self._redo:
+            if len(self) <= self.max_entries and self._bytes <= self.max_bytes:
+                break
+            oldest = self._undo.popleft() if self._undo else self._redo.popleft()
+            self._bytes -= oldest.size
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import datetime as dt
+import os
+
+from textual_todo.archive import SEGMENT_SUFFIX, Archive
+from textual_todo.store import TodoRecord
+
+DONE = dt.date(2023, 2, 1)
+
+
+def archive_records(archive: Archive, count: int) -> None:
+    for n in range(count):
+        archive.add([TodoRecord(f"task {n}", dt.date(2023, 1, n + 1))], DONE)
+
+
+def descriptions(archive: Archive) -> list[str]:
+    return [item.description for item in archive.items()]
+
+
+def test_items_come_newest_first_across_segments(tmp_path):
+    directory = str(tmp_path / "items.archive")
+    archive = Archive(directory, segment_size=3)
+    archive_records(archive, 7)
+    segments = [name for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX)]
+    assert len(segments) == 2
+    assert descriptions(archive) == [f"task {n}" for n in reversed(range(7))]
+    item = next(archive.items())
+    assert (item.due_date, item.done_date) == (dt.date(2023, 1, 7), DONE)
+
+
+def test_ids_carry_on_from_the_items_already_archived(tmp_path):
+    directory = str(tmp_path / "items.archive")
+    archive_records(Archive(directory, segment_size=3), 3)
+    (item,) = Archive(directory, segment_size=3).add([TodoRecord("next")])
+    assert item.id == 3
+
+
+def test_restored_items_are_hidden_until_put_back(tmp_path):
+    archive = Archive(str(tmp_path / "items.archive"))
+    archive_records(archive, 3)
+    items = list(archive.items())
+    record = archive.restore(items[1])
+    assert (record.description, record.due_date) == ("task 1", dt.date(2023, 1, 2))
+    assert record.id is None
+    assert archive.is_restored(items[1])
+    assert not archive.is_restored(items[0])
+    assert descriptions(archive) == ["task 2", "task 0"]
+
+    archive.unrestore_many([items[1]])
+    assert not archive.is_restored(items[1])
+    assert descriptions(archive) == ["task 2", "task 1", "task 0"]
+    # Restoring an entry again after putting it back hides it again.
+    archive.restore_many([items[1], items[2]])
+    assert descriptions(archive) == ["task 2"]
+    assert Archive(archive.directory).is_restored(items[1]) is False
+    assert descriptions(Archive(archive.directory)) == ["task 2"]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import textual_todo
+
+SRC = os.path.dirname(os.path.dirname(textual_todo.__file__))
+
+
+def test_commands_import_neither_the_app_nor_the_storage(tmp_path):
+    script = (
+        "import sys\n"
+        "from textual_todo.cli import main\n"
+        "main(['list'])\n"
+        "print(' '.join(sorted(sys.modules)))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=SRC)
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    modules = set(output.split())
+    for module in [
+        "textual",
+        "asyncio",
+        "sqlite3",
+        "gzip",
+        "threading",
+        "textual_todo.storage",
+        "textual_todo.archive",
+    ]:
+        assert module not in modules
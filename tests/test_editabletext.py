@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+
+from textual.app import App, ComposeResult
+
+from textual_todo.datepicker import DatePicker
+from textual_todo.editabletext import EditableText, SharedEditor
+
+
+class FieldsApp(App[None]):
+    CSS = """
+    Screen {
+        layers: default editor;
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        yield DatePicker(id="date")
+        yield EditableText(id="text")
+
+
+def test_an_invalid_date_is_not_given_up_for_another_field():
+    async def edit_both() -> None:
+        app = FieldsApp()
+        async with app.run_test() as pilot:
+            date_picker = app.query_one("#date", DatePicker)
+            text = app.query_one("#text", EditableText)
+            date_picker.switch_to_editing_mode()
+            await pilot.press(*"32-13")
+
+            text.switch_to_editing_mode()
+            await pilot.pause()
+            editor = app.query_one(SharedEditor)
+            assert date_picker.is_editing and not text.is_editing
+            assert editor.owner is date_picker and editor.has_focus
+            assert editor.value == "32-13"
+
+    asyncio.run(edit_both())
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import asyncio
+
+from textual_todo.instrumentation import Profiler
+
+
+def test_calls_that_return_an_awaitable_are_timed_until_it_is_done():
+    profiler = Profiler(enabled=True)
+
+    @profiler.timed
+    def mount() -> asyncio.Future[None]:
+        return asyncio.ensure_future(asyncio.sleep(0.05))
+
+    async def mount_twice() -> None:
+        await mount()
+        # Not awaited by the caller, as when a window is refreshed on scroll.
+        mount()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(mount_twice())
+    (timing,) = profiler.timings.values()
+    assert timing.calls == 2
+    assert min(timing.samples) >= 0.05
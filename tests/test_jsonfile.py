@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import os
+import stat
+
+from textual_todo.jsonfile import read_json, write_json_atomic
+
+
+def mode(path) -> int:
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_new_file_follows_umask(tmp_path):
+    path = tmp_path / "items.json"
+    umask = os.umask(0o022)
+    try:
+        status = write_json_atomic(str(path), [])
+    finally:
+        os.umask(umask)
+    assert mode(path) == 0o644
+    assert stat.S_IMODE(status.st_mode) == 0o644
+
+
+def test_replaced_file_keeps_its_mode(tmp_path):
+    path = tmp_path / "items.json"
+    write_json_atomic(str(path), [])
+    os.chmod(path, 0o640)
+    write_json_atomic(str(path), [{"id": 0, "description": "a", "date": ""}])
+    assert mode(path) == 0o640
+    assert read_json(str(path))[0]["description"] == "a"
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from textual_todo.search import MAX_PREFIX_LENGTH, SearchIndex
+from textual_todo.store import TodoRecord
+
+
+def test_every_word_of_the_query_must_start_a_word():
+    rent = TodoRecord("Pay the rent")
+    report = TodoRecord("Send the report")
+    index = SearchIndex([rent, report])
+    assert index.search("re") == {rent, report}
+    assert index.search("the REN") == {rent}
+    assert index.search("ent") == set()
+    assert index.search("  ") is None
+
+
+def test_updated_and_removed_records_are_found_by_their_new_words():
+    record = TodoRecord("Buy milk")
+    index = SearchIndex([record])
+    record.description = "Buy bread"
+    index.update(record)
+    assert index.search("milk") == set()
+    assert index.search("bread") == {record}
+    index.remove(record)
+    assert index.search("buy") == set()
+    assert len(index) == 0
+
+
+def test_words_longer_than_the_prefixes_are_matched_in_full():
+    long_word = "a" * MAX_PREFIX_LENGTH
+    first = TodoRecord(long_word + "b")
+    second = TodoRecord(long_word + "c")
+    index = SearchIndex([first, second])
+    assert index.search(long_word) == {first, second}
+    assert index.search(long_word + "c") == {second}
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+
+from textual_todo.sqlitestorage import SqliteStorage, window_key
+from textual_todo.store import TodoRecord
+
+
+def test_pages_follow_due_date_order(tmp_path):
+    """Pages cover every row once, the dated ones first, across the two queries."""
+    storage = SqliteStorage(str(tmp_path / "items.db"))
+    first = dt.date(2023, 1, 1)
+    records = [
+        TodoRecord(
+            f"task {id_}",
+            None if id_ % 3 == 0 else first + dt.timedelta(days=id_ % 7),
+            id=id_,
+        )
+        for id_ in range(1000)
+    ]
+    storage.records_added(records)
+    try:
+        chunks = list(storage.read_chunks())
+        read = [record.id for chunk, _ in chunks for record in chunk]
+        assert read == [record.id for record in storage.read()]
+        assert sorted(read) == list(range(1000))
+        assert chunks[-1][1] == 1.0
+    finally:
+        asyncio.run(storage.close())
+
+
+def test_windows_follow_the_key_they_were_read_at(tmp_path):
+    """No row is skipped when the last record read moves, as it is read again."""
+    storage = SqliteStorage(str(tmp_path / "items.db"))
+    first = dt.date(2023, 1, 1)
+    records = [
+        TodoRecord(f"task {id_}", first + dt.timedelta(days=id_), id=id_)
+        for id_ in range(10)
+    ]
+    storage.records_added(records)
+
+    async def read_windows() -> list[int]:
+        try:
+            assert await storage.count() == 10
+            window = await storage.read_window(None, 4)
+            after = window_key(window[-1])
+            window[-1].due_date = None
+            storage.due_date_changed(window[-1])
+            rest = await storage.read_window(after, 100)
+            return [record.id for record in window + rest]
+        finally:
+            await storage.close()
+
+    assert asyncio.run(read_windows()) == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 3]
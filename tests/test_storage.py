@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from textual_todo.jsonfile import read_json
+from textual_todo.storage import (
+    FIRST_CHUNK_SIZE,
+    JournalStorage,
+    JsonStorage,
+    Storage,
+    chunked,
+    counted_chunks,
+)
+from textual_todo.store import TodoRecord, TodoStore
+
+
+def load(storage: JsonStorage) -> None:
+    async def load_and_close() -> None:
+        async for records, _ in storage.load_chunks():
+            storage.store.extend(records)
+        await storage.close()
+
+    asyncio.run(load_and_close())
+
+
+def test_unsorted_file_is_saved_in_order_once_loaded(tmp_path):
+    path = tmp_path / "items.json"
+    items = [
+        {"id": 0, "description": "later", "date": "03-01-2023"},
+        {"id": 1, "description": "undated", "date": ""},
+        {"id": 2, "description": "sooner", "date": "01-01-2023"},
+    ]
+    path.write_text(json.dumps(items))
+    load(JsonStorage(str(path)))
+    assert [item["id"] for item in read_json(str(path))] == [2, 0, 1]
+
+
+def test_file_without_ids_is_saved_with_ids_once_loaded(tmp_path):
+    path = tmp_path / "items.json"
+    items = [{"description": f"task {n}", "date": ""} for n in range(3)]
+    path.write_text(json.dumps(items))
+    load(JsonStorage(str(path)))
+    assert [item["id"] for item in read_json(str(path))] == [0, 1, 2]
+
+
+def test_sorted_file_is_left_alone(tmp_path):
+    path = tmp_path / "items.json"
+    items = [
+        {"id": 0, "description": "sooner", "date": "01-01-2023"},
+        {"id": 1, "description": "undated", "date": ""},
+    ]
+    path.write_text(json.dumps(items))
+    modified = path.stat().st_mtime_ns
+    load(JsonStorage(str(path)))
+    assert path.stat().st_mtime_ns == modified
+
+
+def test_chunks_grow_from_a_small_first_chunk():
+    sizes = [len(chunk) for chunk in chunked(range(500))]
+    assert sizes[0] == FIRST_CHUNK_SIZE
+    assert sum(sizes) == 500
+    assert sizes == sorted(sizes[:-1]) + sizes[-1:]
+    progress = [progress for _, progress in counted_chunks([TodoRecord()] * 500, 500)]
+    assert progress[-1] == 1.0
+    assert progress == sorted(progress)
+
+
+def test_changes_to_a_file_without_ids_reload_it_instead_of_adding_to_it(tmp_path):
+    path = tmp_path / "items.json"
+    path.write_text(
+        json.dumps([{"description": f"task {n}", "date": ""} for n in range(5)])
+    )
+    storage = JsonStorage(str(path))
+
+    async def load_then_add_elsewhere() -> None:
+        async for records, _ in storage.load_chunks():
+            storage.store.extend(records)
+        # Another process adds an item before the ids given on load are saved.
+        items = [{"id": n, "description": f"task {n}", "date": ""} for n in range(6)]
+        path.write_text(json.dumps(items))
+        async with storage.external_changes() as diff:
+            assert diff is not None
+            assert not diff.added and not diff.removed and not diff.changed
+            assert diff.reload is not None and len(diff.reload) == 6
+        await storage.close()
+
+    asyncio.run(load_then_add_elsewhere())
+
+
+def test_changes_are_matched_by_id_once_the_ids_are_saved(tmp_path):
+    path = tmp_path / "items.json"
+    path.write_text(
+        json.dumps([{"description": f"task {n}", "date": ""} for n in range(5)])
+    )
+    storage = JsonStorage(str(path))
+
+    async def load_save_then_add_elsewhere() -> None:
+        async for records, _ in storage.load_chunks():
+            storage.store.extend(records)
+        await storage.flush()
+        items = read_json(str(path))
+        items.append({"id": 5, "description": "added", "date": ""})
+        path.write_text(json.dumps(items))
+        async with storage.external_changes() as diff:
+            assert diff is not None
+            assert diff.reload is None
+            assert diff.added == [(5, "added", None)]
+        await storage.close()
+
+    asyncio.run(load_save_then_add_elsewhere())
+
+
+def test_a_storage_must_persist_every_kind_of_change():
+    class ReadOnlyStorage(Storage):
+        def read(self) -> TodoStore:
+            return TodoStore()
+
+    with pytest.raises(TypeError):
+        ReadOnlyStorage()  # type: ignore[abstract]
+
+
+def test_journal_size_is_counted_in_bytes(tmp_path):
+    path = tmp_path / "items.json"
+    path.write_text("[]")
+    storage = JournalStorage(str(path))
+
+    async def add_and_close() -> None:
+        storage.load()
+        storage.store.add(TodoRecord("Café crème, 🥐"))
+        storage.record_added(storage.store[0])
+        storage.records_added([TodoRecord("Ünïcödé", id=1)])
+        await storage.close()
+
+    asyncio.run(add_and_close())
+    assert storage._journal_size == os.path.getsize(storage.journal_path)
+    assert JournalStorage(str(path)).read()[0].description == "Café crème, 🥐"
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from textual_todo.store import (
+    DueDateIndex,
+    SnapshotDiff,
+    TodoRecord,
+    TodoStore,
+    is_sorted_snapshot,
+    sort_snapshot,
+)
+
+JAN_1 = dt.date(2023, 1, 1)
+JAN_2 = dt.date(2023, 1, 2)
+JAN_3 = dt.date(2023, 1, 3)
+
+
+def descriptions(records) -> list[str]:
+    return [record.description for record in records]
+
+
+def test_index_orders_by_date_with_undated_last():
+    index = DueDateIndex(
+        [
+            TodoRecord("undated"),
+            TodoRecord("later", JAN_3),
+            TodoRecord("sooner", JAN_1),
+        ]
+    )
+    assert descriptions(index) == ["sooner", "later", "undated"]
+
+
+def test_index_keeps_ties_in_the_order_they_were_added():
+    index = DueDateIndex()
+    for description in ["a", "b", "c"]:
+        index.insert(TodoRecord(description, JAN_2))
+    index.insert(TodoRecord("first", JAN_1))
+    index.insert(TodoRecord("d", JAN_2))
+    assert descriptions(index) == ["first", "a", "b", "c", "d"]
+
+
+def test_bisect_date_finds_the_first_record_due_on_or_after_a_date():
+    index = DueDateIndex(
+        [
+            TodoRecord("jan 1", JAN_1),
+            TodoRecord("jan 3", JAN_3),
+            TodoRecord("jan 3 too", JAN_3),
+            TodoRecord("undated"),
+        ]
+    )
+    assert index.bisect_date(dt.date(2022, 12, 31)) == 0
+    assert index.bisect_date(JAN_1) == 0
+    assert index.bisect_date(JAN_2) == 1
+    assert index.bisect_date(JAN_3) == 1
+    assert index.bisect_date(dt.date(2023, 1, 4)) == 3
+    assert index.bisect_date(None) == 3
+
+
+def test_bisect_date_with_no_undated_records():
+    index = DueDateIndex([TodoRecord("jan 1", JAN_1)])
+    assert index.bisect_date(None) == 1
+    assert DueDateIndex().bisect_date(JAN_1) == 0
+
+
+def test_update_moves_a_record_to_its_new_date():
+    sooner, later, undated = (
+        TodoRecord("sooner", JAN_1),
+        TodoRecord("later", JAN_3),
+        TodoRecord("undated"),
+    )
+    index = DueDateIndex([sooner, later, undated])
+    undated.due_date = JAN_2
+    assert index.update(undated) == (2, 1)
+    sooner.due_date = None
+    assert index.update(sooner) == (0, 2)
+    assert descriptions(index) == ["undated", "later", "sooner"]
+    assert [index.position(record) for record in index] == [0, 1, 2]
+
+
+def test_remove_and_remove_many():
+    records = [TodoRecord(str(day), dt.date(2023, 1, day)) for day in range(1, 11)]
+    index = DueDateIndex(records)
+    assert index.remove(records[4]) == 4
+    index.remove_many({records[0], records[9], records[5]})
+    assert descriptions(index) == ["2", "3", "4", "7", "8", "9"]
+    assert records[4] not in index
+    assert index.bisect_date(dt.date(2023, 1, 5)) == 3
+
+
+def test_subset_keeps_the_order_of_the_index():
+    records = [
+        TodoRecord(str(day), JAN_1 + dt.timedelta(days=day)) for day in range(40)
+    ]
+    index = DueDateIndex(records)
+    # Small subsets are looked up by key and large ones picked out by scanning.
+    for picked in [{records[30], records[3]}, set(records[::2])]:
+        subset = index.subset(picked)
+        assert list(subset) == [record for record in index if record in picked]
+
+
+def test_store_assigns_ids_that_are_not_taken():
+    store = TodoStore([TodoRecord("a", id=3), TodoRecord("b")])
+    store.add(TodoRecord("c"))
+    ids = [record.id for record in store]
+    assert len(set(ids)) == 3
+    assert 3 in ids
+    assert all(store.get(id_) is not None for id_ in ids)
+
+
+def test_snapshot_sorting():
+    snapshot = [(0, "undated", None), (1, "later", JAN_3), (2, "sooner", JAN_1)]
+    assert not is_sorted_snapshot(snapshot)
+    ordered = sort_snapshot(snapshot)
+    assert [id_ for id_, _, _ in ordered] == [2, 1, 0]
+    assert is_sorted_snapshot(ordered)
+
+
+def test_diff_matches_records_by_id():
+    old = [(0, "kept", None), (1, "renamed", None), (2, "gone", JAN_1)]
+    new = [(1, "new name", None), (0, "kept", None), (3, "added", JAN_2)]
+    diff = SnapshotDiff(old, new)
+    assert diff.added == [(3, "added", JAN_2)]
+    assert diff.removed == [2]
+    assert diff.changed == [(1, "new name", None)]
+    assert diff.reload is None
+    assert diff
+
+
+def test_diff_of_equal_snapshots_is_empty():
+    snapshot = [(0, "a", JAN_1), (1, "b", None)]
+    assert not SnapshotDiff(snapshot, list(reversed(snapshot)))
+
+
+def test_diff_sees_due_date_changes():
+    diff = SnapshotDiff([(0, "a", JAN_1)], [(0, "a", None)])
+    assert diff.changed == [(0, "a", None)]
+
+
+def test_reload_all_adds_removes_and_changes_nothing():
+    snapshot = [(None, "a", None), (None, "b", JAN_1)]
+    diff = SnapshotDiff.reload_all(snapshot)
+    assert diff.reload == snapshot
+    assert not diff.added and not diff.removed and not diff.changed
+    assert diff
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+
+from textual_todo.archivescreen import ArchiveScreen
+from textual_todo.bulkbar import BulkBar
+from textual_todo.cli import main
+from textual_todo.jsonfile import read_json
+from textual_todo.sqlitestorage import SqliteStorage
+from textual_todo.storage import FIRST_CHUNK_SIZE
+from textual_todo.todo import TODOApp
+from textual_todo.todoitem import TodoItem
+
+JAN_1 = dt.date(2023, 1, 1)
+
+
+def write_items(items: list[dict]) -> None:
+    with open("items.json", "w") as f:
+        json.dump(items, f)
+
+
+async def open_app(app: TODOApp, pilot) -> None:
+    await app._current.loader
+    await pilot.pause()
+
+
+def archived(app: TODOApp) -> list[str]:
+    return [item.description for item in app._current.archive.items()]
+
+
+def restored_entries() -> int:
+    with open("items.archive/open.jsonl") as f:
+        return sum("restored" in json.loads(line) for line in f)
+
+
+def test_loading_sorts_the_items_and_mounts_only_those_shown(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Every third item is undated and the rest are due in reverse file order.
+    items = [
+        {"id": n, "description": f"task {n}", "date": ""}
+        if n % 3 == 0
+        else {
+            "id": n,
+            "description": f"task {n}",
+            "date": (JAN_1 - dt.timedelta(days=n)).strftime("%d-%m-%Y"),
+        }
+        for n in range(300)
+    ]
+    write_items(items)
+
+    async def load() -> None:
+        app = TODOApp()
+        async with app.run_test(size=(80, 40)) as pilot:
+            await open_app(app, pilot)
+            container = app._todo_container
+            ids = [record.id for record in container.store]
+            dated = [n for n in reversed(range(300)) if n % 3]
+            undated = [n for n in range(300) if n % 3 == 0]
+            assert ids == dated + undated
+            assert all(record.collapsed for record in container.store)
+            assert 0 < len(container._mounted) < 300
+
+    asyncio.run(load())
+
+
+def test_undoing_done_puts_the_item_back_from_the_archive(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_items([{"id": 0, "description": "task", "date": ""}])
+
+    async def done_undo_redo() -> None:
+        app = TODOApp()
+        async with app.run_test() as pilot:
+            await open_app(app, pilot)
+            store = app._todo_container.store
+            item = app._todo_container.item_for(store[0])
+            await app.on_todo_item_done(TodoItem.Done(item))
+            assert len(store) == 0 and archived(app) == ["task"]
+
+            await app.run_action("undo")
+            assert [record.description for record in store] == ["task"]
+            assert archived(app) == []
+
+            await app.run_action("redo")
+            assert len(store) == 0 and archived(app) == ["task"]
+
+    asyncio.run(done_undo_redo())
+
+
+def test_undoing_a_restore_puts_the_item_back_in_the_archive(tmp_path, monkeypatch):
+    """Undo takes back the restore, rather than the completion before it."""
+    monkeypatch.chdir(tmp_path)
+    write_items([{"id": 0, "description": "task", "date": ""}])
+
+    async def done_restore_undo() -> None:
+        app = TODOApp()
+        async with app.run_test() as pilot:
+            await open_app(app, pilot)
+            store = app._todo_container.store
+            item = app._todo_container.item_for(store[0])
+            await app.on_todo_item_done(TodoItem.Done(item))
+            (archived_item,) = app._current.archive.items()
+            await app.on_archive_screen_restore(ArchiveScreen.Restore(archived_item))
+            assert len(store) == 1 and archived(app) == []
+
+            await app.run_action("undo")
+            assert len(store) == 0 and archived(app) == ["task"]
+            await app.run_action("undo")
+            assert len(store) == 1 and archived(app) == []
+            await app.run_action("redo")
+            await app.run_action("redo")
+            assert len(store) == 1 and archived(app) == []
+            assert restored_entries() == 3
+
+    asyncio.run(done_restore_undo())
+
+
+def test_undoing_a_bulk_action_undoes_it_as_a_whole(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_items(
+        [
+            {"id": 0, "description": "dated", "date": "01-01-2023"},
+            {"id": 1, "description": "undated", "date": ""},
+        ]
+    )
+
+    async def set_undo_redo() -> None:
+        app = TODOApp()
+        async with app.run_test() as pilot:
+            await open_app(app, pilot)
+            store = app._todo_container.store
+            await app.action_select_all()
+            await app.on_bulk_bar_action(BulkBar.Action(BulkBar.SET_DATE, date=JAN_1))
+            assert [record.due_date for record in store] == [JAN_1, JAN_1]
+
+            await app.run_action("undo")
+            assert [(record.description, record.due_date) for record in store] == [
+                ("dated", JAN_1),
+                ("undated", None),
+            ]
+            await app.run_action("redo")
+            assert [record.due_date for record in store] == [JAN_1, JAN_1]
+
+    asyncio.run(set_undo_redo())
+
+
+def test_adding_from_the_command_line_to_a_file_without_ids(tmp_path, monkeypatch):
+    """The items of the app are not added again when another process adds one."""
+    monkeypatch.chdir(tmp_path)
+    write_items([{"description": f"task {n}", "date": ""} for n in range(5)])
+
+    async def add_elsewhere_and_sync() -> None:
+        app = TODOApp()
+        async with app.run_test() as pilot:
+            await open_app(app, pilot)
+            main(["add", "added"])
+            await app._sync_lists()
+            descriptions = [record.description for record in app._todo_container.store]
+            assert sorted(descriptions) == ["added"] + [f"task {n}" for n in range(5)]
+        assert len(read_json("items.json")) == 6
+
+    asyncio.run(add_elsewhere_and_sync())
+
+
+def test_a_database_list_is_read_a_window_at_a_time(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_items(
+        [{"id": n, "description": f"task {n}", "date": ""} for n in range(1000)]
+    )
+
+    async def scroll_and_search() -> None:
+        app = TODOApp(storage=SqliteStorage("items.db", migrate_from="items.json"))
+        async with app.run_test(size=(80, 40)) as pilot:
+            container = app._todo_container
+            while not app._current.waiting:
+                await pilot.pause()
+            assert len(container.store) == FIRST_CHUNK_SIZE
+            assert container.unread == 1000 - FIRST_CHUNK_SIZE
+            assert not app._current.loading
+
+            container.scroll_end(animate=False)
+            while len(container.store) == FIRST_CHUNK_SIZE:
+                await pilot.pause()
+            assert container.unread == 1000 - len(container.store)
+
+            await pilot.press("slash", *"999")
+            await app._current.loader
+            assert [record.id for record in container.store] == list(range(1000))
+            assert container.unread == 0
+            assert [record.id for record in container._records] == [999]
+
+    asyncio.run(scroll_and_search())
+
+
+def test_ctrl_a_in_the_search_bar_selects_the_matches(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_items([{"id": n, "description": f"task {n}", "date": ""} for n in range(12)])
+
+    async def search_and_select() -> None:
+        app = TODOApp()
+        async with app.run_test() as pilot:
+            await open_app(app, pilot)
+            await pilot.press("slash", *"1", "ctrl+a")
+            await pilot.pause()
+            selected = app._todo_container.selected
+            assert sorted(record.id for record in selected) == [1, 10, 11]
+            assert app._search_bar.value == "1"
+
+    asyncio.run(search_and_select())
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+from itertools import accumulate
+
+from textual_todo.editabletext import SharedEditor
+from textual_todo.store import TodoRecord
+from textual_todo.todo import TODOApp
+
+LONG_DESCRIPTION = "word " * 60
+"""Wraps over several lines at the width of the tests."""
+
+
+def write_items(count: int, description: str) -> None:
+    items = [
+        {"id": id_, "description": f"task {id_} {description}", "date": ""}
+        for id_ in range(count)
+    ]
+    with open("items.json", "w") as f:
+        json.dump(items, f)
+
+
+def test_last_wrapped_item_is_visible_at_the_end(tmp_path, monkeypatch):
+    """Items taller than estimated still fit in the scroll range."""
+    monkeypatch.chdir(tmp_path)
+    write_items(500, LONG_DESCRIPTION)
+
+    async def scroll_to_end() -> None:
+        app = TODOApp(virtual=True)
+        async with app.run_test(size=(80, 40)) as pilot:
+            await app._current.loader
+            await pilot.pause()
+            container = app._todo_container
+            await app.run_action("expand_all")
+            await pilot.pause(0.5)
+            heights = {item.outer_size.height for item in container._mounted.values()}
+            assert max(heights) > container.EXPANDED_HEIGHT
+
+            container.scroll_end(animate=False)
+            await pilot.pause(1)
+            item = container.item_for(container.store[-1])
+            assert item is not None
+            assert container.content_region.contains_region(item.region)
+
+    asyncio.run(scroll_to_end())
+
+
+def test_wrapped_items_leave_no_gaps(tmp_path, monkeypatch):
+    """The mounted items cover the view however much taller they are."""
+    monkeypatch.chdir(tmp_path)
+    write_items(500, LONG_DESCRIPTION)
+
+    async def scroll_to_middle() -> None:
+        app = TODOApp(virtual=True)
+        async with app.run_test(size=(80, 40)) as pilot:
+            await app._current.loader
+            await pilot.pause()
+            container = app._todo_container
+            await app.run_action("expand_all")
+            await pilot.pause(0.5)
+
+            container.scroll_to(y=container.max_scroll_y // 2, animate=False)
+            await pilot.pause(1)
+            view = container.content_region
+            covered = sum(
+                min(item.region.bottom, view.bottom) - max(item.region.y, view.y)
+                for item in container._mounted.values()
+                if item.region.bottom > view.y and item.region.y < view.bottom
+            )
+            assert covered == view.height
+
+    asyncio.run(scroll_to_middle())
+
+
+def test_new_item_on_a_long_list_is_edited_in_view(tmp_path, monkeypatch):
+    """Pressing n on a list taller than the screen edits the new item in view."""
+    monkeypatch.chdir(tmp_path)
+    write_items(30, "")
+
+    async def add_and_type() -> None:
+        app = TODOApp(virtual=True)
+        async with app.run_test(size=(80, 40)) as pilot:
+            await app._current.loader
+            await pilot.pause()
+            container = app._todo_container
+            await pilot.press("n")
+            await pilot.pause(0.5)
+            record = container.store[-1]
+            assert record.description == ""
+            item = container.item_for(record)
+            assert item is not None and item.is_editing
+            assert str(item._status.renderable) == "Add description and due date."
+            assert container.content_region.contains_region(item.region)
+
+            await pilot.press(*"hello", "enter")
+            await pilot.pause()
+            assert record.description == "hello"
+            assert container.item_for(record) is item
+
+    asyncio.run(add_and_type())
+
+
+def test_edit_is_kept_while_scrolled_out_of_the_window(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_items(100, "")
+
+    async def type_scroll_and_submit() -> None:
+        app = TODOApp(virtual=True)
+        async with app.run_test(size=(80, 40)) as pilot:
+            await app._current.loader
+            await pilot.pause()
+            container = app._todo_container
+            record = container.store[0]
+            item = container.item_for(record)
+            assert item is not None
+            item._description.switch_to_editing_mode()
+            await pilot.press(*" edited")
+
+            container.scroll_end(animate=False)
+            await pilot.pause(0.5)
+            assert container.item_for(record) is item
+            assert item.is_editing and not item.display
+
+            container.scroll_home(animate=False)
+            await pilot.pause(0.5)
+            assert item.display
+            await pilot.press("enter")
+            await pilot.pause()
+            assert record.description == "task 0  edited"
+
+    asyncio.run(type_scroll_and_submit())
+
+
+def test_offsets_follow_single_changes_without_a_rebuild(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # The first half is due a day apart, so records can be moved past them.
+    items = [
+        {
+            "id": n,
+            "description": f"task {n}",
+            "date": f"{n % 28 + 1:02d}-{n // 28 + 1:02d}-2023",
+        }
+        for n in range(100)
+    ]
+    items += [
+        {"id": n, "description": f"task {n}", "date": ""} for n in range(100, 200)
+    ]
+    with open("items.json", "w") as f:
+        json.dump(items, f)
+
+    async def change_records() -> None:
+        app = TODOApp(virtual=True)
+        async with app.run_test(size=(80, 40)) as pilot:
+            await app._current.loader
+            await pilot.pause()
+            container = app._todo_container
+            store = container.store
+            offsets = container._get_offsets()
+
+            item = container.item_for(store[2])
+            assert item is not None
+            item._show_more.press()
+            await pilot.pause(0.5)
+
+            # The expanded record is taller than those it moves past.
+            record = store[2]
+            record.due_date = dt.date(2023, 3, 15)
+            container.sort_record(record)
+            assert store.position(record) > 60
+            record.due_date = dt.date(2022, 1, 1)
+            container.sort_record(record)
+            assert store[0] is record
+            await container.add(TodoRecord("new", dt.date(2023, 1, 2)))
+            await container.remove_record(store[100])
+            await pilot.pause(0.5)
+
+            assert container._offsets is offsets
+            assert offsets == [0, *accumulate(map(container._estimated_height, store))]
+
+    asyncio.run(change_records())
+
+
+def test_editor_follows_the_item_as_the_list_scrolls(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_items(30, "")
+
+    async def edit_and_scroll() -> None:
+        app = TODOApp(virtual=True)
+        async with app.run_test(size=(80, 40)) as pilot:
+            await app._current.loader
+            await pilot.pause()
+            container = app._todo_container
+            item = container.item_for(container.store[2])
+            assert item is not None
+            item._description.switch_to_editing_mode()
+            await pilot.pause(0.3)
+            editor = app.query_one(SharedEditor)
+            label = item._description._label
+            assert editor.region == label.region
+
+            container.scroll_to(y=3, animate=False)
+            await pilot.pause(0.3)
+            assert editor.region == label.region
+            assert app.screen.get_widget_at(*label.region.offset)[0] is editor
+
+    asyncio.run(edit_and_scroll())
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from textual_todo.store import TodoRecord
+from textual_todo.undo import ENTRY_OVERHEAD, Change, UndoLog
+
+
+def added(description: str = "") -> Change:
+    return Change(Change.ADD, TodoRecord(description))
+
+
+def test_undo_and_redo_go_back_and_forth():
+    log = UndoLog()
+    first, second = added(), added()
+    log.record(first)
+    log.record(second)
+    assert log.undo() is second
+    assert log.undo() is first
+    assert log.undo() is None
+    assert log.redo() is first
+    assert log.redo() is second
+    assert log.redo() is None
+    assert len(log) == 2
+
+
+def test_a_new_change_forgets_those_undone():
+    log = UndoLog()
+    undone = added("undone")
+    log.record(added())
+    log.record(undone)
+    log.undo()
+    log.record(added())
+    assert log.redo() is None
+    assert len(log) == 2
+    assert log.bytes == 2 * ENTRY_OVERHEAD
+
+
+def test_the_oldest_changes_are_forgotten_past_the_limits():
+    log = UndoLog(max_entries=2)
+    changes = [added() for _ in range(3)]
+    for change in changes:
+        log.record(change)
+    assert log.undo() is changes[2]
+    assert log.undo() is changes[1]
+    assert log.undo() is None
+
+    log = UndoLog(max_bytes=2 * ENTRY_OVERHEAD + 10)
+    log.record(added())
+    log.record(added("x" * 20))
+    assert len(log) == 1
+    assert log.bytes == ENTRY_OVERHEAD + 20
+
+
+def test_a_batch_is_undone_as_a_single_change():
+    changes = [added("a"), added("b")]
+    batch = Change.batch(changes)
+    log = UndoLog()
+    log.record(batch)
+    assert batch.kind == Change.BATCH
+    assert batch.before == changes
+    assert batch.record is changes[0].record
+    assert batch.size < sum(change.size for change in changes)
+    assert log.undo() is batch
+    assert log.undo() is None